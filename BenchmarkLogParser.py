@@ -0,0 +1,292 @@
+"""
+William Fissler 2023
+
+BenchmarkLogParser.py
+
+A program that benchmarks LogParser.py's parsing operations against the log files in a given path
+(defaults to the "SampleData" folder), and prints the results to the terminal window.
+
+Benchmarks:
+- Criteria matching: the original per line re.search loop against the CriteriaMatcher engine
+- Readers: the line reader (parseLogChunk) against the block reader (parseLogChunkBlocks), 
+  over a corpus of the log files concatenated --scale times
+- Logging: LogParser.iterateLogs over the corpus, tracing every line (the statement volume of the former per line logging), 
+  sampled tracing, and per file summaries only, reporting the bytes written to the LogParser log file
+
+Each benchmark verifies that the compared implementations produce identical results before reporting timings.
+
+With --corpora, runs LogParser.py end to end instead, against synthetic corpora of the given sizes 
+(generated with CreateArbitraryLog.py's deterministic generator, from --seed and --mix, so runs on different revisions parse identical input),
+and appends the throughput and peak memory of each run to a results file (JSON lines) for regression tracking, e.g.:
+  python BenchmarkLogParser.py --corpora --parser-args "--workers 4" --corpus-dir BenchmarkCorpora
+
+"""
+
+import argparse, glob, logging, os, re, time, tempfile, shutil, subprocess, sys, shlex, json, datetime, platform
+
+from LogParser import LogParser
+from LogReaders import parseLogChunk, parseLogChunkBlocks
+from CreateArbitraryLog import LogGenerator
+
+def readLogLines(logPath) -> dict:
+    """Reads every CreateArbitraryLog*.log file in logPath into memory, so that file I/O is excluded from the timings.
+
+    :param logPath: directory containing the log files to benchmark against
+    :type logPath: str
+    :returns: logLines - dictionary of log file name to list of log lines
+    :rtype: dict"""
+    logLines = {}
+    for file in sorted(glob.glob(os.path.join(logPath, 'CreateArbitraryLog*.log'))):
+        with open(file) as log:
+            logLines[os.path.basename(file)] = log.readlines()
+    return logLines
+
+def legacyMatch(objLogParser, logLines) -> list:
+    """Evaluates each line with the original chained (uncompiled) re.search calls.
+
+    :returns: matches - list of (log name, line index, category) for each line matching a criteria
+    :rtype: list"""
+    matches = []
+    for log, lines in logLines.items():
+        for index, line in enumerate(lines):
+            if re.search(objLogParser.hitchCriteria, line) is not None:
+                matches.append((log, index, "hitch"))
+            elif re.search(objLogParser.memoryCriteria, line) is not None:
+                matches.append((log, index, "memory"))
+            elif re.search(objLogParser.errorCriteria, line) is not None:
+                matches.append((log, index, "error"))
+    return matches
+
+def matcherMatch(objLogParser, logLines) -> list:
+    """Evaluates each line with a CriteriaMatcher built once for the run.
+
+    :returns: matches - list of (log name, line index, category) for each line matching a criteria
+    :rtype: list"""
+    matches = []
+    match = objLogParser.buildMatcher().match
+    for log, lines in logLines.items():
+        for index, line in enumerate(lines):
+            category = match(line)
+            if category is not None:
+                matches.append((log, index, category))
+    return matches
+
+def timeBest(function, repeat, *args):
+    """Runs function repeat times and returns the result and the fastest run time in seconds."""
+    bestTime = None
+    for run in range(repeat):
+        runTime = time.perf_counter()
+        result = function(*args)
+        runTime = time.perf_counter() - runTime
+        if bestTime is None or runTime < bestTime:
+            bestTime = runTime
+    return result, bestTime
+
+def benchmarkMatcher(logLines, repeat):
+    """Compares the original per line re.search loop with the CriteriaMatcher engine, and prints the results."""
+    objLogParser = LogParser()
+    lineCount = sum(len(lines) for lines in logLines.values())
+
+    legacyMatches, legacyTime = timeBest(legacyMatch, repeat, objLogParser, logLines)
+    matcherMatches, matcherTime = timeBest(matcherMatch, repeat, objLogParser, logLines)
+
+    if legacyMatches != matcherMatches:
+        raise AssertionError("CriteriaMatcher results differ from the original re.search loop")
+
+    print("Criteria matching over " + str(lineCount) + " lines (" + str(len(matcherMatches)) + " matches), best of " + str(repeat) + ":")
+    print("  re.search loop:  " + str(round(legacyTime, 4)) + " seconds")
+    print("  CriteriaMatcher: " + str(round(matcherTime, 4)) + " seconds (" + str(round(legacyTime/matcherTime, 1)) + "x)")
+
+def buildCorpus(logPath, scale, corpusPath) -> str:
+    """Writes the CreateArbitraryLog*.log files in logPath, concatenated scale times, to a single log file in corpusPath.
+
+    :returns: corpusName - path of the corpus log file
+    :rtype: str"""
+    corpusName = os.path.join(corpusPath, "CreateArbitraryLog_corpus.log")
+    logFiles = sorted(glob.glob(os.path.join(logPath, 'CreateArbitraryLog*.log')))
+    with open(corpusName, 'wb') as corpus:
+        for copy in range(scale):
+            for file in logFiles:
+                with open(file, 'rb') as log:
+                    shutil.copyfileobj(log, corpus)
+    return corpusName
+
+def benchmarkReaders(logPath, scale, repeat):
+    """Compares the line reader with the block reader over a corpus of the log files, and prints the results."""
+    matcher = LogParser().buildMatcher()
+    corpusPath = tempfile.mkdtemp()
+    try:
+        corpusName = buildCorpus(logPath, scale, corpusPath)
+        corpusSize = os.path.getsize(corpusName) / 1024**2
+
+        lineResults, lineTime = timeBest(parseLogChunk, repeat, corpusName, 0, None, matcher)
+        blockResults, blockTime = timeBest(parseLogChunkBlocks, repeat, corpusName, 0, None, matcher)
+    finally:
+        shutil.rmtree(corpusPath)
+
+    if lineResults != blockResults:
+        raise AssertionError("Block reader results differ from the line reader")
+
+    print("Readers over a " + str(round(corpusSize, 1)) + " MiB corpus (" + str(lineResults[3]) + " lines), best of " + str(repeat) + ":")
+    print("  line reader:  " + str(round(lineTime, 4)) + " seconds (" + str(round(corpusSize/lineTime, 1)) + " MiB/s)")
+    print("  block reader: " + str(round(blockTime, 4)) + " seconds (" + str(round(corpusSize/blockTime, 1)) + " MiB/s, " + str(round(lineTime/blockTime, 1)) + "x)")
+
+def benchmarkLogging(logPath, scale, repeat):
+    """Compares the run time and log file size of LogParser.iterateLogs at different trace settings, and prints the results."""
+    corpusPath = tempfile.mkdtemp()
+    logging.disable(logging.NOTSET)
+    rootLogger = logging.getLogger()
+    previousLevel = rootLogger.level
+    try:
+        corpusName = buildCorpus(logPath, scale, corpusPath)
+        logFileName = os.path.join(corpusPath, "LogParser_benchmark.log")
+        rootLogger.setLevel(logging.DEBUG)
+
+        print("Logging over a " + str(round(os.path.getsize(corpusName)/1024**2, 1)) + " MiB corpus, best of " + str(repeat) + ":")
+        for label, traceEvery in (("trace every line", 1), ("trace every 1000th line", 1000), ("file summaries only", 0)):
+            def parseWithLogging():
+                handler = logging.FileHandler(logFileName, mode='w', encoding='utf-8')
+                handler.setFormatter(logging.Formatter('[%(asctime)s.%(msecs)03d] - %(levelname)s - %(message)s', datefmt='%d%b%y_%H:%M:%S'))
+                rootLogger.addHandler(handler)
+                try:
+                    objLogParser = LogParser()
+                    objLogParser.traceEvery = traceEvery
+                    objLogParser.iterateLogs([corpusName])
+                finally:
+                    rootLogger.removeHandler(handler)
+                    handler.close()
+            result, runTime = timeBest(parseWithLogging, repeat)
+            print("  " + (label + ":").ljust(26) + str(round(runTime, 4)) + " seconds, " + 
+                  str(round(os.path.getsize(logFileName)/1024, 1)) + " KiB of log statements")
+    finally:
+        rootLogger.setLevel(previousLevel)
+        logging.disable(logging.CRITICAL)
+        shutil.rmtree(corpusPath)
+
+def generateCorpus(corpusPath, size, seed, mix) -> str:
+    """Generates a corpus log file of size MiB with LogGenerator in corpusPath, unless one was already generated with the same seed and mix.
+
+    :returns: corpusName - path of the corpus log file
+    :rtype: str"""
+    corpusName = os.path.join(corpusPath, "CreateArbitraryLog_bench_" + str(size) + "MiB_seed" + str(seed) + 
+                              "_mix" + "-".join("%g" % weight for weight in mix) + ".log")
+    if not os.path.isfile(corpusName):
+        generateTime = time.perf_counter()
+        lineCount, byteCount = LogGenerator(seed, mix).writeLog(corpusName, size=size * 1024**2)
+        generateTime = time.perf_counter() - generateTime
+        print("  generated " + os.path.basename(corpusName) + ": " + str(lineCount) + " lines in " + 
+              str(round(generateTime, 2)) + " seconds (" + str(round(byteCount/1024**2/generateTime, 1)) + " MiB/s)")
+    return corpusName
+
+def runParser(corpusName, parserArgs) -> dict:
+    """Runs LogParser.py (in a separate process, so its peak memory is its own) against corpusName, in a temporary working directory.
+
+    :returns: summary - LogParser's JSON run summary, and wallSeconds, the run time including process start up
+    :rtype: dict"""
+    workPath = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(workPath, "Logs"))
+        logName = os.path.join(workPath, "Logs", os.path.basename(corpusName))
+        try:
+            os.symlink(os.path.abspath(corpusName), logName)
+        except OSError: # e.g. no symlink privilege on Windows
+            shutil.copyfile(corpusName, logName)
+        wallTime = time.perf_counter()
+        process = subprocess.run([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "LogParser.py")] + parserArgs, 
+                                 cwd=workPath, capture_output=True, text=True)
+        wallTime = time.perf_counter() - wallTime
+        summaries = glob.glob(os.path.join(workPath, "Logs", "LogParser_*.json"))
+        if process.returncode != 0 or len(summaries) == 0:
+            raise RuntimeError("LogParser.py failed on " + corpusName + ": " + process.stderr)
+        with open(summaries[0], encoding='utf-8') as summaryFile:
+            summary = json.load(summaryFile)
+        summary["wallSeconds"] = round(wallTime, 6)
+        return summary
+    finally:
+        shutil.rmtree(workPath)
+
+def getRevision() -> str:
+    """Gets the git revision of the working tree benchmarked, or None outside of a git repository.
+
+    :rtype: str"""
+    try:
+        process = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=os.path.dirname(os.path.abspath(__file__)), 
+                                 capture_output=True, text=True)
+        return process.stdout.strip() if process.returncode == 0 else None
+    except OSError:
+        return None
+
+def benchmarkCorpora(sizes, seed, mix, parserArgs, runs, corpusPath, resultsName):
+    """Runs LogParser.py against a corpus of each size (MiB), and prints and appends to resultsName (a JSON line per run) 
+    the throughput and peak memory of each run."""
+    removeCorpora = corpusPath is None
+    corpusPath = tempfile.mkdtemp() if removeCorpora else corpusPath
+    os.makedirs(corpusPath, exist_ok=True)
+    revision = getRevision()
+    print(" ".join(["LogParser.py"] + parserArgs) + " against corpora of " + ", ".join(str(size) + " MiB" for size in sizes) + 
+          " (seed " + str(seed) + ", mix " + ",".join("%g" % weight for weight in mix) + "):")
+    try:
+        with open(resultsName, 'a', encoding='utf-8') as results:
+            for size in sizes:
+                corpusName = generateCorpus(corpusPath, size, seed, mix)
+                for run in range(runs):
+                    summary = runParser(corpusName, parserArgs)
+                    result = {"recordedAt": datetime.datetime.now().isoformat(), 
+                              "revision": revision,
+                              "python": platform.python_version(),
+                              "platform": platform.platform(),
+                              "corpusMiB": size,
+                              "corpusBytes": os.path.getsize(corpusName),
+                              "seed": seed,
+                              "mix": list(mix),
+                              "parserArguments": parserArgs,
+                              "run": run + 1}
+                    for key in ("wallSeconds", "elapsedSeconds", "bytesRead", "linesParsed", "mibPerSecond", "linesPerSecond", 
+                                "peakMemoryMiB", "workerPeakMemoryMiB", "matches", "stages"):
+                        result[key] = summary.get(key)
+                    results.write(json.dumps(result) + "\n")
+                    results.flush()
+                    print("  " + (str(size) + " MiB, run " + str(run + 1) + ":").ljust(20) + str(round(summary["elapsedSeconds"], 2)) + " seconds, " + 
+                          str(summary["mibPerSecond"]) + " MiB/s, " + str(summary["linesPerSecond"]) + " lines/s, peak memory " + 
+                          str(summary["peakMemoryMiB"]) + " MiB" + 
+                          ("" if not summary.get("workerPeakMemoryMiB") else " (largest worker process: " + str(summary["workerPeakMemoryMiB"]) + " MiB)"))
+    finally:
+        if removeCorpora:
+            shutil.rmtree(corpusPath)
+    print("Results appended to: " + resultsName)
+
+def main():
+    """Defines order of execution for the application"""
+    argParser = argparse.ArgumentParser(description="Benchmarks LogParser.py parsing operations.")
+    argParser.add_argument("--path", default="SampleData", help="directory containing CreateArbitraryLog*.log files")
+    argParser.add_argument("--repeat", type=int, default=5, help="number of runs per benchmark, the fastest is reported")
+    argParser.add_argument("--scale", type=int, default=20, help="number of copies of the log files in the reader benchmark corpus")
+    argParser.add_argument("--corpora", type=lambda sizes: [int(size) for size in sizes.split(",")], nargs="?", const=[10, 100, 1024], 
+                           help="run LogParser.py end to end against generated corpora of these sizes in MiB instead (default: 10,100,1024)")
+    argParser.add_argument("--seed", type=int, default=0, help="corpora: seed of the generated corpora (default: 0)")
+    argParser.add_argument("--mix", type=LogGenerator.parseMix, default=LogGenerator.defaultMix, 
+                           help="corpora: relative likelihood of log spam, memory usage, hitch, and error records (default: 846,142,9,3)")
+    argParser.add_argument("--parser-args", type=shlex.split, default=[], help="corpora: LogParser.py arguments, e.g. \"--workers 4 --reader blocks\"")
+    argParser.add_argument("--runs", type=int, default=1, help="corpora: number of LogParser.py runs per corpus, each recorded (default: 1)")
+    argParser.add_argument("--corpus-dir", help="corpora: directory the corpora are generated in, and reused from (default: a temporary directory)")
+    argParser.add_argument("--results", default="BenchmarkResults.jsonl", help="corpora: file the results are appended to (default: BenchmarkResults.jsonl)")
+    args = argParser.parse_args()
+
+    if args.corpora:
+        benchmarkCorpora(args.corpora, args.seed, args.mix, args.parser_args, args.runs, args.corpus_dir, args.results)
+        return
+
+    logging.disable(logging.CRITICAL) # keep the parser's own logging out of the timings
+
+    logLines = readLogLines(args.path)
+    if len(logLines) == 0:
+        print("No CreateArbitraryLog*.log files found in: " + args.path)
+        return
+
+    benchmarkMatcher(logLines, args.repeat)
+    benchmarkReaders(args.path, args.scale, args.repeat)
+    benchmarkLogging(args.path, args.scale, args.repeat)
+
+# Execute!
+if __name__ == "__main__":
+    main()
@@ -13,13 +13,26 @@ Generates logging for:
 - Application memory consumption
 - "is not defined" logic error
 
+Generator mode (--lines or --size) writes a synthetic log of a given length instead, for benchmarking: 
+records are pre-formatted and written in bulk buffers (rather than through logging, one statement at a time),
+and the content only depends on --seed, --mix, and the length, so the same log can be generated again on any machine.
+e.g. python CreateArbitraryLog.py --lines 1000000 --seed 7 --mix 846,142,9,3
+
+With --threads, the log is populated by that many producer threads (so hitches are reported on different threads), 
+whose statements are queued (logging.handlers.QueueHandler) and written in batches by a single writer thread (logging.handlers.QueueListener).
+
 Identified areas for future improvements:
 - Allow users to pass arguments for how many logs to create
 - Allow users to pass arguments for preferred output directory
 - Refactor for improved performance and algorithm design
 
 """ 
-import platform, logging, random, psutil, os, datetime, time, threading, socket, sys
+import platform, logging, logging.handlers, random, os, datetime, time, threading, socket, sys, math, argparse, queue
+
+try:
+    import psutil # only required by the (default) logging mode, not by generator mode
+except ImportError:
+    psutil = None
     
 class LogCreator:
     """ 
@@ -47,10 +60,13 @@ class LogCreator:
     getSystemInfo()
         Writes Python, OS, CPU and memory specs to the log file.
         
-    populateLog()
+    populateLog(prints:int, showProgress:bool)
         Iterates 10K times to populate the log file, based on log choice passed into chooseLoggingType(choice).
         Prints iteration progress to the terminal window.
         
+    populateLogThreaded(threads:int, prints:int)
+        Populates the log file from threads producer threads, through a queue drained by a single batched writer.
+        
     printFinalStats()
         Prints to terminal window, and writes to the log file, the total execution time of the application.
         
@@ -131,18 +147,59 @@ class LogCreator:
         except Exception as e:
             logging.exception(e)
             
-    def populateLog(self):
-        """Iterates 10K times to populate the log file, based on log choice passed into chooseLoggingType(choice).
-        Prints iteration progress to the terminal window."""
-        for prints in range(10000): #print 10K lines (error will increase actual line count due to callstack)
+    def populateLog(self, prints=10000, showProgress=True):
+        """Iterates 10K (prints) times to populate the log file, based on log choice passed into chooseLoggingType(choice).
+        Prints iteration progress to the terminal window (if showProgress).
+        
+        :param prints: number of statements to log (error will increase actual line count due to callstack)
+        :type prints: int
+        :param showProgress: print iteration progress to the terminal window
+        :type showProgress: bool"""
+        for printed in range(prints):
             try:
                 self.chooseLoggingType(random.randint(1,1000))
-                if prints % 99 == 0: # print terminal update every 100th line printed to log, as the cls/clear functions are very expensive. Clearing terminal each iteration increases execution time >10x 
+                if showProgress and printed % 99 == 0: # print terminal update every 100th line printed to log, as the cls/clear functions are very expensive. Clearing terminal each iteration increases execution time >10x 
                     os.system('cls' if os.name == 'nt' else 'clear') 
-                    print("Printing lines: " + str(round((prints/100)+.01,2)) + "%") 
+                    print("Printing lines: " + str(round((printed/prints*100)+.01,2)) + "%") 
             except Exception as e:
                 logging.exception(e)
                 break  
+                
+    def populateLogThreaded(self, threads, prints=10000):
+        """Populates the log file from threads producer threads (LogProducer-1 to LogProducer-<threads>), each logging its share of prints.
+        While they run, the root logger's handlers are replaced by a QueueHandler, so producers only format and queue their statements,
+        and a QueueListener drains the queue into a BatchWriter around each original handler, the single writer of the log file.
+        
+        :param threads: number of producer threads
+        :type threads: int
+        :param prints: number of statements to log, across all threads
+        :type prints: int"""
+        rootLogger = logging.getLogger()
+        fileHandlers = rootLogger.handlers[:]
+        logQueue = queue.SimpleQueue()
+        batchWriters = [BatchWriter(handler) for handler in fileHandlers]
+        listener = logging.handlers.QueueListener(logQueue, *batchWriters)
+        queueHandler = logging.handlers.QueueHandler(logQueue)
+        for handler in fileHandlers:
+            rootLogger.removeHandler(handler)
+        rootLogger.addHandler(queueHandler)
+        listener.start()
+        try:
+            share, remainder = divmod(prints, threads)
+            producers = [threading.Thread(target=self.populateLog, args=(share + (1 if thread < remainder else 0), False), 
+                                          name="LogProducer-" + str(thread + 1)) 
+                         for thread in range(threads)]
+            print("Printing " + str(prints) + " lines from " + str(threads) + " threads")
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+        finally:
+            listener.stop() # writes the statements still queued
+            rootLogger.removeHandler(queueHandler)
+            for handler, batchWriter in zip(fileHandlers, batchWriters):
+                batchWriter.close()
+                rootLogger.addHandler(handler)
             
     def printFinalStats(self):
         """Prints to terminal window, and writes to the log file, the total execution time of the application."""
@@ -207,15 +264,343 @@ class LogCreator:
         except Exception as e:
             logging.exception(e)
 
+class BatchWriter(logging.Handler):
+    """ 
+    Handler that formats records with its target handler's formatter, and writes them to the target's stream in batches,
+    rather than writing (and flushing) the stream once per record.
+    Meant to be the handler of a single writer thread, e.g. a QueueListener draining the records of many producer threads.
+    Records are stamped with the time they are emitted (in the order written), rather than the time each producer created them, 
+    as producers queue records out of creation order, which would write time stamps that decrease down the log file 
+    (where readers, e.g. LogParser.py's time index, expect them to be in order). A record's time stamp is therefore up to the queue's delay late.
+       
+    Attributes
+    ----------
+    target: logging.StreamHandler
+        Handler (e.g. the logging.FileHandler of the log file) whose formatter and stream records are written with.
+    capacity: int
+        Number of records buffered before they are written.
+    buffer[]: str
+        Stores the formatted records not yet written.
+        
+    Methods
+    -------    
+    __init__(target:logging.StreamHandler, capacity:int)
+        Constructor.
+        Initalizes target, capacity, and buffer attributes.
+        
+    emit(record:logging.LogRecord)
+        Stamps record with the current time, formats it into the buffer, and writes the buffer once it holds capacity records.
+        
+    flush()
+        Writes the buffered records to the target's stream, and flushes it.
+        
+    close()
+        Writes the buffered records, and closes the handler (not its target).
+
+    """
+    
+    def __init__(self, target, capacity=1024) -> None:
+        """Constructor.
+        Initalizes target, capacity, and buffer attributes."""
+        logging.Handler.__init__(self)
+        self.target = target
+        self.capacity = capacity
+        self.buffer = []
+        
+    def emit(self, record):
+        """Stamps record with the current time (the time it is written, in the order written), 
+        formats it into the buffer, and writes the buffer once it holds capacity records."""
+        try:
+            record.created = time.time()
+            record.msecs = int((record.created - int(record.created)) * 1000) + 0.0
+            self.buffer.append(self.target.format(record) + self.target.terminator)
+            if len(self.buffer) >= self.capacity:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+            
+    def flush(self):
+        """Writes the buffered records to the target's stream (with a single write call), and flushes it."""
+        self.acquire()
+        try:
+            if self.buffer:
+                self.target.acquire()
+                try:
+                    self.target.stream.write("".join(self.buffer))
+                    self.target.flush()
+                finally:
+                    self.target.release()
+                self.buffer = []
+        finally:
+            self.release()
+            
+    def close(self):
+        """Writes the buffered records, and closes the handler (not its target)."""
+        try:
+            self.flush()
+        finally:
+            logging.Handler.close(self)
+
+class LogGenerator:
+    """ 
+    Class that generates a synthetic log file, in the format written by LogCreator, of a given number of lines (or size),
+    as fast as possible and reproducibly, to be used as a benchmark corpus for parsing and reporting applications.
+    
+    Records are chosen by a random.Random seeded with seed, timestamps advance by one millisecond every linesPerMillisecond lines 
+    from a fixed start time, and the system information is a fixed synthetic block, 
+    so the same seed, mix, and length always generate the same file.
+    Each second of log time is built from pre-formatted log spam lines, and only the memory, hitch, and error records in it are formatted,
+    from tables drawn up front, which keeps the number of random draws and string operations per line low.
+       
+    Attributes
+    ----------
+    seed: int
+        Seed for the record choices, and the hitch durations and memory footprints.
+    mix: tuple
+        Relative likelihood of (log spam, memory usage, hitch, error) records.
+        Defaults to the likelihood of each message type in LogCreator.chooseLoggingType (846:142:9:3).
+    linesPerMillisecond: int
+        Number of lines written per millisecond of log time.
+    startTime: datetime.datetime
+        Time stamp of the first line.
+    systemInfoLines: int
+        Number of lines of the system information record, the first record of every generated log, 
+        and so the minimum number of lines generated.
+        
+    Methods
+    -------    
+    __init__(seed:int, mix:tuple, linesPerMillisecond:int)
+        Constructor.
+        Initalizes seed, mix, linesPerMillisecond, startTime, and systemInfoLines attributes.
+        
+    parseMix(mix:str) -> tuple
+        Parses a mix argument of four comma (or colon) separated weights.
+        
+    getSystemInfo() -> str
+        Gets the synthetic system information record.
+        
+    generateChunks(lines:int, size:int) -> generator
+        Yields the log as strings of pre-formatted records, until lines lines (or size bytes) are generated.
+        
+    writeLog(fileName:str, lines:int, size:int, bufferSize:int) -> tuple
+        Writes the generated log to fileName through a write buffer of bufferSize bytes.
+
+    """
+    
+    defaultMix = (846, 142, 9, 3)
+    logSpam = " - INFO - this is an arbitrary log\n"
+    memoryUsage = " - INFO - Current virtual memory footprint: %s MiB at run time: %s\n"
+    hitch = " - WARNING - Hitch reported on thread: [%s] with a duration of: %sms\n"
+    hitchThreads = ("MainThread", "MainThread", "MainThread", "RenderThread", "WorkerThread-1", "WorkerThread-2")
+    errors = (" - ERROR - name 'x' is not defined\n"
+              "Traceback (most recent call last):\n"
+              "  File \"CreateArbitraryLog.py\", line 188, in printErrorLog\n"
+              "    value = x * 1\n"
+              "            ^\n"
+              "NameError: name 'x' is not defined\n",
+              " - ERROR - can only concatenate str (not \"int\") to str\n"
+              "Traceback (most recent call last):\n"
+              "  File \"CreateArbitraryLog.py\", line 192, in printErrorLog\n"
+              "    logging.info(\"This is a string + int concatenation error \" + intError)\n"
+              "                 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~^~~~~~~~~~\n"
+              "TypeError: can only concatenate str (not \"int\") to str\n")
+    errorLines = 6
+    
+    def __init__(self, seed=0, mix=defaultMix, linesPerMillisecond=3) -> None:
+        """Constructor.
+        Initalizes seed, mix, linesPerMillisecond, startTime, and systemInfoLines attributes."""
+        if len(mix) != 4 or min(mix) < 0 or sum(mix) <= 0:
+            raise ValueError("mix must be four non-negative weights (log spam, memory, hitch, error), not all zero: " + str(mix))
+        self.seed = seed
+        self.mix = tuple(mix)
+        self.linesPerMillisecond = max(1, linesPerMillisecond)
+        self.startTime = datetime.datetime(2023, 1, 1)
+        self.systemInfoLines = self.getSystemInfo().count("\n")
+        
+    @staticmethod
+    def parseMix(mix) -> tuple:
+        """Parses a mix argument of four comma (or colon) separated weights, e.g. "846,142,9,3" or "0.8:0.1:0.07:0.03".
+        
+        :param mix: log spam, memory usage, hitch, and error weights
+        :type mix: str
+        :returns: mix - (log spam, memory usage, hitch, error) weights
+        :rtype: tuple"""
+        weights = tuple(float(weight) for weight in mix.replace(":", ",").split(","))
+        if len(weights) != 4 or min(weights) < 0 or sum(weights) <= 0:
+            raise argparse.ArgumentTypeError("expected four non-negative weights (log spam, memory, hitch, error), not all zero: " + mix)
+        return weights
+        
+    def getSystemInfo(self) -> str:
+        """Gets the synthetic system information record (as written by LogCreator.getSystemInfo), 
+        fixed so that the generated log does not depend on the machine generating it.
+        
+        :rtype: str"""
+        return (" - INFO - ***System Informtation*** \n Python Version: 3.12.0 (synthetic)"
+                "\n User: LogGenerator-seed-" + str(self.seed) + 
+                "\n Operating System: synthetic"
+                "\n CPU: synthetic"
+                "\n CPU Physical Cores: 8"
+                "\n CPU Logical Cores: 16"
+                "\n Total Virtual Memory: 16384MiB"
+                "\n Available Virtual Memory: 8192MiB \n ***System Informtation***\n")
+    
+    def generateChunks(self, lines=None, size=None):
+        """Yields the log one second (of log time) at a time, as strings of pre-formatted records, 
+        until lines lines or size bytes (whichever is reached first) are generated.
+        Each second starts as a list of log spam records, one per slot (linesPerMillisecond slots per millisecond), 
+        and only the slots of memory, hitch, and error records are replaced.
+        The gap to the next record (geometric), its type, hitch messages, and memory footprint steps are looked up 
+        in tables drawn from the seed up front, so each record only takes a few getrandbits calls and string concatenations.
+        In the last second, records are yielded one at a time, as log spam where an error record would exceed lines,
+        so exactly lines lines are generated (and no more than a record past size bytes).
+        The system information record is always generated whole, so lines must be at least systemInfoLines.
+        
+        :param lines: number of lines to generate, at least systemInfoLines
+        :type lines: int
+        :param size: number of bytes to generate
+        :type size: int
+        :returns: chunk - log records
+        :rtype: generator"""
+        if lines is not None and lines < self.systemInfoLines:
+            raise ValueError("lines must be at least " + str(self.systemInfoLines) + " (the system information record), not: " + str(lines))
+        lines = math.inf if lines is None else lines
+        size = math.inf if size is None else size
+        rng = random.Random(self.seed)
+        bits = rng.getrandbits
+        spamWeight, memoryWeight, hitchWeight, errorWeight = self.mix
+        otherWeight = memoryWeight + hitchWeight + errorWeight
+        spamChance = spamWeight / (spamWeight + otherWeight)
+        if spamChance == 1:
+            gaps = None
+        elif spamChance == 0:
+            gaps = [0] * 65536
+        else:
+            gaps = [int(math.log(1.0 - (index + 0.5) / 65536) / math.log(spamChance)) for index in range(65536)]
+        kinds = [0 if index < 65536 * memoryWeight / otherWeight else 1 if index < 65536 * (memoryWeight + hitchWeight) / otherWeight else 2 
+                 for index in range(65536)] if otherWeight else None
+        hitches = [self.hitch % (rng.choice(self.hitchThreads), "%.2f" % rng.uniform(30.0, 3000.0)) for index in range(4096)]
+        footprintSteps = [round(rng.gauss(0.2, 5.0)) for index in range(4096)] # hundredths of a MiB
+        errors = [self.errors[0 if rng.random() < 0.6 else 1] for index in range(4096)]
+        memoryStart, memoryMiddle = self.memoryUsage.split("%s")[:2]
+        footprints = {}
+        footprint = 3200
+        
+        slotsPerSecond = 1000 * self.linesPerMillisecond
+        suffixes = [("%03d]" % millisecond) + self.logSpam for millisecond in range(1000) for slot in range(self.linesPerMillisecond)]
+        prefixLength = len("[01Jan23_00:00:00.000]")
+        errorLines = self.errors[0].count("\n")
+        
+        chunk = self.startTime.strftime("[%d%b%y_%H:%M:%S.000]") + self.getSystemInfo()
+        line, byteCount = chunk.count("\n"), len(chunk)
+        yield chunk
+        nextRecord = math.inf if gaps is None else gaps[bits(16)] # slot of the next memory, hitch, or error record
+        second = 0
+        while line < lines and byteCount < size:
+            secondStart = second * slotsPerSecond
+            timeStamp = (self.startTime + datetime.timedelta(seconds=second)).strftime("[%d%b%y_%H:%M:%S.")
+            runTime = memoryMiddle + str(second) + "."
+            records = [timeStamp + suffix for suffix in suffixes]
+            secondLines = slotsPerSecond
+            while nextRecord < secondStart + slotsPerSecond:
+                slot = nextRecord - secondStart
+                prefix = records[slot][:prefixLength]
+                kind = kinds[bits(16)]
+                if kind == 0:
+                    footprint = max(1600, footprint + footprintSteps[bits(12)])
+                    footprintText = footprints.get(footprint)
+                    if footprintText is None:
+                        footprintText = footprints[footprint] = "%d.%02d" % divmod(footprint, 100)
+                    records[slot] = prefix + memoryStart + footprintText + runTime + prefix[18:21] + "\n" # run time: seconds of log time
+                elif kind == 1:
+                    records[slot] = prefix + hitches[bits(12)]
+                else:
+                    records[slot] = prefix + errors[bits(12)]
+                    secondLines += errorLines - 1
+                nextRecord += 1 + gaps[bits(16)]
+            second += 1
+            
+            chunk = "".join(records)
+            if line + secondLines <= lines and byteCount + len(chunk) <= size:
+                line += secondLines
+                byteCount += len(chunk)
+                yield chunk
+                continue
+            for record in records: # the last second
+                recordLines = record.count("\n")
+                if line + recordLines > lines:
+                    record, recordLines = record[:prefixLength] + self.logSpam, 1
+                line += recordLines
+                byteCount += len(record)
+                yield record
+                if line >= lines or byteCount >= size:
+                    return
+            
+    def writeLog(self, fileName, lines=None, size=None, bufferSize=4*1024**2) -> tuple:
+        """Writes the generated log to fileName, through a write buffer of bufferSize bytes 
+        (each second of log time is written as a single string, of about linesPerMillisecond * 60KB).
+        
+        :param fileName: log file name
+        :type fileName: str
+        :param lines: number of lines to generate
+        :type lines: int
+        :param size: number of bytes to generate
+        :type size: int
+        :param bufferSize: size of the write buffer in bytes
+        :type bufferSize: int
+        :returns: (lines, bytes) written
+        :rtype: tuple"""
+        lineCount, byteCount = 0, 0
+        with open(fileName, 'w', encoding='utf-8', newline='\n', buffering=bufferSize) as log:
+            for chunk in self.generateChunks(lines, size):
+                log.write(chunk)
+                lineCount += chunk.count("\n")
+                byteCount += len(chunk)
+        return lineCount, byteCount
+
 def main():
     """
     Defines order of execution for the application.
     """
-    objLogCreator = LogCreator()
-    objLogCreator.createLogFile()
-    objLogCreator.getSystemInfo()
-    objLogCreator.populateLog()
-    objLogCreator.printFinalStats()
+    argParser = argparse.ArgumentParser(description="Creates a log file of arbitrary statements in the Logs directory, as LogParser.py's data source.")
+    argParser.add_argument("--prints", type=int, default=10000, 
+                           help="number of statements logged, errors add lines for their callstack (default: 10000)")
+    argParser.add_argument("--threads", type=int, default=1, 
+                           help="number of threads populating the log file, through a queue drained by a single batched writer (default: 1, log directly)")
+    argParser.add_argument("--lines", type=int, 
+                           help="generator mode: number of lines to generate, at least the " + str(LogGenerator().systemInfoLines) + 
+                                " lines of the system information record")
+    argParser.add_argument("--size", type=float, help="generator mode: MiB to generate (with --lines, whichever is reached first)")
+    argParser.add_argument("--seed", type=int, default=0, help="generator mode: seed of the generated content (default: 0)")
+    argParser.add_argument("--mix", type=LogGenerator.parseMix, default=LogGenerator.defaultMix, 
+                           help="generator mode: relative likelihood of log spam, memory usage, hitch, and error records (default: 846,142,9,3)")
+    argParser.add_argument("--output", help="generator mode: log file name (default: Logs/CreateArbitraryLog_<timestamp>.log)")
+    args = argParser.parse_args()
+    
+    if args.lines is None and args.size is None:
+        if psutil is None:
+            argParser.error("psutil is required to log the application's memory usage (or generate a synthetic log with --lines or --size)")
+        objLogCreator = LogCreator()
+        objLogCreator.createLogFile()
+        objLogCreator.getSystemInfo()
+        if args.threads > 1:
+            objLogCreator.populateLogThreaded(args.threads, args.prints)
+        else:
+            objLogCreator.populateLog(args.prints)
+        objLogCreator.printFinalStats()
+        return
+    
+    objLogGenerator = LogGenerator(args.seed, args.mix)
+    if args.lines is not None and args.lines < objLogGenerator.systemInfoLines:
+        argParser.error("--lines must be at least " + str(objLogGenerator.systemInfoLines) + " (the lines of the system information record)")
+    fileName = args.output
+    if fileName is None:
+        os.makedirs("Logs", exist_ok=True)
+        fileName = os.path.join("Logs", "CreateArbitraryLog_" + str(datetime.datetime.now()).replace(" ","_").replace(":",".") + ".log")
+    startTime = time.perf_counter()
+    lineCount, byteCount = objLogGenerator.writeLog(fileName, args.lines, None if args.size is None else int(args.size * 1024**2))
+    elapsedTime = time.perf_counter() - startTime
+    print("Generated " + str(lineCount) + " lines (" + str(round(byteCount/1024**2, 1)) + " MiB) to " + fileName + 
+          " in " + str(round(elapsedTime, 2)) + " seconds (" + str(round(byteCount/1024**2/elapsedTime, 1)) + " MiB/s)")
 
 # Execute!    
 if __name__ == "__main__":
@@ -0,0 +1,556 @@
+"""
+William Fissler 2023
+
+LogIndexing.py
+
+Sidecar files LogParser.py keeps next to the log files it parses: checkpoints of the data already parsed (for --incremental and --follow),
+sparse time stamp to byte offset indexes (for --since and --until), and cached chunk results (for --cache).
+"""
+
+import logging, os, time, json, hashlib, math, zlib, bisect
+from functools import partial
+from itertools import repeat
+
+from LogRecords import HitchRecord, MemoryRecord, ErrorRecord, TimeStampParser
+from LogReaders import isCompressedLog, openLog, findLastRecordStart, findTimeEntries
+from LogStatistics import SpamCounter
+
+class CheckpointStore:
+    """
+    Class for persisting how far each log file has been parsed, so that later runs only parse data appended since.
+    Checkpoints are kept in a JSON sidecar file by absolute path, and a log file is parsed from the start again if it was replaced, truncated, or rewritten, 
+    or from the checkpoint of the log file it was rotated from (see findRotated).
+
+    Attributes
+    ----------
+    fileName : str
+        JSON sidecar file the checkpoints are loaded from and saved to.
+    checkpoints{} : dict
+        Stores the checkpoint of each log file by absolute path.
+    memorySamples{} : tuple
+        Stores the latest memory sample preceding the checkpoint each log file is parsed from (see getRange), by log file name, 
+        None if it is parsed from the start or no sample precedes the checkpoint.
+    aggregates : dict
+        Defaults to None (no aggregates were saved, e.g. by a run before they were recorded), 
+        otherwise the aggregates of every record parsed up to the checkpoints.
+    fingerprintSize : int
+        Defaults to 4096 (number of bytes preceding the checkpoint offset, and at the start of the log file, that are hashed).
+        
+    Methods
+    -------
+    __init__(fileName:str)
+        Constructor.
+        Loads the checkpoints from fileName, if it exists.
+        
+    fingerprint(logName:str, offset:int, size:int) -> str
+        Hashes the (decompressed) bytes of logName preceding offset.
+        
+    findRotated(logName:str, stat:os.stat_result) -> dict
+        Finds the checkpoint of the log file logName was rotated from, if any.
+        
+    getRange(logName:str) -> tuple
+        Gets the byte range of logName still to be parsed: from its checkpoint to the end of its last complete record.
+        :returns: (start, end, lineCount) - lineCount being the number of lines before start
+        :rtype: tuple
+        
+    getMemorySample(checkpoint:dict) -> tuple
+        Gets the latest memory sample preceding a checkpoint.
+        
+    update(logName:str, offset:int, lineCount:int, memorySample:tuple)
+        Records that logName has been parsed up to offset, which is lineCount lines into the file, and the latest memory sample preceding it.
+        
+    save()
+        Writes the checkpoints and aggregates to fileName (via a temporary file, so an interrupted save never corrupts the store).
+    """
+    def __init__(self, fileName) -> None:
+        """Constructor.
+        Loads the checkpoints from fileName, if it exists."""
+        self.fileName = fileName
+        self.checkpoints = {}
+        self.memorySamples = {}
+        self.aggregates = None
+        self.fingerprintSize = 4096
+        try:
+            if os.path.isfile(fileName):
+                with open(fileName, encoding='utf-8') as checkpointFile:
+                    store = json.load(checkpointFile)
+                if "checkpoints" in store: # otherwise saved before aggregates were recorded, as the checkpoints alone (keyed by absolute path)
+                    self.checkpoints, self.aggregates = store["checkpoints"], store.get("aggregates")
+                else:
+                    self.checkpoints = store
+                logging.info("Loaded %d checkpoints from %s", len(self.checkpoints), fileName)
+        except Exception as e:
+            logging.warning("Checkpoints could not be loaded from %s, all log files will be parsed from the start", fileName)
+            logging.exception(e)
+            
+    def fingerprint(self, logName, offset, size=None) -> str:
+        """Hashes the size (by default fingerprintSize) bytes of logName preceding offset, decompressed if logName is compressed."""
+        size = self.fingerprintSize if size is None else size
+        with openLog(logName) as cachedLog:
+            cachedLog.seek(max(0, offset - size))
+            return hashlib.blake2b(cachedLog.read(min(offset, size)), digest_size=16).hexdigest()
+    
+    def findRotated(self, logName, stat) -> dict:
+        """Finds the checkpoint of the log file logName was rotated from: a checkpoint of another path with logName's inode (renamed) 
+        or, for a compressed logName, the same head (compressed), and the same bytes preceding its offset, 
+        whose path no longer holds the file checkpointed (it was removed, or replaced by a new log file).
+        
+        :param logName: log file name without a checkpoint of its own
+        :type logName: str
+        :param stat: os.stat of logName
+        :type stat: os.stat_result
+        :returns: checkpoint, or None if logName was not rotated from a log file with a checkpoint
+        :rtype: dict"""
+        compressed = isCompressedLog(logName)
+        heads = {} # fingerprint of the head of logName, by head size
+        for path, checkpoint in self.checkpoints.items():
+            if path == os.path.abspath(logName) or "head" not in checkpoint: # checkpoints saved before heads were recorded are not matched
+                continue
+            if checkpoint["inode"] == stat.st_ino and not compressed:
+                if checkpoint["offset"] > stat.st_size:
+                    continue
+            elif compressed and not isCompressedLog(path):
+                headSize = min(checkpoint["offset"], self.fingerprintSize)
+                if headSize not in heads:
+                    heads[headSize] = self.fingerprint(logName, headSize, headSize)
+                if heads[headSize] != checkpoint["head"]:
+                    continue
+            else:
+                continue
+            if self.fingerprint(logName, checkpoint["offset"]) != checkpoint["fingerprint"]:
+                continue
+            try: # still the file checkpointed, so logName is a copy rather than a rotation
+                pathStat = os.stat(path)
+                if (pathStat.st_ino == checkpoint["inode"] and checkpoint["offset"] <= pathStat.st_size 
+                        and self.fingerprint(path, checkpoint["offset"]) == checkpoint["fingerprint"]):
+                    continue
+            except FileNotFoundError:
+                pass
+            logging.info("%s was rotated from %s, parsing from its checkpoint at line %d", logName, path, checkpoint["lines"])
+            return checkpoint
+        return None
+    
+    def getRange(self, logName) -> tuple:
+        """Gets the byte range of logName still to be parsed: from its checkpoint (or that of the log file it was rotated from, see findRotated) 
+        to the end of its last complete record, setting the latest memory sample preceding that checkpoint in memorySamples.
+        A compressed log file is parsed to its end (None), unless it is unchanged since its checkpoint.
+        
+        :param logName: log file name
+        :type logName: str
+        :returns: (start, end, lineCount) - lineCount being the number of lines before start (start being an offset in the decompressed log)
+        :rtype: tuple"""
+        stat = os.stat(logName)
+        checkpoint = self.checkpoints.get(os.path.abspath(logName))
+        compressed = isCompressedLog(logName)
+        start, lineCount = 0, 0
+        self.memorySamples[logName] = None
+        
+        if checkpoint is not None and checkpoint["inode"] == stat.st_ino and (compressed or checkpoint["offset"] <= stat.st_size):
+            if checkpoint["size"] == stat.st_size and checkpoint["mtime"] == stat.st_mtime_ns:
+                self.memorySamples[logName] = self.getMemorySample(checkpoint)
+                return checkpoint["offset"], checkpoint["offset"], checkpoint["lines"] # unchanged since last run
+            if compressed: # rewritten (compressed log files are rotated, not appended to)
+                checkpoint = None
+            elif self.fingerprint(logName, checkpoint["offset"]) == checkpoint["fingerprint"]:
+                start, lineCount = checkpoint["offset"], checkpoint["lines"]
+                self.memorySamples[logName] = self.getMemorySample(checkpoint)
+            else:
+                logging.info("%s was rewritten since its checkpoint, parsing from the start", logName)
+                checkpoint = None
+        else:
+            checkpoint = None
+        if checkpoint is None:
+            rotated = self.findRotated(logName, stat)
+            if rotated is not None:
+                start, lineCount = rotated["offset"], rotated["lines"]
+                self.memorySamples[logName] = self.getMemorySample(rotated)
+        
+        if compressed:
+            return start, None, lineCount
+        end = stat.st_size
+        if end > start:
+            with open(logName, 'rb') as cachedLog:
+                cachedLog.seek(end - 1)
+                lastByte = cachedLog.read(1)
+            if lastByte != b"\n": # last record is still being written
+                end = findLastRecordStart(logName, start, end)
+        return start, end, lineCount
+    
+    def getMemorySample(self, checkpoint) -> tuple:
+        """Gets the latest memory sample preceding a checkpoint (see HitchMemoryJoiner.lastSamples), or None if it has none 
+        (e.g. saved before memory samples were recorded)."""
+        memorySample = checkpoint.get("memorySample")
+        return None if memorySample is None else tuple(memorySample)
+    
+    def update(self, logName, offset, lineCount, memorySample=None):
+        """Records that logName has been parsed up to offset (None being the end of the file), which is lineCount lines into the file, 
+        and the latest memory sample preceding offset (line number, footprint, footprint delta, run time), or None if it has none."""
+        stat = os.stat(logName)
+        if offset is None:
+            offset = stat.st_size
+        self.checkpoints[os.path.abspath(logName)] = {"inode": stat.st_ino, 
+                                                      "size": stat.st_size, 
+                                                      "mtime": stat.st_mtime_ns, 
+                                                      "offset": offset, 
+                                                      "lines": lineCount, 
+                                                      "fingerprint": self.fingerprint(logName, offset), 
+                                                      "head": self.fingerprint(logName, min(offset, self.fingerprintSize)), 
+                                                      "memorySample": memorySample}
+    
+    def save(self):
+        """Writes the checkpoints and aggregates to fileName (via a temporary file, so an interrupted save never corrupts the store)."""
+        try:
+            with open(self.fileName + ".tmp", 'w', encoding='utf-8') as checkpointFile:
+                json.dump({"checkpoints": self.checkpoints, "aggregates": self.aggregates}, checkpointFile, indent=1)
+            os.replace(self.fileName + ".tmp", self.fileName)
+            logging.info("Saved %d checkpoints to %s", len(self.checkpoints), self.fileName)
+        except Exception as e:
+            logging.exception(e)
+
+class TimeIndex:
+    """
+    Class for a sparse index of the time stamp at every interval bytes of each log file, so that a time range can be parsed 
+    without reading the rest of the file. Entries are found by the parse of the file (see update), or by a scan of it (see build), 
+    and hold the running maximum time stamp, so ranges are widened by tolerance seconds for records out of time stamp order.
+
+    Attributes
+    ----------
+    fileName : str
+        JSON sidecar file the indexes are loaded from and saved to.
+    interval : int
+        Defaults to 64KiB (bytes between index entries).
+    tolerance : float
+        Defaults to 1.0 (seconds a record's time stamp may precede those of the records written before it).
+    indexes{} : dict
+        Stores the index of each log file by absolute path.
+    timeStamps : TimeStampParser
+        Decodes the time stamps of the records indexed.
+        
+    Methods
+    -------
+    __init__(fileName:str, interval:int, tolerance:float)
+        Constructor.
+        Loads the indexes from fileName, if it exists.
+        
+    build(logName:str, end:int) -> list
+        Indexes the data of logName (up to end) not yet indexed.
+        :returns: entries - [seconds, offset, lineCount] of each index entry
+        :rtype: list
+        
+    update(logName:str, start:int, entries:list)
+        Adds the entries found by parsing logName (see findTimeEntries) past the end of the data already indexed.
+        
+    findRange(logName:str, since:float, until:float) -> tuple
+        Gets the byte range of logName containing every record time stamped from since to until, by binary search of its index.
+        :returns: (start, end, lineCount) - lineCount being the number of lines before start
+        :rtype: tuple
+        
+    save()
+        Writes the indexes to fileName (via a temporary file, so an interrupted save never corrupts the store).
+    """
+    def __init__(self, fileName, interval=64 * 1024, tolerance=1.0) -> None:
+        """Constructor.
+        Loads the indexes from fileName, if it exists."""
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0, not: " + str(interval))
+        self.fileName = fileName
+        self.interval = interval
+        self.tolerance = tolerance
+        self.indexes = {}
+        self.timeStamps = TimeStampParser()
+        try:
+            if os.path.isfile(fileName):
+                with open(fileName, encoding='utf-8') as indexFile:
+                    self.indexes = json.load(indexFile)
+                logging.info("Loaded %d time indexes from %s", len(self.indexes), fileName)
+        except Exception as e:
+            logging.warning("Time indexes could not be loaded from %s, log files will be indexed again", fileName)
+            logging.exception(e)
+            
+    def fingerprint(self, logName, offset) -> str:
+        """Hashes the 4096 bytes of logName preceding offset."""
+        with open(logName, 'rb') as cachedLog:
+            cachedLog.seek(max(0, offset - 4096))
+            return hashlib.blake2b(cachedLog.read(min(offset, 4096)), digest_size=16).hexdigest()
+            
+    def resume(self, logName, stat) -> dict:
+        """Gets the index of logName to extend, or an empty index if it was replaced or rewritten since it was indexed, 
+        or was indexed with a different interval.
+        
+        :param logName: log file name
+        :type logName: str
+        :param stat: current os.stat of logName
+        :type stat: os.stat_result
+        :returns: index - its entries, and the byte offset and number of lines the data indexed ends at ("indexedTo" and "lines")
+        :rtype: dict"""
+        index = self.indexes.get(os.path.abspath(logName))
+        if (index is None or index["inode"] != stat.st_ino or index["interval"] != self.interval or index["indexedTo"] > stat.st_size 
+                or self.fingerprint(logName, index["indexedTo"]) != index["fingerprint"]):
+            index = {"entries": [], "indexedTo": 0, "lines": 0}
+        return index
+        
+    def store(self, logName, stat, entries, indexedTo, lineCount):
+        """Stores the index of logName, ending at indexedTo (the end of a line), preceded by lineCount lines."""
+        self.indexes[os.path.abspath(logName)] = {"inode": stat.st_ino, 
+                                                  "size": stat.st_size, 
+                                                  "mtime": stat.st_mtime_ns, 
+                                                  "interval": self.interval, 
+                                                  "indexedTo": indexedTo, 
+                                                  "lines": lineCount, 
+                                                  "fingerprint": self.fingerprint(logName, indexedTo), 
+                                                  "entries": entries}
+        
+    def build(self, logName, end=None, blockSize=1024**2) -> list:
+        """Indexes the data of logName not yet indexed (all of it, if it was replaced or rewritten since it was indexed, 
+        or was indexed with a different interval), up to the end of its last complete line (or up to end).
+        
+        :param logName: log file name
+        :type logName: str
+        :param end: byte offset to index up to (the start of a line), or None for the end of the log file
+        :type end: int
+        :param blockSize: bytes read at a time
+        :type blockSize: int
+        :returns: entries - [seconds, offset, lineCount] of each index entry, lineCount being the number of lines before offset
+        :rtype: list"""
+        stat = os.stat(logName)
+        index = self.indexes.get(os.path.abspath(logName))
+        if index is not None and index["size"] == stat.st_size and index["mtime"] == stat.st_mtime_ns and index["interval"] == self.interval:
+            return index["entries"] # unchanged since indexed
+        index = self.resume(logName, stat)
+        entries = index["entries"]
+        position, lineCount = index["indexedTo"], index["lines"] # start of the block, and lines preceding it
+        if end is not None and position >= end:
+            return entries
+        target = entries[-1][1] + self.interval if entries else position # offset of the next entry (or the next record after it)
+        latest = entries[-1][0] if entries else -math.inf
+        remaining = None if end is None else end - position
+        
+        with open(logName, 'rb') as cachedLog:
+            cachedLog.seek(position)
+            carry = b""
+            while True:
+                data = cachedLog.read(blockSize if remaining is None else min(blockSize, remaining))
+                if remaining is not None:
+                    remaining -= len(data)
+                block = carry + data
+                cut = block.rfind(b"\n") + 1 # blocks end with a complete line, so every record start in one is followed by its time stamp
+                carry = block[cut:]
+                block = block[:cut]
+                if not block:
+                    if not data:
+                        break
+                    continue
+                blockEntries, target = findTimeEntries(block, position, target, self.interval, self.timeStamps)
+                for seconds, offset, linesAt in blockEntries:
+                    latest = max(latest, seconds)
+                    entries.append([latest, offset, lineCount + linesAt])
+                lineCount += block.count(b"\n")
+                position += len(block)
+                    
+        self.store(logName, stat, entries, position, lineCount)
+        return entries
+        
+    def update(self, logName, start, entries):
+        """Adds the entries found by parsing logName (see findTimeEntries) past the end of the data already indexed, 
+        so the data parsed is indexed without being read again. Nothing is added if the range parsed started after the data indexed, 
+        so the index never has a gap, and the data indexed then ends at the last entry.
+        
+        :param logName: log file name
+        :type logName: str
+        :param start: byte offset the range parsed started at
+        :type start: int
+        :param entries: [seconds, offset, lineCount] of each entry found, lineCount being the number of lines before offset
+        :type entries: list"""
+        stat = os.stat(logName)
+        index = self.resume(logName, stat)
+        if start > index["indexedTo"]: # the data between them was never parsed or indexed
+            return
+        indexEntries = index["entries"]
+        entryCount = len(indexEntries)
+        latest = indexEntries[-1][0] if indexEntries else -math.inf
+        nextOffset = max(index["indexedTo"], indexEntries[-1][1] + self.interval if indexEntries else 0)
+        for seconds, offset, lineCount in entries:
+            if offset >= nextOffset:
+                latest = max(latest, seconds)
+                indexEntries.append([latest, offset, lineCount])
+                nextOffset = offset + self.interval
+        if len(indexEntries) > entryCount:
+            self.store(logName, stat, indexEntries, indexEntries[-1][1], indexEntries[-1][2])
+        
+    def findRange(self, logName, since, until) -> tuple:
+        """Gets the byte range of logName containing every record time stamped from since to until (and records either side of them, 
+        up to the index interval), by binary search of its index (see build), widened by tolerance seconds on either side, 
+        so that records written out of time stamp order are still within it.
+        
+        :param logName: log file name, indexed by build
+        :type logName: str
+        :param since: seconds since 1970-01-01 of the earliest record (-math.inf for the start of the log file)
+        :type since: float
+        :param until: seconds since 1970-01-01 of the latest record (math.inf for the end of the log file)
+        :type until: float
+        :returns: (start, end, lineCount) - end being None for the end of the log file, and lineCount the number of lines before start
+        :rtype: tuple"""
+        entries = self.indexes[os.path.abspath(logName)]["entries"]
+        timeStamps = [entry[0] for entry in entries]
+        first = bisect.bisect_left(timeStamps, since - self.tolerance) - 1 # last entry before since, records from since may follow it
+        start, lineCount = (0, 0) if first < 0 else (entries[first][1], entries[first][2])
+        last = bisect.bisect_right(timeStamps, until + self.tolerance) # first entry after until, no record up to until follows it
+        end = None if last >= len(entries) else entries[last][1]
+        return start, end, lineCount
+        
+    def save(self):
+        """Writes the indexes to fileName (via a temporary file, so an interrupted save never corrupts the store)."""
+        try:
+            with open(self.fileName + ".tmp", 'w', encoding='utf-8') as indexFile:
+                json.dump(self.indexes, indexFile)
+            os.replace(self.fileName + ".tmp", self.fileName)
+            logging.info("Saved %d time indexes to %s", len(self.indexes), self.fileName)
+        except Exception as e:
+            logging.exception(e)
+
+class ResultCache:
+    """
+    Class for caching the results of parsing each chunk of a log file on disk, so unchanged log files are never parsed again.
+    A log file is identified by its size, modification time, and a hash of its first and last sampleSize bytes, and the least recently used entries 
+    are removed when their total size exceeds maxBytes.
+
+    Attributes
+    ----------
+    directory : str
+        Directory the entries are stored in, created if it does not exist.
+    maxBytes : int
+        Defaults to 256MiB (total size of the entries, beyond which the least recently used are removed).
+    sampleSize : int
+        Defaults to 8192 (number of bytes at the start and end of a log file hashed to identify it).
+    entries{} : list
+        Stores the [last used time, size] of each entry, by entry file name.
+    totalBytes : int
+        Total size of the entries.
+    hits, misses : int
+        Number of chunks loaded from the cache, and not found in it.
+
+    Methods
+    -------
+    __init__(directory:str, maxBytes:int)
+        Constructor.
+        Creates directory if it does not exist, and finds the entries already in it.
+
+    identify(logName:str) -> tuple
+        Identifies the current content of logName, without reading all of it.
+        :returns: (identity, size) - identity being a hex digest, and size the size in bytes the identity is of
+        :rtype: tuple
+
+    load(logName:str, identity:str, start:int, end:int, config:str) -> tuple
+        Loads the result of parsing the start to end byte range of logName with config, if cached.
+        :returns: (hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries) as returned by parseLogChunk, or None if not cached
+        :rtype: tuple
+
+    save(identity:str, start:int, end:int, config:str, result:tuple)
+        Stores the result of parsing the start to end byte range of a log file with config, removing the least recently used entries if needed.
+    """
+    def __init__(self, directory, maxBytes=256 * 1024**2) -> None:
+        """Constructor.
+        Creates directory if it does not exist, and finds the entries already in it."""
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.sampleSize = 8192
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".cache"):
+                stat = entry.stat()
+                self.entries[entry.name] = [stat.st_mtime, stat.st_size]
+        self.totalBytes = sum(size for lastUsed, size in self.entries.values())
+
+    def identify(self, logName) -> tuple:
+        """Identifies the current content of logName by its size, modification time, and a hash of its first and last sampleSize bytes.
+
+        :param logName: log file name
+        :type logName: str
+        :returns: (identity, size) - identity being a hex digest, and size the size in bytes the identity is of
+        :rtype: tuple"""
+        stat = os.stat(logName)
+        identity = hashlib.blake2b((str(stat.st_size) + ":" + str(stat.st_mtime_ns)).encode(), digest_size=16)
+        with open(logName, 'rb') as cachedLog:
+            identity.update(cachedLog.read(self.sampleSize))
+            if stat.st_size > self.sampleSize:
+                cachedLog.seek(max(self.sampleSize, stat.st_size - self.sampleSize))
+                identity.update(cachedLog.read(self.sampleSize))
+        return identity.hexdigest(), stat.st_size
+
+    def entryName(self, identity, start, end, config) -> str:
+        """Gets the file name of the entry for the start to end byte range of the log file identified by identity, parsed with config."""
+        key = "|".join(("4", identity, str(start), str(end), config)) # "4" is the entry format version (JSON, with time index entries)
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + ".cache"
+
+    def load(self, logName, identity, start, end, config) -> tuple:
+        """Loads the result of parsing the start to end byte range of logName with config, if cached.
+
+        :param logName: log file name, given to the records loaded
+        :type logName: str
+        :param identity: identity of the log file, from identify
+        :type identity: str
+        :param config: criteria and options the result depends on
+        :type config: str
+        :returns: (hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries) as returned by parseLogChunk, or None if not cached
+        :rtype: tuple"""
+        name = self.entryName(identity, start, end, config)
+        if name not in self.entries:
+            self.misses += 1
+            return None
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'rb') as entry:
+                hitchColumns, memoryColumns, errorColumns, lineCount, spamState, timeEntries = json.loads(zlib.decompress(entry.read()))
+            os.utime(path) # mark as recently used
+        except Exception as e:
+            logging.warning("Result cache entry %s could not be loaded, parsing %s instead", name, logName)
+            logging.exception(e)
+            self.misses += 1
+            return None
+        self.entries[name][0] = time.time()
+        self.hits += 1
+
+        def toRecords(recordType, columns): # tuple.__new__ builds each record in C, rather than through the NamedTuple constructor
+            return list(map(partial(tuple.__new__, recordType), zip(repeat(logName), *columns))) if columns else []
+        spamCounter = SpamCounter.fromState(spamState) if spamState is not None else None
+        return (toRecords(HitchRecord, hitchColumns), toRecords(MemoryRecord, memoryColumns), toRecords(ErrorRecord, errorColumns),
+                lineCount, spamCounter, timeEntries)
+
+    def save(self, identity, start, end, config, result):
+        """Stores the result of parsing the start to end byte range of a log file with config,
+        removing the least recently used entries if the total size exceeds maxBytes.
+
+        :param identity: identity of the log file, from identify
+        :type identity: str
+        :param config: criteria and options the result depends on
+        :type config: str
+        :param result: (hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries) as returned by parseLogChunk
+        :type result: tuple"""
+        hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries = result
+        def toColumns(records):
+            return [list(column) for column in zip(*records)][1:] # every record has the same log name
+        spamState = spamCounter.getState() if spamCounter is not None else None
+        payload = zlib.compress(json.dumps([toColumns(hitchList), toColumns(memoryList), toColumns(errorList), lineCount, spamState, timeEntries]).encode(), 1)
+
+        name = self.entryName(identity, start, end, config)
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", 'wb') as entry:
+            entry.write(payload)
+        os.replace(path + ".tmp", path)
+        if name in self.entries:
+            self.totalBytes -= self.entries[name][1]
+        self.entries[name] = [time.time(), len(payload)]
+        self.totalBytes += len(payload)
+
+        if self.totalBytes > self.maxBytes:
+            for name in sorted(self.entries, key=lambda name: self.entries[name][0]): # least recently used first
+                if self.totalBytes <= self.maxBytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                self.totalBytes -= self.entries.pop(name)[1]
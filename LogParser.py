@@ -4,90 +4,144 @@ William Fissler 2023
 LogParser.py
 
 A program that parses all logs in a given path, and outputs results (into csv files) for the following:
-- Machine (system) information (Work in progress)
-- Memory usage statistics
-- LogSpam (Work in progress)
-- Hitch occurances and statistics 
-- Error ocurrances and callstacks (Work in progress)
+- Machine (system) information (Python version, host, OS, CPU, cores, and memory of each log file)
+- Memory usage statistics (footprint count, min, max, mean, and percentiles per log file and per machine)
+- Memory growth trends (least squares slope, peak and trough, and change points of the footprint per log file, for leak triage)
+- LogSpam (message templates repeated at least logSpamCriteria times)
+- Hitch occurances and statistics (duration count, min, max, mean, and percentiles per log file, per thread, and per machine)
+- Hitches joined with the nearest preceding memory sample of their log file (footprint, and its change from the sample before)
+- Error ocurrances and callstacks, and error groups (occurrences of the same error, by normalized stack signature)
 - Unit test results for the parsing operations (Work in progress)
 
+Reports are written as csv files, or as typed columnar files (Parquet or Arrow IPC/Feather with pyarrow, or NumPy .npz) with --format.
+Log files may be compressed (CreateArbitraryLog*.log.gz, .log.bz2, .log.xz, and .log.zst with zstandard installed), 
+and are decompressed as they are read.
+Records can also be indexed in a SQLite database with --sqlite, to be queried across runs (see QueryLogDatabase.py),
+and summarized in a self-contained HTML report with --html (memory and hitch charts downsampled to a fixed number of points, and paginated tables).
+Hosts with their own Logs directory can each write a partial result with --shard (records, counts, quantile sketches, error groups, and log spam summaries),
+and any number of partial results are combined into the reports with --merge.
+Each run writes a JSON run summary (stage durations, throughput, peak memory, matches per category) next to its LogParser log file,
+and --profile adds cProfile and tracemalloc statistics to it.
+
 Uses log files generated by CreateArbitraryLog.py as data source/s.
+Records and time stamps are defined in LogRecords.py, log files are read and parsed by LogReaders.py, summarized by LogStatistics.py,
+tracked across runs by the sidecar files of LogIndexing.py, and written by LogWriters.py. Stages are timed by RunTimer.py.
 
 Identified areas for future extenstion:
-- Develop logic to assess for duplicate log statements to be considered for log spam
 - Allow users to pass arguments for preferred input directory
 - Allow users to pass arguments for preferred output directory
 - Allow users to pass arguments for what criteria to parse for
-- Allow users to pass arguments for what file formats to store the results in
-- Develop functionality to convert .log files to interactive HTML files 
 - Refactor for improved performance and algorithm design
 
 """ 
 
-import logging, os, datetime, platform, glob, re, csv, time
+import logging, os, datetime, platform, glob, time, argparse, json, asyncio, math, zlib
+import cProfile, pstats, tracemalloc, io
+from concurrent.futures import ProcessPoolExecutor, Future
+from collections import deque
+from itertools import chain
+from functools import partial
+
+from RunTimer import runTimer, timed, getPeakMemory
+from LogRecords import HitchRecord, MemoryRecord, HitchMemoryRecord, ErrorRecord, SystemInfoRecord, SpamRecord, TimeStampParser
+from LogStatistics import SpamCounter, ErrorGrouper, HitchMemoryJoiner, RecordStatistics, SketchStatistics
+from LogReaders import (CriteriaMatcher, compressedLogOpeners, isCompressedLog, planLogChunks, findLastRecordStart, readSystemInfo,
+                        offsetLineNumbers, parseLogChunk, parseLogChunkBlocks, parseLogBatches, parseLogBlockBatches)
+from LogIndexing import CheckpointStore, TimeIndex, ResultCache
+from LogWriters import CSVWriter, ColumnarWriter, SQLiteWriter, HTMLWriter
 
-startTime = time.time()
+try:
+    import zstandard # optional, for .zst compressed log files
+except ImportError:
+    zstandard = None
 
-def createLogFile():
+@timed
+def createLogFile(logLevel=logging.INFO) -> str:
     """Creates log file with time stamped naming convention. 
         Configures logging encoding format, level, and statement format.
-        Create "Logs" directory if one does not exist."""
+        Create "Logs" directory if one does not exist.
+        
+        :param logLevel: minimum level of statements written to the log file, DEBUG is required for per line tracing
+        :type logLevel: int
+        :returns: logFileName - absolute path of the log file (which stays valid once the working directory is set to "Logs")
+        :rtype: str"""
     try:  
-        createLogFileTime = round(time.time(),5)          
         timestamp = str(datetime.datetime.now())
         timestamp = timestamp.replace(" ","_")
         timestamp = timestamp.replace(":",".")
-        logPath = '' 
-        logName = "LogParser_"+timestamp+".log"          
+        baseName = "LogParser_"+timestamp
+        logName = baseName+".log"          
         fileDupeNum = 0 
         
         if not os.path.exists("Logs"):
             os.makedirs("Logs")
                             
-        while os.path.isfile(logName):
-            logging.info(logName + "already exists")
+        while os.path.isfile(os.path.join("Logs", logName)):
             fileDupeNum += 1
-            logName = logName+"("+str(fileDupeNum)+".csv"
+            logName = baseName+"("+str(fileDupeNum)+").log"
             
-        if platform.system() == "Windows":
-            logPath = 'Logs"\"'
-        else:
-            logPath = "Logs/"   
-            
-        logging.basicConfig(filename=logPath + logName, 
+        logFileName = os.path.abspath(os.path.join("Logs", logName))
+        logging.basicConfig(filename=logFileName, 
                             encoding='utf-8', 
-                            level=logging.DEBUG, 
+                            level=logLevel, 
                             format='[%(asctime)s.%(msecs)03d] - %(levelname)s - %(message)s', 
                             datefmt='%d%b%y_%H:%M:%S')
-         
-        createLogFileTime = round(time.time()-createLogFileTime,5)
-        logging.info("Time to execute createLogFile: " + str(createLogFileTime) + " seconds")                
+        return logFileName
     except Exception as e:
-        createLogFileTime = round(time.time()-createLogFileTime,5)
-        logging.info("Time to execute createLogFile: " + str(createLogFileTime) + " seconds")
         logging.exception(e)                
 
+def initializeWorker(logFileName, logLevel):
+    """Configures logging in a worker process as createLogFile did in the main process, 
+        so statements from worker processes reach the same log file when they are started by spawn (rather than fork, 
+        where the configuration is inherited and this has no effect).
+        
+        :param logFileName: absolute path of the main process's log file, or None if it has none
+        :type logFileName: str
+        :param logLevel: minimum level of statements written to the log file
+        :type logLevel: int"""
+    if logFileName is not None:
+        logging.basicConfig(filename=logFileName, 
+                            encoding='utf-8', 
+                            level=logLevel, 
+                            format='[%(asctime)s.%(msecs)03d] - %(levelname)s - %(message)s', 
+                            datefmt='%d%b%y_%H:%M:%S')
+
 class LogParser:
     """
     Class for handling all parsing of criteria from log files and caching it for future use.
     
     Attributes
     ----------
-    hitchList[] : str
-        Stores a list of strings (log lines) matching hitchCriteria to be stored for sub string extraction, 
-        prior to being written to csv file.
-    memoryList[] : str
-        Stores a list of strings (log lines) matching memoryCriteria to be stored for sub string extraction, 
-        prior to being written to csv file.
-    errorList[] : str
-        Stores a list of strings (log lines) matching errorCriteria (including associated callstack) to be stored for sub string extraction, 
-        prior to being written to csv file. 
-    logSpamList[] : str
-        Stores a list of strings (log lines) that have been identified as repeated entries greater than or equal to logSpamCriteria, 
+    hitchList[] : HitchRecord
+        Stores a list of records extracted from log lines matching hitchCriteria, 
         prior to being written to csv file.
-    systemInfoList[] : str
-        Stores a list of strings (log lines) matching systemInfoCriteria to be stored for sub string extraction, 
+    memoryList[] : MemoryRecord
+        Stores a list of records extracted from log lines matching memoryCriteria, 
         prior to being written to csv file.
+    errorList[] : ErrorRecord
+        Stores a list of records extracted from log lines matching errorCriteria (including associated callstack), 
+        prior to being written to csv file (unless keepErrorRows is False). 
+    logSpamList[] : SpamRecord
+        Stores a list of records of the message templates in each log file that have been identified as repeated entries 
+        greater than or equal to logSpamCriteria, prior to being written to csv file.
+    systemInfoList[] : SystemInfoRecord
+        Stores a list of records extracted from the machine information block (the record matching systemInfoCriteria) 
+        in the header region of each log file parsed from its start, prior to being written to csv file.
+    hitchMemoryList[] : HitchMemoryRecord
+        Stores a list of the hitch records joined with the nearest preceding memory sample of their log file, prior to being written to csv file.
+    hitchCount, memoryCount, errorCount, logSpamCount : int
+        Number of records parsed for each criteria, in both batch (iterateLogs) and streaming (streamLogs) runs.
+    statistics : RecordStatistics
+        Collects the hitch durations and memory footprints parsed, in both batch and streaming runs, for the summary reports. 
+        Replaced by a SketchStatistics when streaming (streamLogs) or following, so memory stays bounded however many records are parsed, 
+        and for incremental runs, holding those of earlier runs (see addAggregates).
+    errorGroups : ErrorGrouper
+        Groups the error records parsed by stack signature, in both batch and streaming runs, for the error groups report.
+    hitchMemoryJoiner : HitchMemoryJoiner
+        Joins the hitch records parsed with the nearest preceding memory sample, in batch, parallel, streaming, follow, and incremental runs.
+    keepErrorRows : bool
+        Defaults to True, otherwise error records are only grouped (not stored in errorList, or yielded by streamLogs), 
+        so memory use is proportional to the number of distinct errors rather than occurrences.
     hitchCriteria : str
         Defaults to "Hitch".
     memoryCriteria : str
@@ -95,71 +149,183 @@ class LogParser:
     errorCriteria : str
         Defaults to "Error".
     systemInfoCriteria : str
-        Defaults to "System Information - ".
+        Defaults to "***System Informtation***" (as written by CreateArbitraryLog.py).
     logSpamCriteria : int 
         Defaults to 100 (represents number of times encountered).
+    spamCapacity : int
+        Defaults to 1000 (maximum number of message templates counted per log file for log spam detection, see SpamCounter), 
+        or 0 to disable log spam detection.
+    workers : int
+        Defaults to 1 (number of processes to parse log files with, files are parsed in the calling process when 1).
+    chunkSize : int
+        Defaults to 64MiB (approximate size in bytes of the ranges large log files are split into when workers > 1).
+    reader : str
+        Defaults to "lines" (decodes and evaluates every line), or "blocks" (searches undecoded blocks, decoding only matching lines).
+    traceEvery : int
+        Defaults to 0 (no per line statements, only a summary per log file), 
+        otherwise writes a debug statement for every Nth line evaluated, when the log level is DEBUG.
+    checkpoints : CheckpointStore
+        Defaults to None (every log file is parsed from the start), 
+        otherwise only data appended since each log file's checkpoint is parsed, and the checkpoints are updated.
+    resultCache : ResultCache
+        Defaults to None (every chunk is parsed), otherwise the results of chunks of unchanged log files are loaded rather than parsed, 
+        and the results of chunks parsed are stored.
+    timeIndex : TimeIndex
+        Defaults to None, otherwise the time index of each log file is updated as it is parsed.
+    timeRange : tuple
+        Defaults to None (every record is parsed), otherwise (since, until) seconds since 1970-01-01 (see TimeStampParser): 
+        only the records time stamped in the range are parsed, from the byte range of each log file found with timeIndex.
+    startLines{} : int
+        Stores the number of lines preceding the data parsed this run of each log file (e.g. up to its checkpoint), by log file name.
+    spamCounters{} : SpamCounter
+        Defaults to None, otherwise stores the log spam summary of each log file parsed, by log file name 
+        (for writePartialResult, and getAggregates, which for incremental runs include those of earlier runs).
+    partialFormat, partialVersion : str, int
+        Format name and version of the partial result files written by writePartialResult, and read by mergePartialResults.
         
     Methods
     -------
     __init__
         Constructor.
         Initializes the following attributes: 
-        hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchCriteria, memoryCriteria, 
-        systemInfoCriteria, logSpamCriteria, startTime.
+        hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchMemoryList, hitchCount, memoryCount, errorCount, logSpamCount, statistics, 
+        errorGroups, hitchMemoryJoiner, keepErrorRows, hitchCriteria, memoryCriteria, systemInfoCriteria, logSpamCriteria, spamCapacity, workers, chunkSize, reader, traceEvery, checkpoints, 
+        resultCache, timeIndex, timeRange, startLines, spamCounters.
     
     printFinalStats()
-        Prints to terminal window, and writes to the log file, the total execution time of the application.
+        Prints to terminal window, and writes to the log file, the total execution time and peak memory usage of the application.
+        
+    buildMatcher() -> CriteriaMatcher
+        Builds the matcher for hitchCriteria, memoryCriteria, and errorCriteria (in that priority order).
+        :returns: matcher - CriteriaMatcher to evaluate each log line with
+        :rtype: CriteriaMatcher
+        
+    getTraceEvery() -> int
+        Gets the traceEvery to parse with: traceEvery if this process logs DEBUG statements, otherwise 0.
         
     cacheLogs() -> list
         Verifies working directory for files to be processed.
-        Finds all files of .log extension, stores them in the logCache, and returns the logCache list.
+        Finds all files of .log extension (or compressed .log files, see openLog), stores them in the logCache, and returns the logCache list.
         :returns: logCache - list of strings representing .log file names found.
         :rtype: list  
         
+    findLogSpam(logName:str, spamCounter:SpamCounter) -> list
+        Identifies the message templates counted at least logSpamCriteria times in a log file.
+        :returns: logSpamList - list of SpamRecords, most frequent first
+        :rtype: list
+        
     interateLogs(logCache:list)
         Verifies logCache has contents prior to processing.
         Iterate through each line of each log file in logCache and evaluates for the established criteria, 
-        and appends the appropriate list with the log line containing the matched criteria.
+        and appends the appropriate list with the record extracted from the log line containing the matched criteria.
+        When workers > 1, each file (or chunkSize byte range of a large file) is parsed in a worker process.
         :param logCache: list of strings representing .log file names cached by cacheLogs().
         :type logCache: list
+        
+    streamLogs(logCache:list) -> generator
+        Streaming equivalent of iterateLogs, yielding each record as it is parsed rather than storing it.
+        Memory use is bounded by chunkSize (and workers), regardless of the number or size of log files.
+        :param logCache: list of strings representing .log file names cached by cacheLogs().
+        :type logCache: list
+        
+    writePartialResult(fileName:str)
+        Writes the results of this run (a shard) to a compact, versioned partial result file.
+        
+    mergePartialResults(fileNames:list)
+        Merges the partial results of shards into the lists, statistics, error groups, and log spam, as if their log files had been parsed by this run.
+        
+    getAggregates() -> dict
+        Gets the statistics, error groups, and log spam summaries of the records parsed, as a JSON serializable dictionary.
+        
+    addAggregates(aggregates:dict)
+        Restores the statistics, error groups, and log spam summaries of earlier runs, from getAggregates.
     """
+    partialFormat = "LogParserPartialResult"
+    partialVersion = 2 # error records and groups with time stamps
+    
     def __init__(self) -> None:
         """Constructor.
         Initializes the following attributes: 
-        hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchCriteria, memoryCriteria, 
-        systemInfoCriteria, logSpamCriteria, startTime."""
+        hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchMemoryList, hitchCount, memoryCount, errorCount, logSpamCount, statistics, 
+        errorGroups, hitchMemoryJoiner, keepErrorRows, hitchCriteria, memoryCriteria, systemInfoCriteria, logSpamCriteria, spamCapacity, workers, chunkSize, reader, traceEvery, checkpoints, 
+        resultCache, timeIndex, timeRange, startLines, spamCounters."""
         self.hitchList = []
         self.memoryList = []
         self.errorList = []
         self.logSpamList = []
         self.systemInfoList = []
+        self.hitchMemoryList = []
+        self.hitchCount = 0
+        self.memoryCount = 0
+        self.errorCount = 0
+        self.logSpamCount = 0
+        self.statistics = RecordStatistics()
+        self.errorGroups = ErrorGrouper()
+        self.hitchMemoryJoiner = HitchMemoryJoiner()
+        self.keepErrorRows = True
         self.hitchCriteria = "Hitch"
         self.memoryCriteria = "memory footprint"
         self.errorCriteria = "ERROR"
-        self.systemInfoCriteria = "System Information - "
+        self.systemInfoCriteria = "***System Informtation***"
         self.logSpamCriteria = 100 
+        self.spamCapacity = 1000
+        self.workers = 1
+        self.chunkSize = 64 * 1024**2
+        self.reader = "lines"
+        self.traceEvery = 0
+        self.checkpoints = None
+        self.resultCache = None
+        self.timeIndex = None
+        self.timeRange = None
+        self.startLines = {}
+        self.spamCounters = None
     
     def printFinalStats(self):
-        """Prints to terminal window, and writes to the log file, the total execution time of the application."""
+        """Prints to terminal window, and writes to the log file, the total execution time and peak memory usage of the application."""
         try: 
-            elapsedTime = str(round(time.time()-startTime,2))
+            elapsedTime = str(round(runTimer.getElapsed(),2))
+            peakMemory, workerPeakMemory = getPeakMemory()
             print("Total Execution Time: " + elapsedTime + " seconds")
-            logging.info(f"Lines matching: \n Hitch Criteria: " + str(len(self.hitchList)) + 
-                         "\n Memory Criteria: " + str(len(self.memoryList)) + 
-                         "\n Error Criteria: " + str(len(self.errorList)) + 
-                         "\n Log Spam Criteria:  " + str(len(self.logSpamList)))
+            logging.info(f"Lines matching: \n Hitch Criteria: " + str(self.hitchCount) + 
+                         "\n Memory Criteria: " + str(self.memoryCount) + 
+                         "\n Error Criteria: " + str(self.errorCount) + 
+                         "\n Log Spam Criteria:  " + str(self.logSpamCount))
             logging.info("Total Execution Time: " + elapsedTime + " seconds")
+            if peakMemory is not None:
+                peakMemoryStats = "Peak Memory Usage: " + str(round(peakMemory/1024**2,2)) + " MiB"
+                if workerPeakMemory:
+                    peakMemoryStats += " (largest worker process: " + str(round(workerPeakMemory/1024**2,2)) + " MiB)"
+                print(peakMemoryStats)
+                logging.info(peakMemoryStats)
         except Exception as e:
             logging.exception(e)
 
+    def buildMatcher(self) -> CriteriaMatcher:
+        """Builds the matcher for hitchCriteria, memoryCriteria, and errorCriteria (in that priority order).
+        
+        :returns: matcher - CriteriaMatcher to evaluate each log line with
+        :rtype: CriteriaMatcher"""
+        return CriteriaMatcher([("hitch", self.hitchCriteria), 
+                                ("memory", self.memoryCriteria), 
+                                ("error", self.errorCriteria)])
+
+    def getTraceEvery(self) -> int:
+        """Gets the traceEvery to parse with: traceEvery if this process logs DEBUG statements, otherwise 0. 
+        Evaluated once per run in this process, and passed to the parse functions, 
+        so that worker processes (whose logging may not be configured the same way) trace exactly when this process would.
+        
+        :rtype: int"""
+        return self.traceEvery if logging.getLogger().isEnabledFor(logging.DEBUG) else 0
+
+    @timed
     def cacheLogs(self) -> list:
         """Verifies working directory for files to be processed.
-        Finds all files of .log extension, stores them in the logCache, and returns the logCache list.
+        Finds all files of .log extension, and compressed .log files (.log.gz, .log.bz2, .log.xz, and .log.zst with zstandard installed), 
+        stores them in the logCache, and returns the logCache list.
         
         :returns: logCache - list of strings representing .log file names found.
         :rtype: list """
         try:
-            cacheLogsTime = time.time()
             logCache = []
             logging.info("Current working directory is: " + os.getcwd())
             
@@ -168,297 +334,866 @@ class LogParser:
                 os.chdir("Logs") #set working directory to log storage location before caching logs
                 logging.info("Current working is set to: " + os.getcwd())
                 
-                for file in glob.glob('CreateArbitraryLog*.log'):
-                    index = 0
-                    logCache.append(file) 
-                    logging.info("Found Log: " + file)
-                    index += 1
-                    
-            cacheLogsTime = round(time.time()-cacheLogsTime,5)
-            logging.info("Time to execute createLogFile: " + str(cacheLogsTime) + "ms")
+                for extension in [""] + list(compressedLogOpeners):
+                    for file in glob.glob('CreateArbitraryLog*.log' + extension):
+                        logCache.append(file) 
+                        logging.info("Found Log: " + file)
+                if zstandard is None:
+                    for file in glob.glob('CreateArbitraryLog*.log.zst'):
+                        logging.warning("Skipping " + file + ", the zstandard package is required to read .zst compressed log files")
             
             return logCache
         
         except Exception as e:
-            cacheLogsTime = round(time.time()-cacheLogsTime,5)
-            logging.info("Time to execute cacheLogs: " + str(cacheLogsTime) + "ms")
             logging.exception(e)
 
+    def iterateChunks(self, logCache, splitLogs):
+        """Generator that parses each log file in logCache (or each chunkSize byte range of a log file when splitLogs is True), 
+        yielding the records of each in file and line order, with line numbers relative to the start of the log file.
+        When workers > 1 the chunks are parsed in worker processes, with at most two chunks per worker 
+        submitted ahead of the chunk being yielded, so results never queue up faster than they are consumed.
+        When checkpoints is set, only the data appended to each log file since its checkpoint is parsed, 
+        and the checkpoint is updated (in memory, see CheckpointStore.save) once the file's last chunk has been consumed.
+        The log spam summaries of each chunk are merged, and the file's log spam is yielded with its last chunk 
+        (merged with its summary in spamCounters, if any, e.g. restored from earlier incremental runs by addAggregates), 
+        and the log spam of each log file in spamCounters not parsed by this run is yielded after the last chunk.
+        The hitches of each chunk are joined with the nearest preceding memory sample of the log file (see HitchMemoryJoiner), 
+        carried over from its earlier chunks (and when checkpoints is set, from the checkpoint it is parsed from, and recorded in its new checkpoint), 
+        so the join is the same whether or not log files are split or parsed by workers, or parsed by incremental runs.
+        The machine information of each log file parsed from its start (or within timeRange) is read from its header region (see readSystemInfo), 
+        yielded with its first chunk, and its machine class set for the statistics.
+        When timeIndex is set, each (uncompressed) log file's index is filled with the entries its parse finds (see TimeIndex.update), 
+        once the file's last chunk has been consumed, after indexing any data preceding the range parsed not yet indexed (see TimeIndex.build).
+        When timeRange is set, each log file's index is instead updated before it is parsed (as the range is found from it), 
+        and only the byte range of each log file the index finds for it is parsed, skipping records outside of it.
+        Compressed log files are never split, so each is parsed whole by a single worker, 
+        or when splitLogs is True, in this process a batch of chunkSize decompressed bytes at a time (see parseLogBatches), 
+        yielded in order with the chunks of the other log files (and never stored in the result cache).
+        When resultCache is set, each (uncompressed) log file is only parsed up to the size it was identified at, 
+        chunks found in the cache are loaded rather than parsed (in order with the chunks parsed), and chunks parsed are stored in it.
+        
+        :param logCache: list of strings representing .log file names cached by cacheLogs().
+        :type logCache: list
+        :param splitLogs: split log files into chunkSize byte ranges (and compressed log files into batches), bounding the records held per chunk
+        :type splitLogs: bool
+        :returns: (hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchMemoryList) for each chunk
+        :rtype: generator"""
+        matcher = self.buildMatcher() # build once per run, rather than per line
+        parseChunk = parseLogChunkBlocks if self.reader == "blocks" else parseLogChunk
+        parseBatch = parseLogBlockBatches if self.reader == "blocks" else parseLogBatches
+        traceEvery = self.getTraceEvery()
+        
+        tasks = [] # (log, start, end, last chunk of log) for each chunk
+        identities = {} # result cache identity of each log file
+        indexInterval = self.timeIndex.interval if self.timeIndex is not None and self.timeRange is None else 0 # time index entries found by the parse
+        cacheConfig = repr((matcher.criteria, self.spamCapacity, self.timeRange, indexInterval)) # parse results depend on these, not the reader or workers
+        for log in logCache:
+            start, end, self.startLines[log] = (0, None, 0) if self.checkpoints is None else self.checkpoints.getRange(log)
+            if self.timeIndex is not None and not isCompressedLog(log):
+                if self.timeRange is not None:
+                    self.timeIndex.build(log)
+                    start, end, self.startLines[log] = self.timeIndex.findRange(log, *self.timeRange)
+                    logging.info("Parsing bytes %d to %s of %s for the time range", start, "end" if end is None else end, log)
+                else:
+                    self.timeIndex.build(log, start) # data parsed by earlier runs, if it was never indexed
+            if start == end:
+                logging.info("No new data to parse in %s", log)
+                continue
+            if self.resultCache is not None:
+                identities[log], size = self.resultCache.identify(log)
+                if end is None and not isCompressedLog(log): # parse only the data identified, so results are never stored under an earlier identity
+                    end = size
+            chunks = planLogChunks(log, self.chunkSize, start, end) if splitLogs and not isCompressedLog(log) else [(start, end)]
+            tasks.extend((log, chunkStart, chunkEnd, index == len(chunks) - 1) for index, (chunkStart, chunkEnd) in enumerate(chunks))
+            
+        def loadCached(log, start, end):
+            return None if self.resultCache is None else self.resultCache.load(log, identities[log], start, end, cacheConfig)
+        
+        def parseBatches(log, start, end):
+            """Parses a compressed log file in this process, yielding its records a batch of chunkSize decompressed bytes at a time."""
+            for lastBatch, result in parseBatch(log, start, end, matcher, traceEvery, self.spamCapacity, self.timeRange, 0, batchSize=self.chunkSize):
+                yield (log, start, end, lastBatch), result, False
+        
+        if self.workers > 1:
+            logging.info("Parsing %d chunks of %d files with %d workers", len(tasks), len(logCache), self.workers)
+            rootLogger = logging.getLogger()
+            logFileName = next((handler.baseFilename for handler in rootLogger.handlers if isinstance(handler, logging.FileHandler)), None)
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=initializeWorker, initargs=(logFileName, rootLogger.level))
+            runTimer.workerCount = max(runTimer.workerCount, self.workers)
+            
+            def mapInOrder():
+                pending = deque() # (task, future of the chunk being parsed, or result of the chunk loaded from the cache)
+                def popResult():
+                    task, result = pending.popleft()
+                    return (task, result.result(), False) if isinstance(result, Future) else (task, result, True)
+                for task in tasks:
+                    log, start, end, lastChunk = task
+                    if splitLogs and isCompressedLog(log): # batched in order with the chunks ahead of it
+                        while pending:
+                            yield popResult()
+                        yield from parseBatches(log, start, end)
+                        continue
+                    cached = loadCached(log, start, end)
+                    pending.append((task, cached if cached is not None else 
+                                    executor.submit(parseChunk, log, start, end, matcher, traceEvery, self.spamCapacity, self.timeRange, 
+                                                    0 if isCompressedLog(log) else indexInterval)))
+                    if len(pending) >= self.workers * 2:
+                        yield popResult()
+                while pending:
+                    yield popResult()
+            results = mapInOrder()
+        else:
+            executor = None
+            def parseInOrder():
+                for task in tasks:
+                    log, start, end, lastChunk = task
+                    if splitLogs and isCompressedLog(log):
+                        yield from parseBatches(log, start, end)
+                        continue
+                    cached = loadCached(log, start, end)
+                    yield (task, cached, True) if cached is not None else (task, parseChunk(log, start, end, matcher, traceEvery, self.spamCapacity, self.timeRange, 
+                                                                                            0 if isCompressedLog(log) else indexInterval), False)
+            results = parseInOrder()
+        
+        try:
+            logCount = 0 # to track how many logs have been iterated through   
+            lineOffset = None # lines in the preceding chunks of the current log file
+            fileCounts = [0, 0, 0] # hitch, memory, and error records in the current log file, for its summary
+            fileSpamCounter = None # log spam summary of the chunks of the current log file
+            fileStart, fileEntries = 0, [] # byte offset the current log file is parsed from, and the time index entries of its chunks
+            parsedLogs = set() # log files whose log spam has been yielded
+            
+            for (log, start, end, lastChunk), result, fromCache in results:
+                batched = splitLogs and isCompressedLog(log) # a batch of a compressed log file, rather than a chunk
+                if self.resultCache is not None and not fromCache and not batched:
+                    self.resultCache.save(identities[log], start, end, cacheConfig, result) # before the spam summary is merged into
+                hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries = result
+                systemInfoList = []
+                if lineOffset is None: # first chunk of the log file
+                    lineOffset = self.startLines[log]
+                    fileStart = start
+                    if self.checkpoints is not None: # joined with the memory sample preceding the checkpoint
+                        self.hitchMemoryJoiner.resumeLog(log, self.checkpoints.memorySamples.get(log))
+                    systemInfo = readSystemInfo(log, self.systemInfoCriteria) if start == 0 or self.timeRange is not None else None
+                    if systemInfo is not None:
+                        systemInfoList.append(systemInfo)
+                        self.statistics.machineClasses[log] = systemInfo.machineClass
+                if fileSpamCounter is None:
+                    fileSpamCounter = spamCounter
+                elif spamCounter is not None:
+                    fileSpamCounter.merge(spamCounter)
+                logSpamList = []
+                if lastChunk and fileSpamCounter is not None:
+                    if self.spamCounters is not None:
+                        if log in self.spamCounters: # counted by earlier runs (see addAggregates)
+                            self.spamCounters[log].merge(fileSpamCounter)
+                            fileSpamCounter = self.spamCounters[log]
+                        else:
+                            self.spamCounters[log] = fileSpamCounter
+                    logSpamList = self.findLogSpam(log, fileSpamCounter)
+                    parsedLogs.add(log)
+                    fileSpamCounter = None
+                hitchList = offsetLineNumbers(hitchList, lineOffset)
+                memoryList = offsetLineNumbers(memoryList, lineOffset)
+                errorList = offsetLineNumbers(errorList, lineOffset)
+                fileEntries += ([seconds, offset, linesAt + lineOffset] for seconds, offset, linesAt in timeEntries)
+                hitchMemoryList = self.hitchMemoryJoiner.join(hitchList, memoryList)
+                if lastChunk:
+                    memorySample = self.hitchMemoryJoiner.finishLog(log)
+                self.hitchCount += len(hitchList)
+                self.memoryCount += len(memoryList)
+                self.errorCount += len(errorList)
+                self.statistics.addRecords(hitchList, memoryList)
+                self.errorGroups.addRecords(errorList)
+                fileCounts[0] += len(hitchList)
+                fileCounts[1] += len(memoryList)
+                fileCounts[2] += len(errorList)
+                self.logSpamCount += len(logSpamList)
+                if batched and not lastChunk:
+                    byteCount = 0 # compressed size, counted with the last batch of the file
+                elif isCompressedLog(log):
+                    byteCount = os.path.getsize(log)
+                else:
+                    byteCount = (os.path.getsize(log) if end is None else end) - start
+                runTimer.countParsed(byteCount, lineCount, hitch=len(hitchList), memory=len(memoryList), 
+                                     error=len(errorList), systemInfo=len(systemInfoList), logSpam=len(logSpamList))
+                
+                yield hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchMemoryList
+                
+                lineOffset += lineCount
+                if lastChunk:
+                    logging.info("Finished processing file: %d/%d : %s (%d lines, %d hitch, %d memory, %d error records, %d log spam templates)", 
+                                 logCount+1, len(logCache), log, lineOffset, *fileCounts, len(logSpamList))
+                    if self.checkpoints is not None:
+                        self.checkpoints.update(log, end, lineOffset, memorySample)
+                    if indexInterval and not isCompressedLog(log):
+                        self.timeIndex.update(log, fileStart, fileEntries)
+                    fileEntries = []
+                    logCount += 1 # increment number of files processed before evaluating next log file
+                    lineOffset = None
+                    fileCounts = [0, 0, 0]
+            for log, spamCounter in (self.spamCounters or {}).items():
+                if log not in parsedLogs: # counted by earlier runs only (e.g. unchanged since), so the log spam of every log file is yielded
+                    logSpamList = self.findLogSpam(log, spamCounter)
+                    self.logSpamCount += len(logSpamList)
+                    yield [], [], [], logSpamList, [], []
+            if self.resultCache is not None:
+                logging.info("%d chunks loaded from the result cache, %d parsed", self.resultCache.hits, self.resultCache.misses)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    @timed
     def iterateLogs(self,logCache):
         """Verifies logCache has contents prior to processing.
         Iterate through each line of each log file in logCache and evaluates for the established criteria, 
-        and appends the appropriate list with the log line containing the matched criteria.
+        and appends the appropriate list with the record extracted from the log line containing the matched criteria.
+        When workers > 1, each file (or chunkSize byte range of a large file) is parsed in a worker process, 
+        and the results are merged in file and line order, so the lists are identical to a single process run.
         
         :param logCache: list of strings representing .log file names cached by cacheLogs().
         :type logCache: list"""
         try:
-            iterateLogsTime = time.time()
-                       
             if len(logCache) != 0: # check to see if cache is empty 
-                                
-                logCount = 0 # to track how many logs have been iterated through   
-                                                
-                for log in logCache:      
-                                  
-                    lineNumber = 1 # current to track line number being parsed       
-                                
-                    with open(log) as cachedLog:  
-                        while True:
-                               
-                            line = cachedLog.readline()
-                            
-                            if not line: # check if end of file
-                                logging.info("Finished processing file: " + str(logCount+1) + "/" + str(len(logCache)) + " : " + log)
-                                lineNumber = 0 # reset line number at end of file
-                                break
-                            else:
-                                if re.search(self.hitchCriteria, line) is not None:
-                                    line = log + " - " + line + " at line number: " + str(lineNumber)
-                                    self.hitchList.append(line)
-                                    logging.info("Hitch data found on line " + str(lineNumber))                                
-                                elif re.search(self.memoryCriteria, line) is not None:
-                                    line = log + " - " + line + " at line number: " + str(lineNumber)
-                                    self.memoryList.append(line)
-                                    logging.info("Memory data found on line " + str(lineNumber))
-                                elif re.search(self.errorCriteria, line) is not None:
-                                    line = log + " - " + line
-                                    tempLine = cachedLog.readline()
-                                    while tempLine[0] != '[':
-                                        line += "\n" + tempLine
-                                        lineNumber += 1 # increment line number due to the extra callstack lines
-                                        tempLine = cachedLog.readline()
-                                    line += " at line number: " + str(lineNumber)
-                                    self.errorList.append(line)
-                                    logging.info("Error data found on line " + str(lineNumber))                                        
-                                else:
-                                    logging.info("No reportable criteria found in " + log + " on line " + str(lineNumber)) 
-                                    
-                            lineNumber += 1 # increment line number before evaluating next log line
-                    logCount += 1 # increment number of files processed before evaluating next log file
+                # only split log files when they can be parsed in parallel
+                for hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchMemoryList in self.iterateChunks(logCache, self.workers > 1):
+                    self.systemInfoList.extend(systemInfoList)
+                    self.hitchList.extend(hitchList)
+                    self.hitchMemoryList.extend(hitchMemoryList)
+                    self.memoryList.extend(memoryList)
+                    if self.keepErrorRows:
+                        self.errorList.extend(errorList)
+                    self.logSpamList.extend(logSpamList)
+            else:
+                logging.warning("Log Cache is Empty!")
+        except Exception as e:
+            logging.exception(e)
+            
+    @timed
+    def streamLogs(self, logCache):
+        """Streaming equivalent of iterateLogs. Verifies logCache has contents prior to processing.
+        Yields the SystemInfoRecord of each log file, and each HitchRecord, HitchMemoryRecord, MemoryRecord and ErrorRecord 
+        (in file and line order for each record type) as it is parsed, 
+        rather than appending it to hitchList, hitchMemoryList, memoryList, or errorList, and the SpamRecords of each log file once it has been parsed, 
+        followed by the HitchSummaryRecords and MemorySummaryRecords of every log file, and the ErrorGroupRecords of every error. 
+        Log files are always split into chunkSize byte ranges, so memory use is bounded by the chunk size 
+        (and workers), regardless of the number or size of log files. 
+        The summaries are computed from quantile sketches (statistics is replaced by a SketchStatistics), 
+        which are exact until a group has more than QuantileSketch.k values, and within its rank error after.
+        
+        :param logCache: list of strings representing .log file names cached by cacheLogs().
+        :type logCache: list
+        :returns: records extracted from log lines containing matched criteria
+        :rtype: generator"""
+        try:
+            if len(logCache) != 0: # check to see if cache is empty 
+                if not isinstance(self.statistics, SketchStatistics): # unless restored by addAggregates
+                    self.statistics = SketchStatistics()
+                for hitchList, memoryList, errorList, logSpamList, systemInfoList, hitchMemoryList in self.iterateChunks(logCache, True):
+                    yield from systemInfoList
+                    yield from hitchList
+                    yield from hitchMemoryList
+                    yield from memoryList
+                    if self.keepErrorRows:
+                        yield from errorList
+                    yield from logSpamList
+                yield from self.statistics.getHitchSummaries()
+                yield from self.statistics.getMemorySummaries()
+                yield from self.statistics.getMemoryTrends()
+                yield from self.errorGroups.getGroups()
             else:
                 logging.warning("Log Cache is Empty!")
+        except Exception as e:
+            logging.exception(e)
+    
+    @timed
+    def writePartialResult(self, fileName):
+        """Writes the results of this run (a shard, e.g. the Logs directory of one host) to a partial result file, 
+        to be merged with the partial results of other shards into the final reports (see mergePartialResults).
+        The file is a zlib compressed JSON document, versioned by partialFormat and partialVersion, holding: the host, criteria, and record counts, 
+        the records by column (by record type), the hitch and memory statistics as quantile sketches (see SketchStatistics), 
+        the error groups, and the log spam summary (SpamCounter) of each log file. It replaces any partial result of the same name.
+        
+        :param fileName: partial result file name
+        :type fileName: str"""
+        try:
+            statistics = SketchStatistics()
+            statistics.addRecordStatistics(self.statistics)
+            def toColumns(records):
+                return [list(column) for column in zip(*records)]
+            partialResult = {"format": self.partialFormat, 
+                             "version": self.partialVersion, 
+                             "host": platform.node(), 
+                             "created": datetime.datetime.now().isoformat(), 
+                             "criteria": [self.hitchCriteria, self.memoryCriteria, self.errorCriteria, self.systemInfoCriteria], 
+                             "counts": {"hitch": self.hitchCount, "memory": self.memoryCount, "error": self.errorCount, 
+                                        "lines": runTimer.linesParsed, "bytes": runTimer.bytesRead}, 
+                             "records": {"SystemInfoRecord": toColumns(self.systemInfoList), 
+                                         "HitchRecord": toColumns(self.hitchList), 
+                                         "HitchMemoryRecord": toColumns(self.hitchMemoryList), 
+                                         "MemoryRecord": toColumns(self.memoryList), 
+                                         "ErrorRecord": toColumns(self.errorList)}, 
+                             "statistics": statistics.getState(), 
+                             "errorGroups": self.errorGroups.groups, 
+                             "spam": {logName: spamCounter.getState() for logName, spamCounter in (self.spamCounters or {}).items()}}
+            payload = zlib.compress(json.dumps(partialResult, separators=(",", ":")).encode('utf-8'), 6)
+            with open(fileName + ".tmp", 'wb') as partialFile:
+                partialFile.write(payload)
+            os.replace(fileName + ".tmp", fileName)
+            logging.info("Partial result written to: %s (%d bytes)", fileName, len(payload))
+        except Exception as e:
+            logging.exception(e)
+
+    @timed
+    def mergePartialResults(self, fileNames):
+        """Merges the partial results of shards (see writePartialResult), in the order given, in a single pass over each file: 
+        their records are appended to the lists as if the shards' log files had been parsed by this run, 
+        their statistics merged as quantile sketches (statistics is replaced by a SketchStatistics), 
+        their error groups combined (first and last seen by time stamp, see ErrorGrouper), 
+        and the log spam summaries of each log file merged before log spam is identified. 
+        A file that cannot be read, or is not a partial result of partialVersion, is skipped with an error.
+        
+        :param fileNames: partial result file names
+        :type fileNames: list"""
+        try:
+            self.statistics = SketchStatistics()
+            spamCounters = {}
+            mergedCount = 0
+            for fileName in fileNames:
+                try:
+                    with open(fileName, 'rb') as partialFile:
+                        partialResult = json.loads(zlib.decompress(partialFile.read()))
+                    if partialResult.get("format") != self.partialFormat or partialResult.get("version") != self.partialVersion:
+                        raise ValueError("%s is not a version %d partial result" % (fileName, self.partialVersion))
+                except Exception as e:
+                    print("Skipping partial result " + fileName + ": " + str(e))
+                    logging.error("Skipping partial result %s: %s", fileName, e)
+                    continue
+                if partialResult["criteria"] != [self.hitchCriteria, self.memoryCriteria, self.errorCriteria, self.systemInfoCriteria]:
+                    logging.warning("%s was parsed with different criteria: %s", fileName, partialResult["criteria"])
                 
-            iterateLogsTime = round(time.time()-iterateLogsTime,5)
-            logging.info("Time to execute iterateLogs: " + str(iterateLogsTime) + " seconds")
+                records = partialResult["records"]
+                def toRecords(recordType):
+                    columns = records.get(recordType.__name__) # HitchMemoryRecords are absent from partial results written before the join
+                    return list(map(partial(tuple.__new__, recordType), zip(*columns))) if columns else []
+                self.systemInfoList.extend(toRecords(SystemInfoRecord))
+                self.hitchList.extend(toRecords(HitchRecord))
+                self.hitchMemoryList.extend(toRecords(HitchMemoryRecord))
+                self.memoryList.extend(toRecords(MemoryRecord))
+                self.errorList.extend(toRecords(ErrorRecord))
+                self.statistics.addState(partialResult["statistics"])
+                self.errorGroups.addGroups(partialResult["errorGroups"])
+                for logName, spamState in partialResult["spam"].items():
+                    spamCounter = SpamCounter.fromState(spamState)
+                    if logName in spamCounters:
+                        spamCounters[logName].merge(spamCounter)
+                    else:
+                        spamCounters[logName] = spamCounter
+                counts = partialResult["counts"]
+                self.hitchCount += counts["hitch"]
+                self.memoryCount += counts["memory"]
+                self.errorCount += counts["error"]
+                mergedCount += 1
+                logging.info("Merged partial result %s of %s (created %s): %d lines, %d bytes parsed, %d hitch, %d memory, %d error records", 
+                             fileName, partialResult["host"], partialResult["created"], counts["lines"], counts["bytes"], 
+                             counts["hitch"], counts["memory"], counts["error"])
+            for logName, spamCounter in spamCounters.items():
+                self.logSpamList.extend(self.findLogSpam(logName, spamCounter))
+            self.logSpamCount = len(self.logSpamList)
+            logging.info("Merged %d of %d partial results", mergedCount, len(fileNames))
         except Exception as e:
-            cacheLogsTime = round(time.time()-cacheLogsTime,5)
-            logging.info("Time to execute iterateLogs: " + str(iterateLogsTime) + " seconds")
             logging.exception(e)
+
+    def getAggregates(self) -> dict:
+        """Gets the statistics (as quantile sketches, see SketchStatistics), error groups, and log spam summaries of the records parsed, 
+        as a JSON serializable dictionary, so a later incremental run can summarize them with the records it parses (see addAggregates).
+        
+        :rtype: dict"""
+        statistics = self.statistics
+        if not isinstance(statistics, SketchStatistics):
+            statistics = SketchStatistics()
+            statistics.addRecordStatistics(self.statistics)
+        return {"statistics": statistics.getState(), 
+                "errorGroups": self.errorGroups.groups, 
+                "spam": {logName: spamCounter.getState() for logName, spamCounter in (self.spamCounters or {}).items()}}
     
-    # WIP placeholder 
-    # def sortForLogSpam(self, logCache):
-    #     try: 
-    #         while True:
-    #             for log in range(len(logCache)):
-    #                 tempLogCache = []
-                    
-    # #     except Exception as e:
-    #             logging.exception(e)
+    def addAggregates(self, aggregates):
+        """Restores the statistics, error groups, and log spam summaries of earlier runs (see getAggregates), 
+        so the summaries, memory trends, error groups, and log spam reported cover every record parsed, not only those parsed by this run.
+        statistics is replaced by a SketchStatistics, and spamCounters set, holding those of earlier runs.
+        
+        :param aggregates: aggregates of earlier runs, or None if there are none
+        :type aggregates: dict"""
+        self.statistics = SketchStatistics()
+        self.spamCounters = {}
+        if aggregates is not None:
+            self.statistics.addState(aggregates["statistics"])
+            self.errorGroups.addGroups(aggregates["errorGroups"])
+            self.spamCounters = {logName: SpamCounter.fromState(spamState) for logName, spamState in aggregates["spam"].items()}
+            logging.info("Restored the aggregates of the records parsed by earlier runs")
+
+    def findLogSpam(self, logName, spamCounter) -> list:
+        """Identifies the message templates counted at least logSpamCriteria times in a log file.
+        
+        :param logName: log file name the templates were counted in
+        :type logName: str
+        :param spamCounter: log spam summary of the log file
+        :type spamCounter: SpamCounter
+        :returns: logSpamList - list of SpamRecords, most frequent first
+        :rtype: list"""
+        return [SpamRecord(logName, template.decode('utf-8', errors='replace'), count, spamCounter.maxUndercount) 
+                for template, count in spamCounter.getTemplates(self.logSpamCriteria)]
             
-class CSVWriter:
+class LogFollower:
     """
-    Class for handling all CSV file related operations.
+    Class for parsing log files live as they are written, writing records to the reports within a second of being logged.
+    
+    An asyncio task polls the working directory for new CreateArbitraryLog*.log files, and starts a tail task for each.
+    Polling is used (rather than inotify, which the standard library does not provide), 
+    as a stat per file every pollInterval is negligible next to parsing.
+    Each tail task parses the byte range appended to its file since the last poll, up to the start of its last record, 
+    as that record may still be written (a partial line, or the callstack of an error). 
+    Once its file has not grown for flushDelay, the last record is parsed too (if it ends with a line ending). 
+    Parsing runs in a thread, using the parser's reader, while records are written on the event loop by a single report writer.
+    Log spam is counted, hitch and memory statistics collected (as quantile sketches, see SketchStatistics), and errors grouped, 
+    as each file is followed, and written when following stops.
+    The machine information of each file followed from its start is written once its header region has been parsed.
     
     Attributes
     ----------
-    none
-    
+    objLogParser : LogParser
+        Parser whose criteria, reader, and checkpoints are used, and whose record counts are updated.
+    objReportWriter : CSVWriter
+        Writer the records are written through (a CSVWriter or ColumnarWriter), flushed after each batch.
+    pollInterval : float
+        Defaults to 0.25 (seconds between polls of the directory and of each followed file).
+    flushDelay : float
+        Defaults to 0.5 (seconds a file must be idle before its last record is parsed).
+    idleTimeout : float
+        Defaults to 0 (follow until interrupted), otherwise stop once no log file has grown for idleTimeout seconds.
+    spamCounters{} : SpamCounter
+        Stores the log spam summary of the data parsed from each followed log file, by log file name.
+    objSQLiteWriter : SQLiteWriter
+        Defaults to None, otherwise records are also indexed in its database as they are written.
+    objHTMLWriter : HTMLWriter
+        Defaults to None, otherwise records are also collected for its HTML report, written when following stops.
+        
     Methods
     -------
-    def checkForExistingFile(fileName:str) -> str
-        Evaluates path for existing file of name to avoid overwriting.
-        If file of name exists, increments duplicate number and reevaluates until a match does not exist.
-        
-        :param fileName: desired file name to be created
-        :type fileName: str
-        :returns: fileName - either fileName appended with (n) duplicate value, or same value that was initially passed
-        :rtype: str
-    
-    writeMemoryFootprintToCSV(memoryList:list)
-        Creates .csv file, applies header, iterates through each line in memoryList parsing for:
-        log file name, the line number the match occured in the respective log file, the footprint size, 
-        and at what run time the record occured, then applies the stats to the .csv's row.
-        
-        :param memoryList: list of log lines matched to memoryCriteria
-        :type memoryList: list 
+    __init__(objLogParser:LogParser, objReportWriter:CSVWriter)
+        Constructor.
+        Initializes the following attributes:
+        objLogParser, objReportWriter, pollInterval, flushDelay, idleTimeout, spamCounters, objSQLiteWriter, objHTMLWriter.
         
-    writeHitchToCSV(hitchList:list)
-        Creates .csv file, applies header, iterates through each line in hitchList parsing for:
-        log file name, the line number the match occured in the respective log file, the thread name, 
-        and the hitch duration, then applies the stats to the .csv's row.
+    follow()
+        Coroutine that watches for log files and tails each of them, until interrupted or idle for idleTimeout.
         
-        :param hitchList: list of log lines matched to memoryCriteria
-        :type hitchList: list 
+    tailLog(log:str)
+        Coroutine that parses the data appended to log, writing its records as complete records arrive.
     """
-    
-    def __init__(self) -> None:
-        pass #placeholder until properties are established
-    
-    def checkForExistingFile(self, fileName) -> str:
-        """Evaluates path for existing file of name to avoid overwriting.
-        If file of name exists, increments duplicate number and reevaluates until a match does not exist.
+    def __init__(self, objLogParser, objReportWriter) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        objLogParser, objReportWriter, pollInterval, flushDelay, idleTimeout, spamCounters, objSQLiteWriter, objHTMLWriter."""
+        self.objLogParser = objLogParser
+        self.objReportWriter = objReportWriter
+        self.pollInterval = 0.25
+        self.flushDelay = 0.5
+        self.idleTimeout = 0
+        self.spamCounters = {} if objLogParser.spamCounters is None else objLogParser.spamCounters
+        self.objSQLiteWriter = None
+        self.objHTMLWriter = None
+        self.lastGrowth = time.monotonic()
+        if not isinstance(objLogParser.statistics, SketchStatistics): # unless restored by addAggregates
+            objLogParser.statistics = SketchStatistics() # bounded, however long files are followed
+        self.matcher = objLogParser.buildMatcher()
+        self.parseChunk = parseLogChunkBlocks if objLogParser.reader == "blocks" else parseLogChunk
         
-        :param fileName: desired file name to be created
-        :type fileName: str
-        :returns: fileName - either fileName appended with (n) duplicate value, or same value that was initially passed
-        :rtype: str"""
+    async def follow(self):
+        """Coroutine that watches for log files and tails each of them, until interrupted or idle for idleTimeout.
+        Reports are flushed after every batch of records, and closed (with log spam, summaries, and error groups written, and checkpoints saved, if set and every record was written) 
+        when following stops."""
+        tails = {}
         try:
-            
-            checkForExistingFileTime = time.time()   
-            fileDupeNum = 0 
-            
-            if fileName == "HitchReport.csv":                        
-                while os.path.isfile(fileName):
-                    logging.info(fileName + " already exists")
-                    fileDupeNum += 1
-                    fileName = "HitchReport("+str(fileDupeNum)+").csv"
-            elif fileName == "MemoryReport.csv":
-                while os.path.isfile(fileName):
-                    logging.info(fileName + " already exists")
-                    fileDupeNum += 1
-                    fileName = "MemoryReport("+str(fileDupeNum)+").csv"
-            elif fileName == "ErrorReport.csv":
-                while os.path.isfile(fileName):
-                    logging.info(fileName + " already exists")
-                    fileDupeNum += 1
-                    fileName = "ErrorReport("+str(fileDupeNum)+").csv"
-            else:
-                print(fileName + " is and invalid file name for csv creation")
-                logging.error(fileName + " is and invalid file name for csv creation")
-                                    
-            logging.info("Creating CSV file: " + fileName)
-            checkForExistingFileTime = round(time.time()-checkForExistingFileTime,5)
-            logging.info("Time to execute checkForExistingFile: " + str(checkForExistingFileTime) + " seconds")
-            return fileName
-
-        except Exception as e:
-            checkForExistingFileTime = round(time.time()-checkForExistingFileTime,5)
-            logging.info("Time to execute checkForExistingFile: " + str(checkForExistingFileTime) + " seconds")
-            logging.exception(e)
-
-    def writeMemoryFootprintToCSV(self, memoryList):
-        """Creates .csv file, applies header, iterates through each line in memoryList parsing for:
-        log file name, the line number the match occured in the respective log file, the footprint size, 
-        and at what run time the record occured, then applies the stats to the .csv's row."""
-        try:
-            writeMemoryFootprintToCSVTime = time.time()
-             
-            if len(memoryList) != 0:
-                 with open(self.checkForExistingFile("MemoryReport.csv"), 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile, dialect='excel')
-                    header = ["Log Name", "Log Line", "Footprint (MiB)", "Time Recorded"]
-                    writer.writerow(header)
-                    
-                    for line in range(len(memoryList)):
-                        logName = (re.search(r"([^\s]+)", memoryList[line])).group()     
-                        lineNumber = (re.search(r"\d+$", memoryList[line])).group()                   
-                        footprint = (re.search(r"footprint:\s(\d+\.\d+)",memoryList[line])).group().strip("footprint: ")               
-                        timeRecorded = (re.search(r"run time:\s(\d+\.\d+)",memoryList[line])).group().strip("run time: ")              
-                        row = [logName, lineNumber, footprint, timeRecorded]
-                        writer.writerow(row)
-            else:
-                logging.warning("Failure to write Memory Report. Memory List is empty") 
-            
-            writeMemoryFootprintToCSVTime = round(time.time()-writeMemoryFootprintToCSVTime,5)
-            logging.info("Time to execute writeMemoryFootprintToCSV: " + str(writeMemoryFootprintToCSVTime) + " seconds")                        
-        except Exception as e:
-            writeMemoryFootprintToCSVTime = round(time.time()-writeMemoryFootprintToCSVTime,5)
-            logging.info("Time to execute writeMemoryFootprintToCSV: " + str(writeMemoryFootprintToCSVTime) + " seconds")
-            logging.exception(e)                   
-            
-    def writeHitchToCSV(self, hitchList):
-        """Creates .csv file, applies header, iterates through each line in hitchList parsing for:
-        log file name, the line number the match occured in the respective log file, the thread name, 
-        and the hitch duration, then applies the stats to the .csv's row.
-        
-        :param hitchList: list of log lines matched to memoryCriteria
-        :type hitchList: list"""        
-        try: 
-            writeHitchToCSVTime = time.time()
-            
-            if len(hitchList) != 0:                
-                with open(self.checkForExistingFile("HitchReport.csv"), 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile, dialect='excel')
-                    header = ["Log Name", "Log Line", "Thread", "Duration (ms)"]
-                    writer.writerow(header)
-                    
-                    for line in range(len(hitchList)):
-                        logName = (re.search(r"([^\s]+)", hitchList[line])).group()    
-                        lineNumber = (re.search(r"at line number:\s(\d+$)", hitchList[line])).group().strip("at line number: ")                   
-                        hitchDuration = (re.search(r"duration of:\s(\d+\.\d+)", hitchList[line])).group().strip("duration of: ") #duration require log name to be stripped so that only one set of decimal numbers exist              
-                        threadName = (re.search(r'thread:\s\[(.+?)\]', hitchList[line])).group().strip("thread: ").strip("[]")          
-                        row = [logName, lineNumber, threadName, hitchDuration]
-                        writer.writerow(row)
-            else:
-                logging.warning("Failure to write Hitch Report: Hitch List is empty")
-            
-            writeHitchToCSVTime = round(time.time()-writeHitchToCSVTime,5)
-            logging.info("Time to execute writeHitchToCSV: " + str(writeHitchToCSVTime) + " seconds")
-        except Exception as e:
-            writeHitchToCSVTime = round(time.time()-writeHitchToCSVTime,5)
-            logging.info("Time to execute writeHitchToCSV: " + str(writeHitchToCSVTime) + " seconds")
-            logging.exception(e)
+            logging.info("Following CreateArbitraryLog*.log files in: " + os.getcwd())
+            while self.idleTimeout <= 0 or time.monotonic() - self.lastGrowth < self.idleTimeout:
+                for log in glob.glob('CreateArbitraryLog*.log'):
+                    if log not in tails:
+                        logging.info("Following Log: " + log)
+                        tails[log] = asyncio.create_task(self.tailLog(log))
+                for log, tail in tails.items():
+                    if tail.done() and not tail.cancelled() and tail.exception() is not None:
+                        raise tail.exception()
+                await asyncio.sleep(self.pollInterval)
+            logging.info("No log file has grown for %s seconds, stopped following", self.idleTimeout)
+        finally:
+            for tail in tails.values():
+                tail.cancel()
+            await asyncio.gather(*tails.values(), return_exceptions=True)
+            finalRecords = []
+            for log, spamCounter in self.spamCounters.items():
+                logSpamList = self.objLogParser.findLogSpam(log, spamCounter)
+                finalRecords += logSpamList
+                self.objLogParser.logSpamCount += len(logSpamList)
+            finalRecords += self.objLogParser.statistics.getHitchSummaries()
+            finalRecords += self.objLogParser.statistics.getMemorySummaries()
+            finalRecords += self.objLogParser.statistics.getMemoryTrends()
+            finalRecords += self.objLogParser.errorGroups.getGroups()
+            self.objReportWriter.writeRecords(finalRecords)
+            self.objReportWriter.closeReports()
+            if self.objSQLiteWriter is not None:
+                self.objSQLiteWriter.closeReports()
+            if self.objHTMLWriter is not None:
+                self.objHTMLWriter.writeRecords(finalRecords)
+                self.objHTMLWriter.closeReports()
+            objWriters = [objWriter for objWriter in (self.objReportWriter, self.objSQLiteWriter, self.objHTMLWriter) if objWriter is not None]
+            if self.objLogParser.checkpoints is not None:
+                if any(objWriter.writeFailed for objWriter in objWriters):
+                    logging.error("Not all records were written, checkpoints not saved")
+                else:
+                    self.objLogParser.checkpoints.aggregates = self.objLogParser.getAggregates()
+                    self.objLogParser.checkpoints.save()
+    
+    async def tailLog(self, log):
+        """Coroutine that parses the data appended to log, writing its records as complete records arrive.
+        Starts from the log's checkpoint when the parser has checkpoints, otherwise from the start of the log.
         
-    def writeErrorsToCSV(self, errorList):
-        """Creates .csv file, applies header, iterates through each line in hitchList parsing for:
-        log file name, the line number the match occured in the respective log file, the thread name, 
-        and the hitch duration, then applies the stats to the .csv's row.
+        :param log: log file name to follow
+        :type log: str"""
+        offset, lineCount = 0, 0
+        if self.objLogParser.checkpoints is not None:
+            offset, end, lineCount = self.objLogParser.checkpoints.getRange(log)
+            self.objLogParser.hitchMemoryJoiner.resumeLog(log, self.objLogParser.checkpoints.memorySamples.get(log))
+        self.objLogParser.startLines[log] = lineCount
+        if self.objSQLiteWriter is not None and log not in self.objSQLiteWriter.checkedLogs:
+            self.objSQLiteWriter.checkLog(log) # appeared since the run started
+        headerSize = 65536 if offset == 0 else 0 # bytes searched for the machine information block, until it is found
+        size = offset
+        lastGrowth = time.monotonic()
         
-        :param hitchList: list of log lines matched to memoryCriteria
-        :type hitchList: list"""        
-        try: 
-            writeErrorsToCSVTime = time.time()
+        while True:
+            try:
+                currentSize = os.path.getsize(log)
+            except FileNotFoundError: # removed or rotated away, any new file will be followed by its own task
+                logging.info("Stopped following removed Log: " + log)
+                return
+            if currentSize < offset: # truncated, start again from the beginning
+                logging.info("%s was truncated, parsing from the start", log)
+                offset, lineCount, headerSize = 0, 0, 65536
+                self.objLogParser.hitchMemoryJoiner.finishLog(log)
+            if currentSize != size:
+                size = currentSize
+                lastGrowth = self.lastGrowth = time.monotonic()
+                
+            end = offset
+            if size > offset:
+                end = await asyncio.to_thread(findLastRecordStart, log, offset, size)
+                if time.monotonic() - lastGrowth >= self.flushDelay: # idle, so the last record is complete if its line is
+                    with open(log, 'rb') as cachedLog:
+                        cachedLog.seek(size - 1)
+                        if cachedLog.read(1) == b"\n":
+                            end = size
             
-            if len(errorList) != 0:                
-                with open(self.checkForExistingFile("ErrorReport.csv"), 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile, dialect='excel')
-                    header = ["Log Name", "Log Line", "Error Type", "Error Message"]
-                    writer.writerow(header)
-                    
-                    for line in range(len(errorList)):
-                        logName = (re.search(r"([^\s]+)", errorList[line])).group()       
-                        lineNumber = (re.search(r"at line number:\s(\d+$)", errorList[line])).group().strip("at line number: ")             
-                        errorMessage = errorList[line].strip(logName).strip("at line number: " + lineNumber)
-                        errorMessage = re.sub(r'[\s\S]*?(?=ERROR)', '', errorMessage)
-                        errorType = None                  
-                        errorType = (re.search(r'[$\w]+(?=:\s)', errorMessage)).group()
-                        row = [logName, lineNumber, errorType, errorMessage]
-                        writer.writerow(row)
-            else:
-                logging.warning("Failure to write Error Report: Error List is empty")
+            if end > offset:
+                hitchList, memoryList, errorList, rangeLineCount, spamCounter, timeEntries = await asyncio.to_thread(self.parseChunk, log, offset, end, self.matcher, 
+                                                                                                        self.objLogParser.getTraceEvery(), 
+                                                                                                        self.objLogParser.spamCapacity)
+                errorList = offsetLineNumbers(errorList, lineCount)
+                self.objLogParser.errorGroups.addRecords(errorList)
+                systemInfoList = []
+                if headerSize > 0:
+                    systemInfo = await asyncio.to_thread(readSystemInfo, log, self.objLogParser.systemInfoCriteria, min(end, headerSize))
+                    if systemInfo is not None:
+                        systemInfoList.append(systemInfo)
+                        self.objLogParser.statistics.machineClasses[log] = systemInfo.machineClass
+                    if systemInfo is not None or end >= headerSize:
+                        headerSize = 0
+                fileHitchList, fileMemoryList = offsetLineNumbers(hitchList, lineCount), offsetLineNumbers(memoryList, lineCount)
+                records = systemInfoList + fileHitchList + fileMemoryList + self.objLogParser.hitchMemoryJoiner.join(fileHitchList, fileMemoryList)
+                if self.objLogParser.keepErrorRows:
+                    records += errorList
+                self.objReportWriter.writeRecords(records)
+                self.objReportWriter.flushReports()
+                if self.objSQLiteWriter is not None:
+                    self.objSQLiteWriter.writeRecords(records)
+                    self.objSQLiteWriter.flushReports()
+                if self.objHTMLWriter is not None:
+                    self.objHTMLWriter.writeRecords(records)
+                self.objLogParser.hitchCount += len(hitchList)
+                self.objLogParser.memoryCount += len(memoryList)
+                self.objLogParser.errorCount += len(errorList)
+                runTimer.countParsed(end - offset, rangeLineCount, hitch=len(hitchList), memory=len(memoryList), error=len(errorList), 
+                                     systemInfo=len(systemInfoList))
+                self.objLogParser.statistics.addRecords(hitchList, memoryList)
+                offset, lineCount = end, lineCount + rangeLineCount
+                if spamCounter is not None:
+                    if log in self.spamCounters:
+                        self.spamCounters[log].merge(spamCounter)
+                    else:
+                        self.spamCounters[log] = spamCounter
+                if self.objLogParser.checkpoints is not None:
+                    self.objLogParser.checkpoints.update(log, offset, lineCount, self.objLogParser.hitchMemoryJoiner.lastSamples.get(log))
+                if records:
+                    logging.info("%s: %d records written, parsed to line %d", log, len(records), lineCount)
+            
+            await asyncio.sleep(self.pollInterval)
 
-            writeErrorsToCSVTime = round(time.time()-writeErrorsToCSVTime,5)
-            logging.info("Time to execute writeErrorsToCSV: " + str(writeErrorsToCSVTime) + " seconds")
-        except Exception as e:
-            writeErrorsToCSVTime = round(time.time()-writeErrorsToCSVTime,5)
-            logging.info("Time to execute writeErrorsToCSV: " + str(writeErrorsToCSVTime) + " seconds")
-            logging.exception(e)
-    
-    
-    # WIP placeholder         
-    # def writeLogSpamToCSV():
+def dumpProfile(profiler, fileName, top=25) -> dict:
+    """Writes the cProfile stats of a run to fileName (readable with pstats, or tools such as snakeviz), 
+    and the functions with the most cumulative time to the log file, and stops tracing memory allocations with tracemalloc.
     
-    # WIP placeholder         
-    # def writeSystemInfoToCSV():
-    
-def main():
-    """Defines order of execution for the application"""
-    createLogFile()
+    :param profiler: profiler the run was profiled with
+    :type profiler: cProfile.Profile
+    :param fileName: profile stats file name
+    :type fileName: str
+    :param top: number of functions, and allocation sites, reported
+    :type top: int
+    :returns: profile - stats file name, peak traced memory, and the largest allocation sites still held at the end of the run
+    :rtype: dict"""
+    profile = {"profileFile": fileName}
+    if tracemalloc.is_tracing(): # snapshot before the profile stats are processed, and excluding the profilers' own allocations
+        tracedPeak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, getattr(module, "__file__", "")) 
+                                                               for module in (cProfile, pstats, tracemalloc)])
+        tracemalloc.stop()
+        profile["tracedPeakMiB"] = round(tracedPeak / 1024**2, 3)
+        profile["topAllocations"] = [{"location": str(allocation.traceback), "sizeMiB": round(allocation.size / 1024**2, 3), 
+                                      "count": allocation.count} for allocation in snapshot.statistics('lineno')[:top]]
+
+    profiler.dump_stats(fileName)
+    statsText = io.StringIO()
+    pstats.Stats(profiler, stream=statsText).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    logging.info("Profile of the run (main process), by cumulative time: \n" + statsText.getvalue())
+    return profile
+
+def runParser(args):
+    """Parses the log files and writes the reports, as configured by the command line arguments.
     
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace"""
     # instantiate objects
     objCSVWriter = CSVWriter()    
     objLogParser = LogParser()
+    objLogParser.workers = args.workers
+    objLogParser.chunkSize = args.chunk_size * 1024**2
+    objLogParser.reader = args.reader
+    objLogParser.traceEvery = args.trace_every
+    objLogParser.spamCapacity = args.spam_capacity
+    objLogParser.keepErrorRows = not args.no_error_rows
+    objColumnarWriter = None
+    if args.format != "csv":
+        objColumnarWriter = ColumnarWriter(args.format)
+        if objColumnarWriter.format is None:
+            print("Neither pyarrow nor numpy is installed, writing csv reports instead")
+            objColumnarWriter = None
 
-    # gather data
-    objLogParser.iterateLogs(objLogParser.cacheLogs())
+    partialNames = [os.path.abspath(fileName) for fileName in args.merge or []] # relative to the directory the run started in
+    logCache = objLogParser.cacheLogs()
+    if args.cache:
+        objLogParser.resultCache = ResultCache(args.cache, args.cache_size * 1024**2) # stored alongside the logs
+    if args.time_index or args.since is not None or args.until is not None:
+        objLogParser.timeIndex = TimeIndex("LogParserTimeIndex.json", args.index_interval * 1024) # stored alongside the logs
+    if args.since is not None or args.until is not None:
+        objLogParser.timeRange = (-math.inf if args.since is None else args.since, math.inf if args.until is None else args.until)
+    if args.incremental:
+        objLogParser.checkpoints = CheckpointStore("LogParserCheckpoints.json") # stored alongside the logs
+        objLogParser.addAggregates(objLogParser.checkpoints.aggregates) # so the summary reports cover the records of earlier runs
+        objCSVWriter.appendReports = True
+    objSQLiteWriter = None
+    if args.sqlite:
+        objSQLiteWriter = SQLiteWriter(args.sqlite)
+        objSQLiteWriter.appendLogs = args.incremental
+        objSQLiteWriter.startLines = objLogParser.startLines # filled as each log file is parsed, before its records are ingested
+        for log in logCache:
+            objSQLiteWriter.checkLog(log) # before it is parsed, so its size and modification time are those of the data parsed
+    objHTMLWriter = None
+    if args.html:
+        objHTMLWriter = HTMLWriter(args.html, args.html_points)
+    
+    if args.follow:
+        # gather data and perform write operations as each record is logged
+        objLogFollower = LogFollower(objLogParser, objColumnarWriter or objCSVWriter)
+        objLogFollower.idleTimeout = args.follow_idle
+        objLogFollower.objSQLiteWriter = objSQLiteWriter
+        objLogFollower.objHTMLWriter = objHTMLWriter
+        try:
+            asyncio.run(objLogFollower.follow())
+        except KeyboardInterrupt:
+            logging.info("Following interrupted")
+    elif args.stream:
+        # gather data and perform write operations as each record is parsed
+        records = objLogParser.streamLogs(logCache)
+        if objSQLiteWriter is not None:
+            records = objSQLiteWriter.ingestRecords(records)
+        if objHTMLWriter is not None:
+            records = objHTMLWriter.collectRecords(records)
+        if objColumnarWriter is not None:
+            objColumnarWriter.writeRecordsToFiles(records)
+        else:
+            objCSVWriter.writeRecordsToCSV(records)
+        if objSQLiteWriter is not None:
+            objSQLiteWriter.closeReports()
+        if objHTMLWriter is not None:
+            objHTMLWriter.closeReports()
+    elif args.shard:
+        # gather data, and write it as a partial result to be merged with those of other shards
+        objLogParser.spamCounters = {}
+        objLogParser.iterateLogs(logCache)
+        objLogParser.writePartialResult(args.shard)
+    elif objColumnarWriter is not None:
+        # gather data (or merge it from the partial results of shards)
+        if args.merge:
+            objLogParser.mergePartialResults(partialNames)
+        else:
+            objLogParser.iterateLogs(logCache)
+        
+        # perform write opertations, batched into columns
+        objColumnarWriter.writeRecordsToFiles(chain(objLogParser.systemInfoList, 
+                                                    objLogParser.hitchList, 
+                                                    objLogParser.hitchMemoryList, 
+                                                    objLogParser.memoryList, 
+                                                    objLogParser.errorList, 
+                                                    objLogParser.logSpamList, 
+                                                    objLogParser.statistics.getHitchSummaries(), 
+                                                    objLogParser.statistics.getMemorySummaries(), 
+                                                    objLogParser.statistics.getMemoryTrends(), 
+                                                    objLogParser.errorGroups.getGroups()))
+    else:
+        # gather data (or merge it from the partial results of shards)
+        if args.merge:
+            objLogParser.mergePartialResults(partialNames)
+        else:
+            objLogParser.iterateLogs(logCache)
+        
+        # perform write opertations
+        objCSVWriter.writeSystemInfoToCSV(objLogParser.systemInfoList)
+        objCSVWriter.writeHitchToCSV(objLogParser.hitchList)
+        objCSVWriter.writeHitchMemoryToCSV(objLogParser.hitchMemoryList)
+        objCSVWriter.writeMemoryFootprintToCSV(objLogParser.memoryList)
+        if objLogParser.keepErrorRows:
+            objCSVWriter.writeErrorsToCSV(objLogParser.errorList)
+        if objLogParser.spamCapacity > 0:
+            objCSVWriter.writeLogSpamToCSV(objLogParser.logSpamList)
+        objCSVWriter.writeHitchSummaryToCSV(objLogParser.statistics.getHitchSummaries())
+        objCSVWriter.writeMemorySummaryToCSV(objLogParser.statistics.getMemorySummaries())
+        objCSVWriter.writeMemoryTrendToCSV(objLogParser.statistics.getMemoryTrends())
+        objCSVWriter.writeErrorGroupsToCSV(objLogParser.errorGroups.getGroups())
+    if objSQLiteWriter is not None and not (args.follow or args.stream or args.shard):
+        objSQLiteWriter.writeRecordsToDatabase(chain(objLogParser.systemInfoList, objLogParser.hitchList, objLogParser.hitchMemoryList, 
+                                                     objLogParser.memoryList, objLogParser.errorList))
+    if objHTMLWriter is not None and not (args.follow or args.stream or args.shard):
+        objHTMLWriter.writeRecordsToHTML(chain(objLogParser.systemInfoList, objLogParser.hitchList, objLogParser.hitchMemoryList, 
+                                               objLogParser.memoryList, objLogParser.errorList, objLogParser.logSpamList, 
+                                               objLogParser.statistics.getHitchSummaries(), objLogParser.statistics.getMemorySummaries(), 
+                                               objLogParser.statistics.getMemoryTrends(), objLogParser.errorGroups.getGroups()))
     
-    # perform write opertations
-    objCSVWriter.writeHitchToCSV(objLogParser.hitchList)
-    objCSVWriter.writeMemoryFootprintToCSV(objLogParser.memoryList)
-    objCSVWriter.writeErrorsToCSV(objLogParser.errorList)
+    objWriters = [objWriter for objWriter in (objCSVWriter, objColumnarWriter, objSQLiteWriter, objHTMLWriter) if objWriter is not None]
+    if objLogParser.checkpoints is not None and not args.follow:
+        if any(objWriter.writeFailed for objWriter in objWriters):
+            # the writers log their exceptions rather than raising them, so the records of the next run must include those not written
+            logging.error("Not all records were written, checkpoints not saved so the next incremental run parses the same data again")
+        else:
+            objLogParser.checkpoints.aggregates = objLogParser.getAggregates()
+            objLogParser.checkpoints.save() # only once the reports are written, so no records are skipped if the run fails
+    if objLogParser.timeIndex is not None:
+        objLogParser.timeIndex.save()
 
     objLogParser.printFinalStats()
 
+def positiveInteger(text) -> int:
+    """Parses an argument that must be a whole number greater than 0, e.g. --chunk-size or --index-interval."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a whole number, not: " + text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError("expected a number greater than 0, not: " + text)
+    return value
+
+def main():
+    """Defines order of execution for the application"""
+    argParser = argparse.ArgumentParser(description="Parses CreateArbitraryLog*.log files (optionally compressed, .log.gz, .log.bz2, .log.xz, or .log.zst) in the Logs directory into csv reports.")
+    argParser.add_argument("--workers", type=positiveInteger, default=1, help="number of processes to parse log files with (default: 1)")
+    argParser.add_argument("--chunk-size", type=positiveInteger, default=64, help="size in MiB large log files are split into when using workers (default: 64)")
+    argParser.add_argument("--stream", action="store_true", 
+                           help="write records to the csv reports as they are parsed, rather than collecting them first (constant memory)")
+    argParser.add_argument("--incremental", action="store_true", 
+                           help="only parse data appended since the last incremental run (per file checkpoints), appending rows to the existing reports")
+    argParser.add_argument("--follow", action="store_true", 
+                           help="keep parsing log files as they are written, until interrupted (Ctrl+C) or idle for --follow-idle seconds")
+    argParser.add_argument("--follow-idle", type=float, default=0, 
+                           help="with --follow, stop once no log file has grown for this many seconds (default: 0, follow until interrupted)")
+    argParser.add_argument("--reader", choices=["lines", "blocks"], default="lines", 
+                           help="lines: decode and evaluate every line, blocks: search undecoded blocks and decode only matching lines (default: lines)")
+    argParser.add_argument("--spam-capacity", type=positiveInteger, default=1000, 
+                           help="maximum number of message templates counted per log file for log spam detection (default: 1000)")
+    argParser.add_argument("--no-error-rows", action="store_true", 
+                           help="only write the error groups report (one row per distinct error), not a row for every error occurrence "
+                                "(cannot be combined with --sqlite)")
+    argParser.add_argument("--format", choices=["csv", "parquet", "feather", "npz"], default="csv", 
+                           help="file format of the reports, parquet and feather require pyarrow, npz requires numpy (default: csv)")
+    argParser.add_argument("--sqlite", metavar="DATABASE", nargs="?", const="LogParser.db", 
+                           help="also index hitch, memory, error, and machine information records in a SQLite database in the Logs directory (default: LogParser.db), "
+                                "skipping log files already ingested, see QueryLogDatabase.py")
+    argParser.add_argument("--html", metavar="REPORT", nargs="?", const="LogParserReport.html", 
+                           help="also write a self-contained HTML report with memory and hitch charts, and paginated summary, error group, "
+                                "and log spam tables, in the Logs directory (default: LogParserReport.html)")
+    argParser.add_argument("--html-points", type=positiveInteger, default=2000, 
+                           help="maximum number of points drawn per HTML report chart, however many records are parsed (default: 2000)")
+    argParser.add_argument("--shard", metavar="PARTIAL", nargs="?", const="LogParserPartial_" + platform.node() + ".json.z", 
+                           help="write a partial result file in the Logs directory (default: LogParserPartial_<host>.json.z) rather than the reports, "
+                                "holding the records, counts, quantile sketches, error groups, and log spam summaries of this host's log files, "
+                                "to be combined with those of other hosts by --merge")
+    argParser.add_argument("--merge", metavar="PARTIAL", nargs="+", 
+                           help="write the reports from the partial result files of any number of shards (see --shard), rather than parsing log files")
+    argParser.add_argument("--cache", metavar="DIRECTORY", nargs="?", const="LogParserCache", 
+                           help="load the results of unchanged log files from a result cache in the Logs directory (default: LogParserCache), "
+                                "rather than parsing them again")
+    argParser.add_argument("--cache-size", type=positiveInteger, default=256, help="size in MiB the result cache is limited to (default: 256)")
+    argParser.add_argument("--since", type=TimeStampParser.parseArgument, 
+                           help="only parse records time stamped at or after this time, e.g. 13Nov23_14:10:07 or 2023-11-13T14:10:07, "
+                                "reading only the part of each log file its time index finds for the time range")
+    argParser.add_argument("--until", type=TimeStampParser.parseArgument, help="only parse records time stamped at or before this time")
+    argParser.add_argument("--time-index", action="store_true", 
+                           help="update the sparse time index of each log file parsed (LogParserTimeIndex.json in the Logs directory), "
+                                "as --since and --until do, so later time range runs need not index them")
+    argParser.add_argument("--index-interval", type=positiveInteger, default=64, help="KiB of log file between time index entries (default: 64)")
+    argParser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="INFO", 
+                           help="minimum level of statements written to the LogParser log file (default: INFO)")
+    argParser.add_argument("--trace-every", type=int, default=0, 
+                           help="write a DEBUG statement for every Nth line parsed, implies --log-level DEBUG (default: 0, per file summaries only)")
+    argParser.add_argument("--profile", action="store_true", 
+                           help="profile the run with cProfile (the main process only) and tracemalloc, "
+                                "writing the stats next to the LogParser log file (LogParser_*.prof), and to its run summary")
+    args = argParser.parse_args()
+    if (args.since is not None or args.until is not None) and (args.incremental or args.follow or args.sqlite):
+        argParser.error("--since and --until cannot be combined with --incremental, --follow, or --sqlite")
+    if args.shard and (args.merge or args.stream or args.follow or args.incremental or args.sqlite):
+        argParser.error("--shard cannot be combined with --merge, --stream, --follow, --incremental, or --sqlite")
+    if args.merge and (args.stream or args.follow or args.incremental or args.sqlite):
+        argParser.error("--merge cannot be combined with --stream, --follow, --incremental, or --sqlite")
+    if args.no_error_rows and args.sqlite:
+        argParser.error("--no-error-rows cannot be combined with --sqlite, whose errors table is filled from the error rows")
+    
+    logFileName = createLogFile(logging.DEBUG if args.trace_every > 0 else getattr(logging, args.log_level))
+    
+    profiler = None
+    if args.profile:
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+    try:
+        if profiler is not None:
+            profiler.runcall(runParser, args)
+        else:
+            runParser(args)
+    finally:
+        if logFileName is not None:
+            baseName = os.path.splitext(logFileName)[0]
+            details = {"arguments": vars(args), "logFile": logFileName}
+            if profiler is not None:
+                details["profile"] = dumpProfile(profiler, baseName + ".prof")
+            runTimer.writeSummary(baseName + ".json", details) # machine-readable summary of the run, next to its log file
+
 # Execute!    
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,568 @@
+"""
+William Fissler 2023
+
+LogReaders.py
+
+Reading of log files for LogParser.py: matching criteria, decompression, splitting log files into chunks at record boundaries,
+and parsing a chunk into records (a line at a time, or a block at a time).
+The parse functions are defined at module level, so that they can be sent to worker processes for parallel runs.
+"""
+
+import logging, os, re, io, gzip, bz2, lzma
+
+from LogRecords import HitchRecord, MemoryRecord, ErrorRecord, SystemInfoRecord, TimeStampParser
+from LogStatistics import SpamCounter
+
+try:
+    import zstandard # optional, for .zst compressed log files
+except ImportError:
+    zstandard = None
+
+class CriteriaMatcher:
+    """
+    Class for evaluating log lines against every parse criteria in priority order, built once per run rather than per line.
+    Plain string criteria are evaluated with substring checks, otherwise with one precompiled alternation of every criteria.
+    
+    Attributes
+    ----------
+    criteria[] : tuple
+        Stores (category, pattern) pairs in priority order.
+    isLiteral : bool
+        True when every pattern is a plain string with no regex special characters.
+    compiledCriteria[] : tuple
+        Stores (category, compiled pattern) pairs in priority order.
+    combinedPattern : re.Pattern
+        Single alternation of all criteria, each wrapped in a named group identifying its priority.
+    bytesPatterns[] : re.Pattern
+        Stores each criteria compiled as a UTF-8 bytes pattern, for searching undecoded blocks of a log file.
+        
+    Methods
+    -------
+    __init__(criteria:list)
+        Constructor.
+        Compiles the criteria and builds the combined alternation.
+        :param criteria: list of (category, pattern) tuples in priority order
+        :type criteria: list
+        
+    match(line:str) -> str
+        Evaluates a line against all criteria.
+        :param line: log line to be evaluated
+        :type line: str
+        :returns: category of the highest priority criteria matched, or None if no criteria matched
+        :rtype: str
+        
+    findCandidateLines(block:bytes) -> list
+        Searches an undecoded block of log lines for every criteria.
+        :param block: bytes of whole log lines
+        :type block: bytes
+        :returns: sorted list of byte offsets of the start of each line containing at least one match
+        :rtype: list
+    """
+    regexSpecialCharacters = set(".^$*+?{}[]\\|()")
+    
+    def __init__(self, criteria) -> None:
+        """Constructor.
+        Compiles the criteria and builds the combined alternation.
+        
+        :param criteria: list of (category, pattern) tuples in priority order
+        :type criteria: list"""
+        self.criteria = tuple(criteria)
+        self.isLiteral = all(self.regexSpecialCharacters.isdisjoint(pattern) for category, pattern in self.criteria)
+        self.compiledCriteria = tuple((category, re.compile(pattern)) for category, pattern in self.criteria)
+        self.combinedPattern = re.compile("|".join("(?P<c" + str(index) + ">" + pattern + ")" 
+                                                   for index, (category, pattern) in enumerate(self.criteria)))
+        self.bytesPatterns = tuple(re.compile(pattern.encode('utf-8')) for category, pattern in self.criteria)
+        
+    def match(self, line) -> str:
+        """Evaluates a line against all criteria.
+        
+        :param line: log line to be evaluated
+        :type line: str
+        :returns: category of the highest priority criteria matched, or None if no criteria matched
+        :rtype: str"""
+        if self.isLiteral:
+            for category, pattern in self.criteria:
+                if pattern in line:
+                    return category
+            return None
+        
+        combinedMatch = self.combinedPattern.search(line)
+        if combinedMatch is None:
+            return None
+        
+        # the alternation reports the left most match, so resolve any higher priority criteria that also match the line
+        priority = int(combinedMatch.lastgroup[1:])
+        for category, pattern in self.compiledCriteria[:priority]:
+            if pattern.search(line) is not None:
+                return category
+        return self.compiledCriteria[priority][0]
+    
+    def findCandidateLines(self, block) -> list:
+        """Searches an undecoded block of log lines for every criteria.
+        Each criteria is searched for separately, as the regex engine scans for a single pattern much faster than an alternation.
+        Candidate lines should still be evaluated with match(), which applies the criteria priority to the decoded line.
+        
+        :param block: bytes of whole log lines
+        :type block: bytes
+        :returns: sorted list of byte offsets of the start of each line containing at least one match
+        :rtype: list"""
+        rfind = block.rfind
+        if self.isLiteral: # a plain string match can never span lines
+            return sorted({rfind(b"\n", 0, found.start()) + 1 for pattern in self.bytesPatterns for found in pattern.finditer(block)})
+        
+        lineStarts = set()
+        for pattern in self.bytesPatterns:
+            search = pattern.search
+            found = search(block)
+            while found is not None:
+                matchStart = found.start()
+                lineStarts.add(block.rfind(b"\n", 0, matchStart) + 1)
+                if b"\n" in found.group(): # match spans lines, resume from the next line so no match is hidden behind it
+                    found = search(block, block.find(b"\n", matchStart) + 1)
+                else:
+                    found = search(block, max(found.end(), matchStart + 1))
+        return sorted(lineStarts)
+
+def openZstandard(logName, mode='rb'):
+    """Opens a zstandard compressed file for reading, decompressing it as it is read."""
+    return zstandard.ZstdDecompressor().stream_reader(open(logName, mode), read_size=1024**2, closefd=True)
+
+compressedLogOpeners = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open} # by file extension
+if zstandard is not None:
+    compressedLogOpeners[".zst"] = openZstandard
+
+def isCompressedLog(logName) -> bool:
+    """Checks whether a log file is compressed (by its file extension), and so can only be read sequentially from its start.
+    
+    :param logName: log file name
+    :type logName: str
+    :rtype: bool"""
+    return os.path.splitext(logName)[1] in compressedLogOpeners
+
+def openLog(logName, bufferSize=1024**2):
+    """Opens a log file for reading in binary mode, by every reader (line, block, and machine information).
+    Compressed log files are decompressed as they are read, a buffer of bufferSize bytes at a time, 
+    through an io.BufferedReader, so that lines are still read (and framed) in C rather than through the decompressor's Python methods.
+    
+    :param logName: log file name, optionally with a compressed file extension (.gz, .bz2, .xz, or .zst)
+    :type logName: str
+    :param bufferSize: bytes decompressed at a time
+    :type bufferSize: int
+    :returns: binary file object, at the start of the (decompressed) log
+    :rtype: io.BufferedIOBase"""
+    opener = compressedLogOpeners.get(os.path.splitext(logName)[1])
+    if opener is None:
+        return open(logName, 'rb')
+    return io.BufferedReader(opener(logName, 'rb'), bufferSize)
+
+def planLogChunks(logName, chunkSize, start=0, end=None) -> list:
+    """Splits a log file (or the start to end byte range of it) into byte ranges of roughly chunkSize bytes, so that it can be parsed in parallel.
+    Each range starts at a line starting with '[' (a new log record), so that error callstacks are never split across ranges.
+    
+    :param logName: log file name to be split
+    :type logName: str
+    :param chunkSize: approximate size of each byte range
+    :type chunkSize: int
+    :param start: byte offset to split from (must be the start of a line)
+    :type start: int
+    :param end: byte offset to split to, or None for end of file
+    :type end: int
+    :returns: chunks - list of (start, end) byte offsets, where the last end is the end passed in
+    :rtype: list"""
+    fileSize = os.path.getsize(logName) if end is None else end
+    boundaries = [start]
+    
+    with open(logName, 'rb') as cachedLog:
+        offset = start + chunkSize
+        while offset < fileSize:
+            cachedLog.seek(offset - 1) # include the preceding byte, in case offset is already at the start of a record
+            position = offset - 1
+            boundary = None
+            while boundary is None:
+                block = cachedLog.read(65536)
+                if len(block) < 2: # end of file, only the byte kept from the previous read is left
+                    break
+                index = block.find(b"\n[")
+                if index != -1:
+                    boundary = position + index + 1
+                else:
+                    position += len(block) - 1 # keep the last byte, in case "\n[" straddles two reads
+                    cachedLog.seek(position)
+            if boundary is None or boundary >= fileSize:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+            offset = max(boundary + 1, offset + chunkSize)
+            
+    return list(zip(boundaries, boundaries[1:] + [end]))
+
+def findLastRecordStart(logName, start, end) -> int:
+    """Searches backwards from end for the start of the last log record (a line starting with '[') after start.
+    
+    :param logName: log file name to be searched
+    :type logName: str
+    :param start: byte offset to search back to (must be the start of a line)
+    :type start: int
+    :param end: byte offset to search back from
+    :type end: int
+    :returns: byte offset of the last record start after start, or start if there is none
+    :rtype: int"""
+    with open(logName, 'rb') as cachedLog:
+        position = end
+        while position > start:
+            readStart = max(start, position - 65536)
+            cachedLog.seek(readStart)
+            # one extra byte, in case "\n[" straddles two reads, but never a record starting at or after end
+            index = cachedLog.read(position - readStart + 1).rfind(b"\n[", 0, end - readStart)
+            if index != -1:
+                return readStart + index + 1
+            position = readStart
+    return start
+
+def findTimeEntries(block, blockStart, target, interval, timeStamps) -> tuple:
+    """Finds the time stamp, byte offset, and number of preceding lines of the first log record starting at or after target in a block, 
+    and of the first record starting at or after every interval bytes past it, for a sparse time index (see TimeIndex), 
+    without decoding or framing any line. Records whose first line has no time stamp are passed over for the next record.
+    
+    :param block: undecoded lines of a log file, ending with a complete line or at the start of a record, 
+        so every record start in it is followed by its time stamp
+    :type block: bytes
+    :param blockStart: byte offset of block in the log file
+    :type blockStart: int
+    :param target: byte offset of the next entry (or the next record after it)
+    :type target: int
+    :param interval: bytes between entries
+    :type interval: int
+    :param timeStamps: parser of the time stamps of the records found
+    :type timeStamps: TimeStampParser
+    :returns: (entries, target) - [seconds, offset, lineCount] of each entry, lineCount being the number of lines of block before offset, 
+        and the byte offset of the next entry, in a later block
+    :rtype: tuple"""
+    entries = []
+    blockEnd = blockStart + len(block)
+    countedTo, lineCount = 0, 0 # offset in block, and lines of block preceding it
+    while target < blockEnd:
+        recordStart = max(target - blockStart, 0)
+        if recordStart > 0 or block[:1] != b"[":
+            recordStart = block.find(b"\n[", max(recordStart, 1) - 1) + 1
+            if recordStart == 0: # no record starts in the rest of the block
+                break
+        lineCount += block.count(b"\n", countedTo, recordStart)
+        countedTo = recordStart
+        seconds = timeStamps.parse(block[recordStart:recordStart + 22])
+        if seconds is not None:
+            entries.append([seconds, blockStart + recordStart, lineCount])
+        target = blockStart + recordStart + (interval if seconds is not None else 1)
+    return entries, max(target, blockEnd)
+
+def frameLogRecords(rawLines, size=None):
+    """Frames undecoded log lines into whole log records, for the line reader of every parse mode.
+    A record starts at each line starting with '[' (its time stamp), and continues over every following line that does not (e.g. a callstack).
+    Lines are never peeked at or pushed back: a record is yielded once the next record starts, or once the lines run out.
+    
+    :param rawLines: undecoded log lines, e.g. a log file opened in binary mode, positioned at the start of a record
+    :type rawLines: iterable
+    :param size: number of bytes of lines to frame, or None to frame every line
+    :type size: int
+    :returns: (lineNumber, firstLine, continuationLines) for each record - the line number of its first line (counting from 1), 
+        its first line, and a list of its continuation lines (None if it has none), undecoded
+    :rtype: generator"""
+    firstLine = None
+    continuationLines = None
+    lineNumber = 0
+    for rawLine in rawLines:
+        if size is not None:
+            if size <= 0:
+                break
+            size -= len(rawLine)
+        lineNumber += 1
+        if rawLine[0] == 0x5B or firstLine is None: # '[', or continuation lines at the start of the lines framed
+            if firstLine is not None:
+                yield recordLineNumber, firstLine, continuationLines
+                continuationLines = None
+            recordLineNumber = lineNumber
+            firstLine = rawLine
+        elif continuationLines is None:
+            continuationLines = [rawLine]
+        else:
+            continuationLines.append(rawLine)
+    if firstLine is not None:
+        yield recordLineNumber, firstLine, continuationLines
+
+def readSystemInfo(logName, criteria, headerSize=65536) -> SystemInfoRecord:
+    """Reads the machine information block of a log file, which is logged when the log file is created.
+    Only the header region of the log file is framed into records, and framing stops at the first record matching criteria.
+    
+    :param logName: log file name to be read
+    :type logName: str
+    :param criteria: text the first line of the machine information block contains, e.g. "***System Informtation***"
+    :type criteria: str
+    :param headerSize: number of bytes at the start of the log file to search
+    :type headerSize: int
+    :returns: SystemInfoRecord, or None if the header region does not contain the block
+    :rtype: SystemInfoRecord"""
+    criteria = criteria.encode('utf-8')
+    with openLog(logName) as cachedLog:
+        for lineNumber, firstLine, continuationLines in frameLogRecords(cachedLog, headerSize):
+            if criteria in firstLine:
+                lines = [rawLine.decode('utf-8', errors='replace').rstrip("\r\n") for rawLine in [firstLine] + (continuationLines or [])]
+                return SystemInfoRecord.fromLines(logName, lineNumber, lines)
+    return None
+
+def offsetLineNumbers(records, lineOffset) -> list:
+    """Offsets the line numbers of records parsed from a chunk, to the line numbers of the log file.
+    
+    :param records: records with line numbers relative to the start of their chunk
+    :type records: list
+    :param lineOffset: number of lines in the log file preceding the chunk
+    :type lineOffset: int
+    :returns: records with line numbers relative to the start of the log file
+    :rtype: list"""
+    if lineOffset == 0:
+        return records
+    return [record._replace(lineNumber=record.lineNumber + lineOffset) for record in records]
+
+def parseLogChunk(logName, start, end, matcher, traceEvery=0, spamCapacity=0, timeRange=None, indexInterval=0) -> tuple:
+    """Iterates through each log record (framed by frameLogRecords) in the byte range of a log file, evaluates its first line 
+    for the established criteria, and appends the appropriate list with the record extracted from it.
+    Continuation lines are never evaluated on their own: error records include them as their callstack.
+    
+    :param logName: log file name to be parsed
+    :type logName: str
+    :param start: byte offset to start parsing from (must be the start of a line, in the decompressed log for compressed log files, 
+        which are decompressed from their start up to it)
+    :type start: int
+    :param end: byte offset to stop parsing at (in the decompressed log), or None to parse to end of file
+    :type end: int
+    :param matcher: criteria to evaluate each line with
+    :type matcher: CriteriaMatcher
+    :param traceEvery: write a debug statement for every Nth line evaluated (0 to disable), 
+        given by the calling process only when its log level is DEBUG (see LogParser.getTraceEvery), as a worker's may differ
+    :type traceEvery: int
+    :param spamCapacity: maximum number of message templates counted for log spam detection (0 to disable)
+    :type spamCapacity: int
+    :param timeRange: (since, until) seconds since 1970-01-01 (see TimeStampParser), records time stamped outside of which are skipped 
+        (log spam is still counted over the whole range), or None to evaluate every record
+    :type timeRange: tuple
+    :param indexInterval: bytes between the time index entries found in the range (see findTimeEntries), so the log file's time index 
+        is filled by its parse rather than by a scan of its own, or 0 to find none
+    :type indexInterval: int
+    :returns: (hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries) - line numbers are relative to start, counting from 1, 
+        spamCounter is the SpamCounter of the range (None when spamCapacity is 0), and timeEntries the [seconds, offset, lineCount] 
+        of each time index entry found, lineCount being the number of lines of the range before offset
+    :rtype: tuple"""
+    for lastBatch, result in parseLogBatches(logName, start, end, matcher, traceEvery, spamCapacity, timeRange, indexInterval):
+        return result
+
+def parseLogBatches(logName, start, end, matcher, traceEvery=0, spamCapacity=0, timeRange=None, indexInterval=0, batchSize=None):
+    """Generator equivalent of parseLogChunk, yielding the records of the byte range in batches of roughly batchSize (decompressed) bytes 
+    that end at record boundaries, so that a log file which cannot be split into chunks (a compressed log file) is parsed with bounded memory.
+    
+    :param batchSize: bytes of the range parsed per batch, or None to parse the range as a single batch
+    :type batchSize: int
+    :returns: (lastBatch, (hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries)) for each batch - line numbers 
+        (and the line counts of timeEntries) are relative to the start of the batch, counting from 1, 
+        and spamCounter (of the whole range) is only given with the last batch
+    :rtype: generator"""
+    hitchList = []
+    memoryList = []
+    errorList = []
+    timeEntries = []
+    lineCount = 0
+    batchLine = 0 # lines preceding the batch
+    checkLine = 8192 # line number the size of the batch is next checked at
+    spamCounter = SpamCounter(spamCapacity) if spamCapacity > 0 else None
+    spamLines = [] # first lines of the records not yet counted by spamCounter, counted in batches rather than per record
+    timeStamps = None if timeRange is None and not indexInterval else TimeStampParser()
+    recordStart = target = start # byte offset of the record, and of the next time index entry (or the next record after it)
+    
+    with openLog(logName) as cachedLog:
+        if start:
+            cachedLog.seek(start)
+        batchStart = start
+        for lineNumber, firstLine, continuationLines in frameLogRecords(cachedLog, None if end is None else end - start):
+            if batchSize is not None and lineNumber >= checkLine:
+                checkLine = lineNumber + 8192
+                position = cachedLog.tell()
+                if position - batchStart >= batchSize:
+                    yield False, (hitchList, memoryList, errorList, lineCount - batchLine, None, timeEntries)
+                    hitchList, memoryList, errorList, timeEntries = [], [], [], []
+                    batchLine, batchStart = lineCount, position
+            recordLine = lineCount # lines preceding the record
+            lineCount = lineNumber if continuationLines is None else lineNumber + len(continuationLines)
+            if spamCounter is not None:
+                spamLines.append(firstLine)
+                if len(spamLines) >= 8192:
+                    spamCounter.countBlock(b"".join(spamLines))
+                    spamLines.clear()
+            if timeStamps is not None:
+                timeStamp = timeStamps.parse(firstLine)
+                if indexInterval:
+                    if recordStart >= target and timeStamp is not None:
+                        timeEntries.append([timeStamp, recordStart, recordLine - batchLine])
+                        target = recordStart + indexInterval
+                    recordStart += len(firstLine) if continuationLines is None else len(firstLine) + sum(map(len, continuationLines))
+                if timeRange is not None and timeStamp is not None and not timeRange[0] <= timeStamp <= timeRange[1]:
+                    continue
+            line = firstLine.decode('utf-8', errors='replace')
+            
+            category = matcher.match(line)
+            if traceEvery and lineNumber % traceEvery == 0:
+                logging.debug("%s line %d (of chunk at byte %d): %s", logName, lineNumber, start, category or "no reportable criteria")
+            if category == "hitch":
+                record = HitchRecord.fromLine(logName, lineNumber - batchLine, line)
+                if record is not None:
+                    hitchList.append(record)
+                else:
+                    logging.warning("Hitch fields could not be extracted from %s on line %d (of chunk at byte %d)", logName, lineNumber, start)
+            elif category == "memory":
+                record = MemoryRecord.fromLine(logName, lineNumber - batchLine, line)
+                if record is not None:
+                    memoryList.append(record)
+                else:
+                    logging.warning("Memory fields could not be extracted from %s on line %d (of chunk at byte %d)", logName, lineNumber, start)
+            elif category == "error":
+                errorLines = [line.rstrip("\r\n")]
+                if continuationLines is not None: # callstack lines
+                    errorLines.extend(rawLine.decode('utf-8', errors='replace').rstrip("\r\n") for rawLine in continuationLines)
+                errorList.append(ErrorRecord.fromLines(logName, lineNumber - batchLine, errorLines))
+                
+    if spamCounter is not None and spamLines:
+        spamCounter.countBlock(b"".join(spamLines))
+        
+    yield True, (hitchList, memoryList, errorList, lineCount - batchLine, spamCounter, timeEntries)
+
+def parseLogChunkBlocks(logName, start, end, matcher, traceEvery=0, spamCapacity=0, timeRange=None, indexInterval=0, blockSize=8 * 1024**2) -> tuple:
+    """Block reader equivalent of parseLogChunk, producing identical results.
+    Reads the byte range in blocks that end at a record boundary, searches each undecoded block for the criteria, 
+    and only decodes the lines containing a match (plus the callstack lines of error records).
+    
+    :param logName: log file name to be parsed
+    :type logName: str
+    :param start: byte offset to start parsing from (must be the start of a line, in the decompressed log for compressed log files, 
+        which are decompressed from their start up to it)
+    :type start: int
+    :param end: byte offset to stop parsing at (in the decompressed log), or None to parse to end of file
+    :type end: int
+    :param matcher: criteria to evaluate each line with
+    :type matcher: CriteriaMatcher
+    :param traceEvery: write a debug statement for every Nth candidate line evaluated (0 to disable, see parseLogChunk), 
+        lines without a match are never visited by the block reader so are not traced
+    :type traceEvery: int
+    :param spamCapacity: maximum number of message templates counted for log spam detection (0 to disable)
+    :type spamCapacity: int
+    :param timeRange: (since, until) seconds since 1970-01-01 (see TimeStampParser), records time stamped outside of which are skipped 
+        (log spam is still counted over the whole range), or None to evaluate every record
+    :type timeRange: tuple
+    :param indexInterval: bytes between the time index entries found in the range (see parseLogChunk), or 0 to find none
+    :type indexInterval: int
+    :param blockSize: bytes to read at a time
+    :type blockSize: int
+    :returns: (hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries) - line numbers are relative to start, counting from 1
+    :rtype: tuple"""
+    for lastBatch, result in parseLogBlockBatches(logName, start, end, matcher, traceEvery, spamCapacity, timeRange, indexInterval, blockSize):
+        return result
+
+def parseLogBlockBatches(logName, start, end, matcher, traceEvery=0, spamCapacity=0, timeRange=None, indexInterval=0, blockSize=8 * 1024**2, 
+                         batchSize=None):
+    """Generator equivalent of parseLogChunkBlocks, yielding the records of the byte range in batches of roughly batchSize (decompressed) bytes, 
+    each ending with a block (see parseLogBatches).
+    
+    :param batchSize: bytes of the range parsed per batch, or None to parse the range as a single batch
+    :type batchSize: int
+    :returns: (lastBatch, (hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries)) for each batch - line numbers 
+        (and the line counts of timeEntries) are relative to the start of the batch, counting from 1, 
+        and spamCounter (of the whole range) is only given with the last batch
+    :rtype: generator"""
+    hitchList = []
+    memoryList = []
+    errorList = []
+    timeEntries = []
+    candidateCount = 0 # candidate lines evaluated, for sampling trace statements
+    lineCount = 0 # lines in the blocks already processed
+    batchLine = 0 # lines preceding the batch
+    batchBytes = 0 # bytes of the blocks of the batch
+    carry = b"" # trailing record of the previous read, to be processed with the next block
+    remaining = None if end is None else end - start
+    spamCounter = SpamCounter(spamCapacity) if spamCapacity > 0 else None
+    timeStamps = None if timeRange is None and not indexInterval else TimeStampParser()
+    blockStart = target = start # byte offset of the block, and of the next time index entry (or the next record after it)
+    
+    with openLog(logName) as cachedLog:
+        if start:
+            cachedLog.seek(start)
+        while True:
+            data = cachedLog.read(blockSize if remaining is None else min(blockSize, remaining))
+            if remaining is not None:
+                remaining -= len(data)
+            endOfRange = not data or remaining == 0
+            block = carry + data
+            
+            if not endOfRange:
+                cut = block.rfind(b"\n[") + 1 # start of the last record, which may continue in the next read
+                if cut == 0: # a single record larger than the block, keep reading
+                    carry = block
+                    continue
+                carry = block[cut:]
+                block = block[:cut]
+            
+            if spamCounter is not None:
+                spamCounter.countBlock(block)
+            if indexInterval:
+                blockEntries, target = findTimeEntries(block, blockStart, target, indexInterval, timeStamps)
+                for entry in blockEntries:
+                    entry[2] += lineCount - batchLine
+                timeEntries += blockEntries
+            blockStart += len(block)
+            countedTo = 0 # offset of the line numbered lineNumber
+            lineNumber = lineCount - batchLine + 1
+            for lineStart in matcher.findCandidateLines(block):
+                if block[lineStart] != 0x5B and lineStart != 0: # continuation lines are part of the preceding record, not evaluated on their own
+                    continue
+                if timeRange is not None:
+                    timeStamp = timeStamps.parse(block[lineStart:lineStart + 22])
+                    if timeStamp is not None and not timeRange[0] <= timeStamp <= timeRange[1]:
+                        continue
+                lineNumber += block.count(b"\n", countedTo, lineStart)
+                countedTo = lineStart
+                lineEnd = block.find(b"\n", lineStart) + 1 or len(block)
+                line = block[lineStart:lineEnd].decode('utf-8', errors='replace')
+                
+                category = matcher.match(line)
+                if traceEvery:
+                    candidateCount += 1
+                    if candidateCount % traceEvery == 0:
+                        logging.debug("%s line %d (of chunk at byte %d): %s", logName, lineNumber, start, category or "no reportable criteria")
+                if category == "hitch":
+                    record = HitchRecord.fromLine(logName, lineNumber, line)
+                    if record is not None:
+                        hitchList.append(record)
+                    else:
+                        logging.warning("Hitch fields could not be extracted from %s on line %d (of chunk at byte %d)", logName, lineNumber, start)
+                elif category == "memory":
+                    record = MemoryRecord.fromLine(logName, lineNumber, line)
+                    if record is not None:
+                        memoryList.append(record)
+                    else:
+                        logging.warning("Memory fields could not be extracted from %s on line %d (of chunk at byte %d)", logName, lineNumber, start)
+                elif category == "error":
+                    errorLines = [line.rstrip("\r\n")]
+                    callstackStart = lineEnd
+                    while callstackStart < len(block) and block[callstackStart] != 0x5B: # callstack lines do not start with '['
+                        callstackEnd = block.find(b"\n", callstackStart) + 1 or len(block)
+                        errorLines.append(block[callstackStart:callstackEnd].decode('utf-8', errors='replace').rstrip("\r\n"))
+                        callstackStart = callstackEnd
+                    errorList.append(ErrorRecord.fromLines(logName, lineNumber, errorLines))
+                    
+            lineCount += block.count(b"\n")
+            if endOfRange:
+                if block and block[-1:] != b"\n": # final line without a line ending
+                    lineCount += 1
+                break
+            batchBytes += len(block)
+            if batchSize is not None and batchBytes >= batchSize:
+                yield False, (hitchList, memoryList, errorList, lineCount - batchLine, None, timeEntries)
+                hitchList, memoryList, errorList, timeEntries = [], [], [], []
+                batchLine, batchBytes = lineCount, 0
+    
+    yield True, (hitchList, memoryList, errorList, lineCount - batchLine, spamCounter, timeEntries)
@@ -0,0 +1,295 @@
+"""
+William Fissler 2023
+
+LogRecords.py
+
+The typed records LogParser.py extracts from log lines and summarizes them into, and the parser of log line time stamps.
+Field order of each record matches the columns of its report.
+"""
+
+import datetime, re, argparse
+from typing import NamedTuple
+
+hitchFieldsPattern = re.compile(r"thread:\s\[(.+?)\].*?duration of:\s(\d[\d.eE+-]*)")
+memoryFieldsPattern = re.compile(r"footprint:\s(\d[\d.eE+-]*).*?run time:\s(\d[\d.eE+-]*)")
+errorTypePattern = re.compile(r"([A-Za-z_][\w.]*)(?::\s|:?$)")
+systemInfoFieldPattern = re.compile(r"^\s*([^:\n]+?):\s*(.*?)\s*$")
+
+class HitchRecord(NamedTuple):
+    """Hitch data extracted from a log line matching hitchCriteria. Field order matches the Hitch Report columns."""
+    logName: str
+    lineNumber: int
+    thread: str
+    duration: float
+    
+    @classmethod
+    def fromLine(cls, logName, lineNumber, line):
+        """Extracts the thread name and hitch duration (ms) from line.
+        
+        :returns: HitchRecord, or None if the line does not contain the hitch fields
+        :rtype: HitchRecord"""
+        fields = hitchFieldsPattern.search(line)
+        if fields is None:
+            return None
+        return cls(logName, lineNumber, fields.group(1), float(fields.group(2)))
+
+class MemoryRecord(NamedTuple):
+    """Memory data extracted from a log line matching memoryCriteria. Field order matches the Memory Report columns."""
+    logName: str
+    lineNumber: int
+    footprint: float
+    runTime: float
+    
+    @classmethod
+    def fromLine(cls, logName, lineNumber, line):
+        """Extracts the footprint (MiB) and the run time it was recorded at from line.
+        
+        :returns: MemoryRecord, or None if the line does not contain the memory fields
+        :rtype: MemoryRecord"""
+        fields = memoryFieldsPattern.search(line)
+        if fields is None:
+            return None
+        return cls(logName, lineNumber, float(fields.group(1)), float(fields.group(2)))
+
+class HitchMemoryRecord(NamedTuple):
+    """Hitch joined with the nearest preceding memory sample of its log file (see HitchMemoryJoiner). Field order matches the Hitch Memory Report columns.
+    The memory fields are None when no memory sample parsed precedes the hitch, and the footprint delta when the sample is the first parsed."""
+    logName: str
+    lineNumber: int
+    thread: str
+    duration: float
+    memoryLineNumber: int
+    footprint: float
+    footprintDelta: float
+    runTime: float
+
+class ErrorRecord(NamedTuple):
+    """Error data extracted from a log line matching errorCriteria and its callstack. Field order matches the Error Report columns."""
+    logName: str
+    lineNumber: int
+    errorType: str
+    message: str
+    timeStamp: float
+    
+    @classmethod
+    def fromLines(cls, logName, lineNumber, lines):
+        """Extracts the error type, message, and time stamp from the error line and its callstack lines. 
+        The error type is taken from the last callstack line naming an exception (e.g. "NameError: ..."), 
+        the message is the error line (less its time stamp) followed by the callstack, 
+        and the time stamp is that of the error line in seconds since 1970-01-01 (see TimeStampParser), or None if it has none.
+        
+        :param lines: error line, followed by each callstack line
+        :type lines: list
+        :rtype: ErrorRecord"""
+        errorType = None
+        for line in reversed(lines[1:]):
+            fields = errorTypePattern.match(line)
+            if fields is not None:
+                errorType = fields.group(1)
+                break
+        message = "\n".join([lines[0].split("] - ", 1)[-1]] + lines[1:])
+        return cls(logName, lineNumber, errorType, message, errorTimeStamps.parse(lines[0][:22].encode()))
+
+class SystemInfoRecord(NamedTuple):
+    """Machine information extracted from a ***System Informtation*** block. Field order matches the System Info Report columns.
+    Counts and sizes the block does not state (e.g. cores psutil could not determine) are 0."""
+    logName: str
+    lineNumber: int
+    pythonVersion: str
+    host: str
+    operatingSystem: str
+    cpu: str
+    physicalCores: int
+    logicalCores: int
+    totalMemory: float
+    availableMemory: float
+    
+    @classmethod
+    def fromLines(cls, logName, lineNumber, lines):
+        """Extracts the machine information from the lines of a ***System Informtation*** block, each a "Label: value" line.
+        
+        :param lines: first line of the block, followed by each of its continuation lines
+        :type lines: list
+        :rtype: SystemInfoRecord"""
+        values = {}
+        for line in lines[1:]:
+            fields = systemInfoFieldPattern.match(line)
+            if fields is not None:
+                values[fields.group(1)] = fields.group(2)
+        def number(label, numberType):
+            digits = re.match(r"\d+(?:\.\d+)?", values.get(label, ""))
+            return numberType(float(digits.group())) if digits is not None else numberType(0)
+        return cls(logName, lineNumber, values.get("Python Version", ""), values.get("User", ""), values.get("Operating System", ""), 
+                   values.get("CPU", ""), number("CPU Physical Cores", int), number("CPU Logical Cores", int), 
+                   number("Total Virtual Memory", float), number("Available Virtual Memory", float))
+    
+    @property
+    def machineClass(self) -> str:
+        """Host and core count of the machine, the group its log files' statistics are summarized under."""
+        return self.host + " (" + str(self.physicalCores) + " physical, " + str(self.logicalCores) + " logical cores)"
+
+class SpamRecord(NamedTuple):
+    """Message template repeated at least logSpamCriteria times in a log file. Field order matches the Log Spam Report columns."""
+    logName: str
+    template: str
+    occurrences: int
+    maxUndercount: int
+
+class ErrorGroupRecord(NamedTuple):
+    """Occurrences of errors sharing a stack signature. Field order matches the Error Groups Report columns."""
+    signature: str
+    errorType: str
+    template: str
+    occurrences: int
+    firstLogName: str
+    firstLineNumber: int
+    firstTimeStamp: float
+    lastLogName: str
+    lastLineNumber: int
+    lastTimeStamp: float
+    exampleMessage: str
+
+class HitchSummaryRecord(NamedTuple):
+    """Hitch duration statistics of a log file, a thread, or all log files. Field order matches the Hitch Summary columns."""
+    groupBy: str
+    group: str
+    count: int
+    minimum: float
+    maximum: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+
+class MemorySummaryRecord(NamedTuple):
+    """Memory footprint statistics of a log file, or all log files. Field order matches the Memory Summary columns."""
+    groupBy: str
+    group: str
+    count: int
+    minimum: float
+    maximum: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    finalRunTime: float
+
+class MemoryTrendRecord(NamedTuple):
+    """Memory growth trend of a log file (see MemoryTrend). Field order matches the Memory Trend columns."""
+    logName: str
+    count: int
+    firstRunTime: float
+    lastRunTime: float
+    firstFootprint: float
+    lastFootprint: float
+    slope: float
+    rSquared: float
+    peak: float
+    peakRunTime: float
+    trough: float
+    troughRunTime: float
+    changePoints: int
+    firstChangeRunTime: float
+    lastChangeRunTime: float
+    lastChangeDirection: str
+
+class TimeStampParser:
+    """
+    Class for decoding the fixed width time stamp each log record starts with, e.g. "[13Nov23_14:10:07.339]" 
+    (the datefmt '%d%b%y_%H:%M:%S' and milliseconds of CreateArbitraryLog.py's logging format), 
+    into seconds since 1970-01-01 of the (naive, local) time written.
+    
+    Fields are sliced from fixed positions of the undecoded line, rather than parsed with datetime.strptime 
+    (which is also locale dependent for month names), and the seconds of each per second prefix (e.g. "13Nov23_14:10:07") are memoized, 
+    so a time stamp within an already decoded second costs a dictionary lookup and a millisecond conversion.
+    
+    Attributes
+    ----------
+    months{} : int
+        Month number, by month abbreviation.
+    memo{} : float
+        Stores the seconds of each per second prefix decoded (None for malformed prefixes).
+    memoSize : int
+        Defaults to 65536 (number of prefixes memoized before the memo is cleared).
+        
+    Methods
+    -------
+    __init__
+        Constructor.
+        Initializes the following attributes: memo, memoSize.
+        
+    parse(line:bytes) -> float
+        Decodes the time stamp at the start of an undecoded log line.
+        :returns: seconds, or None if the line does not start with a time stamp
+        :rtype: float
+        
+    decodeSecond(prefix:bytes) -> float
+        Decodes a per second prefix (the time stamp without its brackets and milliseconds).
+        
+    parseArgument(text:str) -> float
+        Parses a --since or --until argument, in the time stamp format (13Nov23_14:10:07[.339]) or ISO 8601 format.
+    """
+    months = {month.encode(): number for number, month in enumerate(("Jan", "Feb", "Mar", "Apr", "May", "Jun", 
+                                                                     "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+    epoch = datetime.datetime(1970, 1, 1)
+    
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes: memo, memoSize."""
+        self.memo = {}
+        self.memoSize = 65536
+        
+    def parse(self, line) -> float:
+        """Decodes the time stamp at the start of an undecoded log line, e.g. b"[13Nov23_14:10:07.339] - INFO - ...".
+        
+        :param line: undecoded log line (at least its first 22 bytes)
+        :type line: bytes
+        :returns: seconds since 1970-01-01, or None if the line does not start with a time stamp
+        :rtype: float"""
+        if line[:1] != b"[" or line[21:22] != b"]":
+            return None
+        prefix = line[1:17]
+        seconds = self.memo.get(prefix, False)
+        if seconds is False:
+            seconds = self.decodeSecond(prefix)
+            if len(self.memo) >= self.memoSize:
+                self.memo.clear()
+            self.memo[prefix] = seconds
+        milliseconds = line[18:21]
+        if seconds is None or not milliseconds.isdigit():
+            return None
+        return seconds + int(milliseconds) / 1000
+        
+    def decodeSecond(self, prefix) -> float:
+        """Decodes a per second prefix, e.g. b"13Nov23_14:10:07".
+        
+        :param prefix: time stamp without its brackets and milliseconds
+        :type prefix: bytes
+        :returns: seconds since 1970-01-01, or None if prefix is malformed
+        :rtype: float"""
+        try:
+            month = self.months[prefix[2:5]]
+            return (datetime.datetime(2000 + int(prefix[5:7]), month, int(prefix[0:2]), 
+                                      int(prefix[8:10]), int(prefix[11:13]), int(prefix[14:16])) - self.epoch).total_seconds()
+        except (KeyError, ValueError):
+            return None
+        
+    @classmethod
+    def parseArgument(cls, text) -> float:
+        """Parses a --since or --until argument, in the log's time stamp format (e.g. 13Nov23_14:10:07 or 13Nov23_14:10:07.339), 
+        or ISO 8601 format (e.g. 2023-11-13T14:10:07 or "2023-11-13 14:10").
+        
+        :param text: date and time
+        :type text: str
+        :returns: seconds since 1970-01-01
+        :rtype: float"""
+        try:
+            return (datetime.datetime.fromisoformat(text) - cls.epoch).total_seconds()
+        except ValueError:
+            pass
+        seconds = cls().parse(("[" + text + (".000]" if len(text) == 16 else "]")).encode())
+        if seconds is None:
+            raise argparse.ArgumentTypeError("expected a time such as 13Nov23_14:10:07 or 2023-11-13T14:10:07, not: " + text)
+        return seconds
+
+errorTimeStamps = TimeStampParser() # decodes the time stamp of each ErrorRecord
@@ -0,0 +1,1169 @@
+"""
+William Fissler 2023
+
+LogStatistics.py
+
+Statistics of the records LogParser.py parses: log spam counting, error grouping, the hitch and memory join, memory trends,
+and hitch and memory summaries (exact, or from mergeable quantile sketches).
+"""
+
+import os, re, hashlib, heapq, math, random
+from array import array
+from collections import Counter
+from operator import mul
+
+from LogRecords import HitchMemoryRecord, ErrorGroupRecord, HitchSummaryRecord, MemorySummaryRecord, MemoryTrendRecord
+
+try:
+    import numpy # optional, statistics are computed with the standard library when not installed
+except ImportError:
+    numpy = None
+
+framePattern = re.compile(r'^\s*File "([^"]*)", line \d+, in (\S+)', re.MULTILINE)
+literalPattern = re.compile(r"'[^'\n]*'|\"[^\"\n]*\"|\b0x[0-9a-fA-F]+\b|\d+(?:\.\d+)*")
+spamMessagePattern = re.compile(rb"^\[[^\]\n]*\] - [A-Z]+ - ([^\r\n]*)", re.MULTILINE)
+spamNumberPattern = re.compile(rb"\d+(?:\.\d+)*")
+
+class SpamCounter:
+    """
+    Class for counting how often each log message template (the message with every number masked as "<n>") occurs, to identify log spam.
+    Templates are counted in a Misra-Gries summary of at most capacity templates, so counts are lower bounds, undercounting by at most maxUndercount,
+    and summaries of separate ranges of a log can be merged.
+
+    Attributes
+    ----------
+    capacity : int
+        Defaults to 1000 (maximum number of templates held between blocks).
+    counts{} : int
+        Stores the count (a lower bound) of each template held, by template (bytes).
+    maxUndercount : int
+        Maximum difference between any template's count and its true number of occurrences.
+    recordCount : int
+        Number of log records counted.
+
+    Methods
+    -------
+    __init__(capacity:int)
+        Constructor.
+        Initializes the following attributes:
+        capacity, counts, maxUndercount, recordCount.
+
+    countBlock(block:bytes)
+        Counts the template of every log record starting in block (which must not split a line).
+
+    merge(other:SpamCounter)
+        Adds the counts of other, a summary of a separate range of log records.
+
+    getTemplates(minimum:int) -> list
+        Gets the templates counted at least minimum times.
+        :returns: (template, count) pairs, most frequent first
+        :rtype: list
+
+    getState() -> list
+        Gets the capacity, counts, maximum undercount, and record count, as a JSON serializable list.
+
+    fromState(state:list) -> SpamCounter
+        Restores a summary from getState.
+    """
+    def __init__(self, capacity=1000) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        capacity, counts, maxUndercount, recordCount."""
+        self.capacity = capacity
+        self.counts = Counter()
+        self.maxUndercount = 0
+        self.recordCount = 0
+
+    def countBlock(self, block):
+        """Counts the template of every log record starting in block (which must not split a line).
+        Messages are extracted with a single pass over the block and counted, then (unless most are distinct) only the distinct messages are masked, 
+        so memory held between blocks is bounded by capacity, and within a block by the block size.
+
+        :param block: undecoded log lines
+        :type block: bytes"""
+        messages = spamMessagePattern.findall(block)
+        if messages:
+            self.recordCount += len(messages)
+            messageCounts = Counter(messages)
+            if len(messageCounts) * 2 > len(messages): # mostly distinct messages, mask and count them all at once
+                self.counts.update(spamNumberPattern.sub(b"<n>", b"\n".join(messages)).split(b"\n"))
+            else:
+                templates = spamNumberPattern.sub(b"<n>", b"\n".join(messageCounts)).split(b"\n")
+                counts = self.counts
+                for template, count in zip(templates, messageCounts.values()):
+                    counts[template] += count
+            self.prune()
+
+    def merge(self, other):
+        """Adds the counts of other, a summary of a separate range of log records.
+
+        :param other: summary to merge into this one
+        :type other: SpamCounter"""
+        self.counts.update(other.counts)
+        self.maxUndercount += other.maxUndercount
+        self.recordCount += other.recordCount
+        self.prune()
+
+    def prune(self):
+        """Reduces the templates held to at most capacity, by subtracting the (capacity+1)th largest count from every template."""
+        if len(self.counts) > self.capacity:
+            threshold = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+            self.counts = Counter({template: count - threshold for template, count in self.counts.items() if count > threshold})
+            self.maxUndercount += threshold
+
+    def getTemplates(self, minimum) -> list:
+        """Gets the templates counted at least minimum times.
+
+        :param minimum: minimum count of the templates returned
+        :type minimum: int
+        :returns: (template, count) pairs, most frequent first
+        :rtype: list"""
+        return sorted(((template, count) for template, count in self.counts.items() if count >= minimum),
+                      key=lambda item: (-item[1], item[0]))
+
+    def getState(self) -> list:
+        """Gets the capacity, counts, maximum undercount, and record count, as a JSON serializable list 
+        (templates are decoded with surrogateescape, so undecodable bytes are restored unchanged).
+
+        :rtype: list"""
+        return [self.capacity, [[template.decode('utf-8', errors='surrogateescape'), count] for template, count in self.counts.items()],
+                self.maxUndercount, self.recordCount]
+
+    @classmethod
+    def fromState(cls, state):
+        """Restores a summary from getState.
+
+        :param state: state of a summary
+        :type state: list
+        :rtype: SpamCounter"""
+        capacity, templates, maxUndercount, recordCount = state
+        spamCounter = cls(capacity)
+        spamCounter.counts = Counter({template.encode('utf-8', errors='surrogateescape'): count for template, count in templates})
+        spamCounter.maxUndercount, spamCounter.recordCount = maxUndercount, recordCount
+        return spamCounter
+
+class ErrorGrouper:
+    """
+    Class for grouping error records by a normalized stack signature (error type, callstack frames, and message with literals masked), 
+    so repeated occurrences of an error are reported once, first and last seen at its earliest and latest errors by time stamp.
+
+    Attributes
+    ----------
+    groups{} : list
+        Stores the [error type, message template, occurrences, first log name, first line number, first time stamp, 
+        last log name, last line number, last time stamp, example message (of the first seen)] of each signature, by signature.
+        
+    Methods
+    -------
+    __init__
+        Constructor.
+        Initializes the following attributes:
+        groups.
+        
+    getSignature(record:ErrorRecord) -> tuple
+        Normalizes the callstack of an error record.
+        :returns: (signature, template) - hex digest of the error type, frames, and template, and the message template
+        :rtype: tuple
+        
+    getSeenOrder(logName:str, lineNumber:int, timeStamp:float) -> tuple
+        Gets the key errors are ordered by to find the first and last seen of a group.
+        
+    addRecords(errorList:list)
+        Adds each ErrorRecord in errorList to the group of its signature.
+        
+    addGroups(groups:dict)
+        Combines the groups of a run (e.g. a shard, or an earlier incremental run) with these groups.
+        
+    getGroups() -> list
+        Gets the error groups, most occurrences first.
+        :returns: list of ErrorGroupRecords
+        :rtype: list
+    """
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        groups."""
+        self.groups = {}
+        
+    def getSignature(self, record) -> tuple:
+        """Normalizes the callstack of an error record into a signature.
+        
+        :param record: error record to normalize
+        :type record: ErrorRecord
+        :returns: (signature, template) - hex digest of the error type, frames, and template, and the message template
+        :rtype: tuple"""
+        lines = record.message.split("\n")
+        if record.errorType is not None and len(lines) > 1:
+            message = lines[-1].split(": ", 1)[-1] if lines[-1].startswith(record.errorType) else lines[-1]
+        else:
+            message = lines[0].split(" - ", 1)[-1] # error line, less its level
+        template = literalPattern.sub("<v>", message.strip())
+        frames = [os.path.basename(fileName) + ":" + function for fileName, function in framePattern.findall(record.message)]
+        signature = hashlib.blake2b("\n".join([record.errorType or ""] + frames + [template]).encode(), digest_size=8).hexdigest()
+        return signature, template
+    
+    def getSeenOrder(self, logName, lineNumber, timeStamp) -> tuple:
+        """Gets the key errors are ordered by to find the first and last seen of a group: time stamp, then log file name, and line number 
+        (errors without a time stamp are ordered after those with one).
+        
+        :rtype: tuple"""
+        return (math.inf if timeStamp is None else timeStamp, logName, lineNumber)
+    
+    def addRecords(self, errorList):
+        """Adds each ErrorRecord in errorList to the group of its signature, 
+        replacing the group's first seen (and example message) or last seen error if it is earlier or later.
+        
+        :param errorList: list of ErrorRecords
+        :type errorList: list"""
+        getSeenOrder = self.getSeenOrder
+        for record in errorList:
+            signature, template = self.getSignature(record)
+            group = self.groups.get(signature)
+            if group is None:
+                self.groups[signature] = [record.errorType, template, 1, record.logName, record.lineNumber, record.timeStamp, 
+                                          record.logName, record.lineNumber, record.timeStamp, record.message]
+            else:
+                group[2] += 1
+                seen = getSeenOrder(record.logName, record.lineNumber, record.timeStamp)
+                if seen < getSeenOrder(*group[3:6]):
+                    group[3:6] = record.logName, record.lineNumber, record.timeStamp
+                    group[9] = record.message
+                if seen > getSeenOrder(*group[6:9]):
+                    group[6:9] = record.logName, record.lineNumber, record.timeStamp
+                
+    def addGroups(self, groups):
+        """Combines the groups of a run (e.g. a shard, or an earlier incremental run) with these groups: 
+        occurrences are summed, and a group in both is first and last seen at the earlier first seen and later last seen of the two.
+        
+        :param groups: groups of a run, by signature (see groups)
+        :type groups: dict"""
+        getSeenOrder = self.getSeenOrder
+        for signature, group in groups.items():
+            mergedGroup = self.groups.get(signature)
+            if mergedGroup is None:
+                self.groups[signature] = list(group)
+            else:
+                mergedGroup[2] += group[2]
+                if getSeenOrder(*group[3:6]) < getSeenOrder(*mergedGroup[3:6]):
+                    mergedGroup[3:6] = group[3:6]
+                    mergedGroup[9] = group[9]
+                if getSeenOrder(*group[6:9]) > getSeenOrder(*mergedGroup[6:9]):
+                    mergedGroup[6:9] = group[6:9]
+                
+    def getGroups(self) -> list:
+        """Gets the error groups, most occurrences first (then in the order first seen).
+        
+        :returns: list of ErrorGroupRecords
+        :rtype: list"""
+        return sorted((ErrorGroupRecord(signature, *group) for signature, group in self.groups.items()), 
+                      key=lambda group: (-group.occurrences, self.getSeenOrder(group.firstLogName, group.firstLineNumber, group.firstTimeStamp)))
+
+class HitchMemoryJoiner:
+    """
+    Class for attaching the nearest preceding memory sample of the same log file to each hitch, by a sorted merge of records in line order.
+    The latest sample of each log file is carried from one range to the next (and across incremental runs, see resumeLog), 
+    so ranges are joined exactly as if the whole log file had been parsed at once.
+
+    Attributes
+    ----------
+    lastSamples{} : tuple
+        Stores the (line number, footprint, footprint delta, run time) of the latest memory sample of each log file being parsed, by log file name.
+
+    Methods
+    -------
+    __init__
+        Constructor.
+        Initializes the following attributes:
+        lastSamples.
+
+    join(hitchList:list, memoryList:list) -> list
+        Attaches the nearest preceding memory sample to each hitch of a range of a log file.
+        :returns: list of HitchMemoryRecords
+        :rtype: list
+
+    resumeLog(logName:str, sample:tuple)
+        Sets the latest memory sample of logName, before the data following it is parsed.
+
+    finishLog(logName:str) -> tuple
+        Forgets the latest memory sample of logName, once all of it has been parsed.
+        :returns: sample
+        :rtype: tuple
+    """
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        lastSamples."""
+        self.lastSamples = {}
+
+    def join(self, hitchList, memoryList) -> list:
+        """Attaches the nearest preceding memory sample (its line number, footprint, change in footprint from the sample before it, and run time)
+        to each hitch of a range of a log file, by a sorted merge of the two lists. A hitch logged before any memory sample has no sample attached.
+
+        :param hitchList: HitchRecords of one range of a log file, in line order, with line numbers relative to the start of the log file
+        :type hitchList: list
+        :param memoryList: MemoryRecords of the same range, in line order, with line numbers relative to the start of the log file
+        :type memoryList: list
+        :returns: list of HitchMemoryRecords, in line order
+        :rtype: list"""
+        if not hitchList and not memoryList:
+            return []
+        logName = (hitchList or memoryList)[0].logName
+        sample = self.lastSamples.get(logName, (None, None, None, None))
+        hitchMemoryList = []
+        memoryIndex, memoryCount = 0, len(memoryList)
+        for hitch in hitchList:
+            while memoryIndex < memoryCount and memoryList[memoryIndex].lineNumber < hitch.lineNumber:
+                memory = memoryList[memoryIndex]
+                sample = (memory.lineNumber, memory.footprint, None if sample[1] is None else round(memory.footprint - sample[1], 6), memory.runTime)
+                memoryIndex += 1
+            hitchMemoryList.append(HitchMemoryRecord(hitch.logName, hitch.lineNumber, hitch.thread, hitch.duration, *sample))
+        if memoryIndex < memoryCount: # only the last two samples after the last hitch are needed for the next range
+            previousFootprint = memoryList[-2].footprint if memoryCount - memoryIndex > 1 else sample[1]
+            memory = memoryList[-1]
+            sample = (memory.lineNumber, memory.footprint, None if previousFootprint is None else round(memory.footprint - previousFootprint, 6), 
+                      memory.runTime)
+        self.lastSamples[logName] = sample
+        return hitchMemoryList
+
+    def resumeLog(self, logName, sample):
+        """Sets the latest memory sample of logName, before the data following it is parsed (e.g. from the checkpoint of an earlier run).
+
+        :param logName: log file name
+        :type logName: str
+        :param sample: (line number, footprint, footprint delta, run time) of the latest memory sample, or None if no sample precedes the data
+        :type sample: tuple"""
+        if sample is None:
+            self.lastSamples.pop(logName, None)
+        else:
+            self.lastSamples[logName] = tuple(sample)
+
+    def finishLog(self, logName) -> tuple:
+        """Forgets the latest memory sample of logName, once all of it has been parsed.
+
+        :param logName: log file name
+        :type logName: str
+        :returns: sample - (line number, footprint, footprint delta, run time) of the latest memory sample, or None if there was none
+        :rtype: tuple"""
+        return self.lastSamples.pop(logName, None)
+
+class MemoryTrend:
+    """
+    Class for analyzing the memory footprints of a log file for growth (e.g. leaks) as they are parsed, in constant memory.
+    Keeps the least squares slope and its R squared from mergeable running moments, the peak and trough footprints, 
+    and the change points of a two sided CUSUM, so a steady leak shows as repeated upward change points, and a single step as one.
+
+    Attributes
+    ----------
+    warmup : int
+        Defaults to 30 (number of footprints the baseline is taken from).
+    allowance : float
+        Defaults to 0.5 (standard deviations from the baseline a footprint may drift without accumulating).
+    threshold : float
+        Defaults to 5 (accumulated standard deviations at which a change point is recorded).
+    minimumSigma : float
+        Defaults to 0.5 (MiB, the smallest standard deviation used, so flat baselines do not turn noise into change points).
+    count : int
+        Number of footprints added.
+    meanTime, meanFootprint : float
+        Running means of the run times and footprints.
+    timeMoment, footprintMoment, coMoment : float
+        Running sums of squared deviations of the run times and footprints, and of the products of their deviations.
+    firstRunTime, firstFootprint, lastRunTime, lastFootprint : float
+        First and last footprint added, and their run times.
+    peak, peakRunTime, trough, troughRunTime : float
+        Highest and lowest footprint, and the run times they were first recorded at.
+    baselineCount, baselineMean, baselineMoment, sigma : float
+        Number, mean, and sum of squared deviations of the baseline footprints, and their standard deviation once warmup footprints are added.
+    upperSum, lowerSum, upperStart, lowerStart : float
+        Accumulated upward and downward standardized excess, and the run times each last rose from zero.
+    changePoints : int
+        Number of change points detected.
+    firstChangeRunTime, lastChangeRunTime : float
+        Run times of the first and latest change points, or None.
+    lastChangeDirection : str
+        "up" or "down", the direction of the latest change point, or None.
+
+    Methods
+    -------
+    __init__
+        Constructor.
+        Initializes the following attributes:
+        warmup, allowance, threshold, minimumSigma, and the moments, extremes, and CUSUM state.
+
+    add(runTimes:tuple, footprints:tuple)
+        Adds the footprints of a chunk of a log file, in the order recorded.
+
+    combineMoments(count:int, meanTime:float, meanFootprint:float, timeMoment:float, footprintMoment:float, coMoment:float)
+        Combines the moments of a separate range of footprints with the running moments.
+
+    merge(other:MemoryTrend)
+        Adds the trend of a later range of the same log file.
+
+    getState() -> dict
+        Gets the state of the trend, as a JSON serializable dictionary.
+
+    fromState(state:dict) -> MemoryTrend
+        Restores a trend from getState.
+
+    getRecord(logName:str) -> MemoryTrendRecord
+        Summarizes the trend of logName.
+    """
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        warmup, allowance, threshold, minimumSigma, and the moments, extremes, and CUSUM state."""
+        self.warmup = 30
+        self.allowance = 0.5
+        self.threshold = 5.0
+        self.minimumSigma = 0.5
+        self.count = 0
+        self.meanTime = 0.0
+        self.meanFootprint = 0.0
+        self.timeMoment = 0.0
+        self.footprintMoment = 0.0
+        self.coMoment = 0.0
+        self.firstRunTime = self.firstFootprint = self.lastRunTime = self.lastFootprint = None
+        self.peak, self.peakRunTime = -math.inf, None
+        self.trough, self.troughRunTime = math.inf, None
+        self.baselineCount = 0
+        self.baselineMean = 0.0
+        self.baselineMoment = 0.0
+        self.sigma = None
+        self.upperSum = self.lowerSum = 0.0
+        self.upperStart = self.lowerStart = None
+        self.changePoints = 0
+        self.firstChangeRunTime = self.lastChangeRunTime = None
+        self.lastChangeDirection = None
+
+    def add(self, runTimes, footprints):
+        """Adds the footprints of a chunk of a log file, in the order recorded.
+        The moments and extremes of the chunk are computed a column at a time, and only the CUSUM visits each footprint.
+
+        :param runTimes: run times the footprints were recorded at
+        :type runTimes: tuple
+        :param footprints: footprints (MiB)
+        :type footprints: tuple"""
+        count = len(footprints)
+        if count == 0:
+            return
+        meanTime = math.fsum(runTimes) / count
+        meanFootprint = math.fsum(footprints) / count
+        timeDeviations = [runTime - meanTime for runTime in runTimes]
+        footprintDeviations = [footprint - meanFootprint for footprint in footprints]
+        self.combineMoments(count, meanTime, meanFootprint, sum(map(mul, timeDeviations, timeDeviations)),
+                            sum(map(mul, footprintDeviations, footprintDeviations)), sum(map(mul, timeDeviations, footprintDeviations)))
+        if self.firstRunTime is None:
+            self.firstRunTime, self.firstFootprint = runTimes[0], footprints[0]
+        self.lastRunTime, self.lastFootprint = runTimes[-1], footprints[-1]
+        peak = max(footprints)
+        if peak > self.peak:
+            self.peak, self.peakRunTime = peak, runTimes[footprints.index(peak)]
+        trough = min(footprints)
+        if trough < self.trough:
+            self.trough, self.troughRunTime = trough, runTimes[footprints.index(trough)]
+
+        # two sided CUSUM, with the state held in locals for the loop
+        warmup, allowance, threshold = self.warmup, self.allowance, self.threshold
+        baselineCount, baselineMean, baselineMoment, sigma = self.baselineCount, self.baselineMean, self.baselineMoment, self.sigma
+        upperSum, lowerSum, upperStart, lowerStart = self.upperSum, self.lowerSum, self.upperStart, self.lowerStart
+        for runTime, footprint in zip(runTimes, footprints):
+            if baselineCount < warmup:
+                baselineCount += 1
+                delta = footprint - baselineMean
+                baselineMean += delta / baselineCount
+                baselineMoment += delta * (footprint - baselineMean)
+                if baselineCount == warmup:
+                    sigma = max(math.sqrt(baselineMoment / (warmup - 1)), self.minimumSigma)
+                continue
+            deviation = (footprint - baselineMean) / sigma
+            if upperSum == 0:
+                upperStart = runTime
+            upperSum = max(0.0, upperSum + deviation - allowance)
+            if lowerSum == 0:
+                lowerStart = runTime
+            lowerSum = max(0.0, lowerSum - deviation - allowance)
+            if upperSum > threshold or lowerSum > threshold:
+                self.lastChangeDirection, self.lastChangeRunTime = ("up", upperStart) if upperSum > threshold else ("down", lowerStart)
+                if self.firstChangeRunTime is None:
+                    self.firstChangeRunTime = self.lastChangeRunTime
+                self.changePoints += 1
+                baselineCount, baselineMean, baselineMoment = 0, 0.0, 0.0 # a new baseline from the footprints after the shift
+                upperSum = lowerSum = 0.0
+        self.baselineCount, self.baselineMean, self.baselineMoment, self.sigma = baselineCount, baselineMean, baselineMoment, sigma
+        self.upperSum, self.lowerSum, self.upperStart, self.lowerStart = upperSum, lowerSum, upperStart, lowerStart
+
+    def combineMoments(self, count, meanTime, meanFootprint, timeMoment, footprintMoment, coMoment):
+        """Combines the moments of a separate range of footprints with the running moments.
+
+        :param count: number of footprints in the range
+        :type count: int
+        :param meanTime: mean run time of the range
+        :type meanTime: float
+        :param meanFootprint: mean footprint of the range
+        :type meanFootprint: float
+        :param timeMoment: sum of squared run time deviations of the range
+        :type timeMoment: float
+        :param footprintMoment: sum of squared footprint deviations of the range
+        :type footprintMoment: float
+        :param coMoment: sum of products of run time and footprint deviations of the range
+        :type coMoment: float"""
+        total = self.count + count
+        timeDelta = meanTime - self.meanTime
+        footprintDelta = meanFootprint - self.meanFootprint
+        weight = self.count * count / total
+        self.timeMoment += timeMoment + timeDelta * timeDelta * weight
+        self.footprintMoment += footprintMoment + footprintDelta * footprintDelta * weight
+        self.coMoment += coMoment + timeDelta * footprintDelta * weight
+        self.meanTime += timeDelta * count / total
+        self.meanFootprint += footprintDelta * count / total
+        self.count = total
+
+    def merge(self, other):
+        """Adds the trend of a later range of the same log file (e.g. parsed by another shard).
+        The CUSUM continues from the state of other, and its change points are added.
+
+        :param other: trend to merge into this one
+        :type other: MemoryTrend"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return
+        self.combineMoments(other.count, other.meanTime, other.meanFootprint, other.timeMoment, other.footprintMoment, other.coMoment)
+        self.lastRunTime, self.lastFootprint = other.lastRunTime, other.lastFootprint
+        if other.peak > self.peak:
+            self.peak, self.peakRunTime = other.peak, other.peakRunTime
+        if other.trough < self.trough:
+            self.trough, self.troughRunTime = other.trough, other.troughRunTime
+        self.baselineCount, self.baselineMean, self.baselineMoment, self.sigma = other.baselineCount, other.baselineMean, other.baselineMoment, other.sigma
+        self.upperSum, self.lowerSum, self.upperStart, self.lowerStart = other.upperSum, other.lowerSum, other.upperStart, other.lowerStart
+        if other.changePoints:
+            self.changePoints += other.changePoints
+            if self.firstChangeRunTime is None:
+                self.firstChangeRunTime = other.firstChangeRunTime
+            self.lastChangeRunTime, self.lastChangeDirection = other.lastChangeRunTime, other.lastChangeDirection
+
+    def getState(self) -> dict:
+        """Gets the state of the trend, as a JSON serializable dictionary.
+
+        :rtype: dict"""
+        return dict(self.__dict__)
+
+    @classmethod
+    def fromState(cls, state):
+        """Restores a trend from getState.
+
+        :param state: state of a trend
+        :type state: dict
+        :rtype: MemoryTrend"""
+        trend = cls()
+        trend.__dict__.update(state)
+        return trend
+
+    def getRecord(self, logName) -> MemoryTrendRecord:
+        """Summarizes the trend of logName. The slope and R squared are None when the run times (or for R squared, the footprints) do not vary.
+
+        :param logName: log file name
+        :type logName: str
+        :rtype: MemoryTrendRecord"""
+        slope = rSquared = None
+        if self.timeMoment > 0:
+            slope = self.coMoment / self.timeMoment
+            if self.footprintMoment > 0:
+                rSquared = self.coMoment * self.coMoment / (self.timeMoment * self.footprintMoment)
+        return MemoryTrendRecord(logName, self.count, self.firstRunTime, self.lastRunTime, self.firstFootprint, self.lastFootprint,
+                                 slope, rSquared, self.peak, self.peakRunTime, self.trough, self.troughRunTime,
+                                 self.changePoints, self.firstChangeRunTime, self.lastChangeRunTime, self.lastChangeDirection)
+
+class RecordStatistics:
+    """
+    Class for collecting the numeric fields of hitch and memory records into typed array('d') columns, and summarizing them 
+    per log file, thread, and machine class, vectorized with NumPy when it is installed.
+
+    Attributes
+    ----------
+    hitchDurations{} : array
+        Stores the hitch durations (ms) of each group, by (group by, group), where group by is "Log" or "Thread".
+    memoryFootprints{} : array
+        Stores the memory footprints (MiB) of each log file, by log file name.
+    memoryRunTimes{} : array
+        Stores the run times the memory footprints were recorded at, by log file name.
+    memoryTrends{} : MemoryTrend
+        Stores the memory growth trend of each log file, updated as its footprints are added, by log file name.
+    machineClasses{} : str
+        Stores the machine class (see SystemInfoRecord.machineClass) of each log file whose machine information was found, by log file name.
+
+    Methods
+    -------
+    __init__
+        Constructor.
+        Initializes the following attributes:
+        hitchDurations, memoryFootprints, memoryRunTimes, memoryTrends, machineClasses.
+
+    addRecords(hitchList:list, memoryList:list)
+        Appends the fields of each HitchRecord and MemoryRecord to the columns of their groups.
+
+    getColumn(columns:dict, key) -> array
+        Gets the column of key in columns, adding an empty column if it does not exist yet.
+
+    getTrend(logName:str) -> MemoryTrend
+        Gets the memory trend of logName, adding a new trend if it does not exist yet.
+
+    summarize(values:array) -> tuple
+        Computes the summary statistics of a column.
+        :returns: (count, minimum, maximum, mean, p50, p90, p99)
+        :rtype: tuple
+
+    groupByMachine(columns:dict) -> dict
+        Concatenates the columns of the log files of each machine class.
+
+    getHitchSummaries() -> list
+        Summarizes the hitch durations of each log file, each thread, each machine class, and all log files.
+        :returns: list of HitchSummaryRecords
+        :rtype: list
+
+    getMemorySummaries() -> list
+        Summarizes the memory footprints of each log file, each machine class, and all log files.
+        :returns: list of MemorySummaryRecords
+        :rtype: list
+
+    getMemoryTrends() -> list
+        Summarizes the memory growth trend of each log file.
+        :returns: list of MemoryTrendRecords
+        :rtype: list
+    """
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        hitchDurations, memoryFootprints, memoryRunTimes, memoryTrends, machineClasses."""
+        self.hitchDurations = {}
+        self.memoryFootprints = {}
+        self.memoryRunTimes = {}
+        self.memoryTrends = {}
+        self.machineClasses = {}
+
+    def addRecords(self, hitchList, memoryList):
+        """Appends the fields of each HitchRecord and MemoryRecord to the columns of their groups, and adds the footprints to the trend of their log file.
+        Records are transposed into columns first, so the records of a chunk (which share a log file, and usually a thread) 
+        are appended to each column at once.
+        
+        :param hitchList: list of HitchRecords
+        :type hitchList: list
+        :param memoryList: list of MemoryRecords
+        :type memoryList: list"""
+        if hitchList:
+            logNames, lineNumbers, threads, durations = zip(*hitchList)
+            for groupBy, groups in (("Log", logNames), ("Thread", threads)):
+                if groups.count(groups[0]) == len(groups):
+                    self.getColumn(self.hitchDurations, (groupBy, groups[0])).extend(durations)
+                else:
+                    for group, duration in zip(groups, durations):
+                        self.getColumn(self.hitchDurations, (groupBy, group)).append(duration)
+        if memoryList:
+            logNames, lineNumbers, footprints, runTimes = zip(*memoryList)
+            if logNames.count(logNames[0]) == len(logNames):
+                self.getColumn(self.memoryFootprints, logNames[0]).extend(footprints)
+                self.getColumn(self.memoryRunTimes, logNames[0]).extend(runTimes)
+                self.getTrend(logNames[0]).add(runTimes, footprints)
+            else:
+                logColumns = {}
+                for logName, footprint, runTime in zip(logNames, footprints, runTimes):
+                    self.getColumn(self.memoryFootprints, logName).append(footprint)
+                    self.getColumn(self.memoryRunTimes, logName).append(runTime)
+                    logRunTimes, logFootprints = logColumns.setdefault(logName, ([], []))
+                    logRunTimes.append(runTime)
+                    logFootprints.append(footprint)
+                for logName, (logRunTimes, logFootprints) in logColumns.items():
+                    self.getTrend(logName).add(logRunTimes, logFootprints)
+
+    def getTrend(self, logName) -> MemoryTrend:
+        """Gets the memory trend of logName, adding a new trend if it does not exist yet."""
+        trend = self.memoryTrends.get(logName)
+        if trend is None:
+            trend = self.memoryTrends[logName] = MemoryTrend()
+        return trend
+
+    def getColumn(self, columns, key) -> array:
+        """Gets the column of key in columns, adding an empty column if it does not exist yet."""
+        column = columns.get(key)
+        if column is None:
+            column = columns[key] = array('d')
+        return column
+
+    def summarize(self, values) -> tuple:
+        """Computes the summary statistics of a column.
+
+        :param values: column of at least one value
+        :type values: array
+        :returns: (count, minimum, maximum, mean, p50, p90, p99)
+        :rtype: tuple"""
+        if numpy is not None:
+            column = numpy.frombuffer(values, dtype=numpy.float64) # shares the array's memory, rather than copying it
+            p50, p90, p99 = numpy.percentile(column, [50, 90, 99])
+            return len(column), float(column.min()), float(column.max()), float(column.mean()), float(p50), float(p90), float(p99)
+
+        column = sorted(values)
+        def percentile(q):
+            rank = (len(column) - 1) * q / 100
+            lower = math.floor(rank)
+            upper = min(lower + 1, len(column) - 1)
+            return column[lower] + (column[upper] - column[lower]) * (rank - lower)
+        return len(column), column[0], column[-1], math.fsum(column) / len(column), percentile(50), percentile(90), percentile(99)
+
+    def groupByMachine(self, columns) -> dict:
+        """Concatenates the columns of the log files of each machine class.
+
+        :param columns: columns by log file name
+        :type columns: dict
+        :returns: columns by machine class, in the order the machine classes were first parsed
+        :rtype: dict"""
+        machineColumns = {}
+        for logName, column in columns.items():
+            machineClass = self.machineClasses.get(logName)
+            if machineClass is not None:
+                self.getColumn(machineColumns, machineClass).extend(column)
+        return machineColumns
+
+    def getHitchSummaries(self) -> list:
+        """Summarizes the hitch durations of each log file, each thread, each machine class, and all log files.
+
+        :returns: list of HitchSummaryRecords, log files first, in the order they were parsed
+        :rtype: list"""
+        hitchSummaryList = []
+        allDurations = array('d')
+        for groupBy in ("Log", "Thread"):
+            for (columnGroupBy, group), durations in self.hitchDurations.items():
+                if columnGroupBy == groupBy:
+                    hitchSummaryList.append(HitchSummaryRecord(groupBy, group, *self.summarize(durations)))
+                    if groupBy == "Log":
+                        allDurations.extend(durations)
+        logDurations = {group: durations for (groupBy, group), durations in self.hitchDurations.items() if groupBy == "Log"}
+        for machineClass, durations in self.groupByMachine(logDurations).items():
+            hitchSummaryList.append(HitchSummaryRecord("Machine", machineClass, *self.summarize(durations)))
+        if allDurations:
+            hitchSummaryList.append(HitchSummaryRecord("All", "All Logs", *self.summarize(allDurations)))
+        return hitchSummaryList
+
+    def getMemorySummaries(self) -> list:
+        """Summarizes the memory footprints of each log file, each machine class, and all log files.
+        The final run time is the latest run time a footprint was recorded at.
+
+        :returns: list of MemorySummaryRecords, in the order the log files were parsed
+        :rtype: list"""
+        memorySummaryList = []
+        allFootprints = array('d')
+        for logName, footprints in self.memoryFootprints.items():
+            memorySummaryList.append(MemorySummaryRecord("Log", logName, *self.summarize(footprints), max(self.memoryRunTimes[logName])))
+            allFootprints.extend(footprints)
+        machineRunTimes = self.groupByMachine(self.memoryRunTimes)
+        for machineClass, footprints in self.groupByMachine(self.memoryFootprints).items():
+            memorySummaryList.append(MemorySummaryRecord("Machine", machineClass, *self.summarize(footprints), max(machineRunTimes[machineClass])))
+        if allFootprints:
+            memorySummaryList.append(MemorySummaryRecord("All", "All Logs", *self.summarize(allFootprints),
+                                                         max(max(runTimes) for runTimes in self.memoryRunTimes.values())))
+        return memorySummaryList
+
+    def getMemoryTrends(self) -> list:
+        """Summarizes the memory growth trend (slope, extremes, and change points, see MemoryTrend) of each log file.
+
+        :returns: list of MemoryTrendRecords, in the order the log files were parsed
+        :rtype: list"""
+        return [trend.getRecord(logName) for logName, trend in self.memoryTrends.items()]
+
+class QuantileSketch:
+    """
+    Class for summarizing a column of values in bounded memory, as a KLL quantile sketch that can be merged with sketches of other columns.
+    Any value's rank is off by at most about 0.33% of the count for the default k=1024 (exact while no more than k values are added), 
+    and compaction is seeded, so the same values always give the same sketch.
+
+    Attributes
+    ----------
+    k : int
+        Defaults to 1024 (capacity of the top level, trading memory for accuracy).
+    levels : list
+        Stores the values held at each level, lowest (unit weight) first.
+    maxSize : int
+        Total capacity of the levels, beyond which they are compacted.
+    count : int
+        Number of values added.
+    minimum, maximum : float
+        Smallest and largest value added.
+    total : float
+        Sum of the values added.
+    random : random.Random
+        Seeded source of the compaction offsets.
+
+    Methods
+    -------
+    __init__(k:int)
+        Constructor.
+        Initializes the following attributes:
+        k, levels, maxSize, count, minimum, maximum, total, random.
+
+    capacity(level:int) -> int
+        Gets the number of values level holds before it is compacted.
+
+    extend(values:array)
+        Adds a column of values.
+
+    merge(other:QuantileSketch)
+        Adds the values of other, a sketch of a separate column.
+
+    compress()
+        Compacts the lowest full levels until the values held fit within maxSize.
+
+    quantile(q:float) -> float
+        Estimates the qth percentile, linearly interpolated between the closest ranks.
+
+    summarize() -> tuple
+        Computes the summary statistics of the values added.
+        :returns: (count, minimum, maximum, mean, p50, p90, p99)
+        :rtype: tuple
+
+    getState() -> dict
+        Gets the state of the sketch, as a JSON serializable dictionary.
+
+    fromState(state:dict) -> QuantileSketch
+        Restores a sketch from getState.
+    """
+    def __init__(self, k=1024) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        k, levels, maxSize, count, minimum, maximum, total, random."""
+        self.k = k
+        self.levels = [[]]
+        self.maxSize = self.capacity(0)
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.total = 0.0
+        self.random = random.Random(0)
+
+    def capacity(self, level) -> int:
+        """Gets the number of values level holds before it is compacted (k for the top level, 2/3 of the level above for the others, at least 2).
+
+        :param level: level, 0 being the lowest
+        :type level: int
+        :rtype: int"""
+        return max(int(math.ceil(self.k * (2 / 3) ** (len(self.levels) - level - 1))), 2)
+
+    def extend(self, values):
+        """Adds a column of values.
+
+        :param values: values to add
+        :type values: array"""
+        if not values:
+            return
+        self.count += len(values)
+        self.minimum = min(self.minimum, min(values))
+        self.maximum = max(self.maximum, max(values))
+        self.total += math.fsum(values)
+        self.levels[0].extend(values)
+        self.compress()
+
+    def merge(self, other):
+        """Adds the values of other, a sketch of a separate column.
+
+        :param other: sketch to merge into this one
+        :type other: QuantileSketch"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        self.maxSize = sum(self.capacity(level) for level in range(len(self.levels)))
+        for level, values in zip(self.levels, other.levels):
+            level.extend(values)
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.total += other.total
+        self.compress()
+
+    def compress(self):
+        """Compacts the lowest full level (promoting every other value of it, once sorted, to the level above)
+        until the values held fit within maxSize, adding a level when the top level is compacted.
+        An odd value out stays at its level, so the weights of the values held always add up to count."""
+        size = sum(len(values) for values in self.levels)
+        while size > self.maxSize:
+            for level, values in enumerate(self.levels):
+                if len(values) >= self.capacity(level):
+                    if level + 1 == len(self.levels):
+                        self.levels.append([])
+                        self.maxSize = sum(self.capacity(height) for height in range(len(self.levels)))
+                    values.sort()
+                    remainder = [values.pop()] if len(values) % 2 else []
+                    self.levels[level + 1].extend(values[self.random.getrandbits(1)::2])
+                    self.levels[level] = remainder
+                    break
+            size = sum(len(values) for values in self.levels)
+
+    def quantile(self, q) -> float:
+        """Estimates the qth percentile, linearly interpolated between the closest ranks (as RecordStatistics.summarize does),
+        each value held counting for its weight. Exact while no values have been compacted.
+
+        :param q: percentile, 0 to 100
+        :type q: float
+        :rtype: float"""
+        weighted = sorted((value, 1 << level) for level, values in enumerate(self.levels) for value in values)
+        rank = (self.count - 1) * q / 100
+        lower = math.floor(rank)
+        upper = min(lower + 1, self.count - 1)
+        lowerValue = upperValue = None
+        position = 0
+        for value, weight in weighted:
+            position += weight
+            if lowerValue is None and lower < position:
+                lowerValue = value
+            if upper < position:
+                upperValue = value
+                break
+        return lowerValue + (upperValue - lowerValue) * (rank - lower)
+
+    def summarize(self) -> tuple:
+        """Computes the summary statistics of the values added, in the form of RecordStatistics.summarize
+        (the count, minimum, maximum, and mean are exact, the percentiles estimated).
+
+        :returns: (count, minimum, maximum, mean, p50, p90, p99)
+        :rtype: tuple"""
+        return self.count, self.minimum, self.maximum, self.total / self.count, self.quantile(50), self.quantile(90), self.quantile(99)
+
+    def getState(self) -> dict:
+        """Gets the state of the sketch, as a JSON serializable dictionary.
+
+        :rtype: dict"""
+        return {"k": self.k, "count": self.count, "minimum": self.minimum, "maximum": self.maximum, "total": self.total, "levels": self.levels}
+
+    @classmethod
+    def fromState(cls, state):
+        """Restores a sketch from getState.
+
+        :param state: state of a sketch
+        :type state: dict
+        :rtype: QuantileSketch"""
+        sketch = cls(state["k"])
+        sketch.levels = [list(values) for values in state["levels"]]
+        sketch.maxSize = sum(sketch.capacity(level) for level in range(len(sketch.levels)))
+        sketch.count, sketch.minimum, sketch.maximum, sketch.total = state["count"], state["minimum"], state["maximum"], state["total"]
+        sketch.random = random.Random(sketch.count)
+        return sketch
+
+class SketchStatistics:
+    """
+    Class for summarizing hitch and memory statistics as quantile sketches, in the form of RecordStatistics, 
+    so it can stand in for a LogParser's statistics when partial results are merged, or when streaming (or following) log files in bounded memory.
+
+    Attributes
+    ----------
+    hitchSketches{} : QuantileSketch
+        Stores the sketch of the hitch durations (ms) of each group, by (group by, group), where group by is "Log" or "Thread".
+    memorySketches{} : QuantileSketch
+        Stores the sketch of the memory footprints (MiB) of each log file, by log file name.
+    memoryRunTimes{} : float
+        Stores the latest run time a memory footprint was recorded at, by log file name.
+    memoryTrends{} : MemoryTrend
+        Stores the memory growth trend of each log file, by log file name (the trends of a log file parsed by several runs merged in the order added).
+    machineClasses{} : str
+        Stores the machine class (see SystemInfoRecord.machineClass) of each log file whose machine information was found, by log file name.
+
+    Methods
+    -------
+    __init__
+        Constructor.
+        Initializes the following attributes:
+        hitchSketches, memorySketches, memoryRunTimes, memoryTrends, machineClasses.
+
+    addRecords(hitchList:list, memoryList:list)
+        Adds the fields of each HitchRecord and MemoryRecord to the sketches of their groups.
+
+    getSketch(sketches:dict, key) -> QuantileSketch
+        Gets the sketch of key in sketches, adding an empty sketch if it does not exist yet.
+
+    addRecordStatistics(statistics:RecordStatistics)
+        Sketches the columns of a run's RecordStatistics.
+
+    addSketch(sketches:dict, key, sketch:QuantileSketch)
+        Adds sketch as the sketch of key in sketches, or merges it into the sketch of key.
+
+    addTrend(logName:str, trend:MemoryTrend)
+        Adds trend as the memory trend of logName, or merges it into the trend of logName.
+
+    getState() -> dict
+        Gets the sketches, run times, memory trends, and machine classes, as a JSON serializable dictionary.
+
+    addState(state:dict)
+        Merges the sketches, run times, memory trends, and machine classes of a run, from getState.
+
+    mergeSketches(sketches:iterable) -> QuantileSketch
+        Merges sketches into a new sketch.
+
+    getHitchSummaries() -> list
+        Summarizes the hitch durations of each log file, each thread, each machine class, and all log files.
+
+    getMemorySummaries() -> list
+        Summarizes the memory footprints of each log file, each machine class, and all log files.
+
+    getMemoryTrends() -> list
+        Summarizes the memory growth trend of each log file.
+    """
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        hitchSketches, memorySketches, memoryRunTimes, memoryTrends, machineClasses."""
+        self.hitchSketches = {}
+        self.memorySketches = {}
+        self.memoryRunTimes = {}
+        self.memoryTrends = {}
+        self.machineClasses = {}
+
+    def addRecords(self, hitchList, memoryList):
+        """Adds the fields of each HitchRecord and MemoryRecord to the sketches of their groups, and the footprints to the trend of their log file.
+        The values of each group in a chunk are extended into its sketch at once, as RecordStatistics appends them to its columns.
+        
+        :param hitchList: list of HitchRecords
+        :type hitchList: list
+        :param memoryList: list of MemoryRecords
+        :type memoryList: list"""
+        if hitchList:
+            logNames, lineNumbers, threads, durations = zip(*hitchList)
+            for groupBy, groups in (("Log", logNames), ("Thread", threads)):
+                if groups.count(groups[0]) == len(groups):
+                    self.getSketch(self.hitchSketches, (groupBy, groups[0])).extend(durations)
+                else:
+                    groupDurations = {}
+                    for group, duration in zip(groups, durations):
+                        groupDurations.setdefault(group, []).append(duration)
+                    for group, values in groupDurations.items():
+                        self.getSketch(self.hitchSketches, (groupBy, group)).extend(values)
+        if memoryList:
+            logColumns = {}
+            for logName, lineNumber, footprint, runTime in memoryList:
+                logRunTimes, logFootprints = logColumns.setdefault(logName, ([], []))
+                logRunTimes.append(runTime)
+                logFootprints.append(footprint)
+            for logName, (logRunTimes, logFootprints) in logColumns.items():
+                self.getSketch(self.memorySketches, logName).extend(logFootprints)
+                self.memoryRunTimes[logName] = max(self.memoryRunTimes.get(logName, -math.inf), max(logRunTimes))
+                trend = self.memoryTrends.get(logName)
+                if trend is None:
+                    trend = self.memoryTrends[logName] = MemoryTrend()
+                trend.add(logRunTimes, logFootprints)
+
+    def getSketch(self, sketches, key) -> QuantileSketch:
+        """Gets the sketch of key in sketches, adding an empty sketch if it does not exist yet."""
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = QuantileSketch()
+        return sketch
+
+    def addRecordStatistics(self, statistics):
+        """Sketches the columns of a run's RecordStatistics, merging them with any sketches of the same groups.
+
+        :param statistics: statistics collected by a run
+        :type statistics: RecordStatistics"""
+        for key, durations in statistics.hitchDurations.items():
+            sketch = QuantileSketch()
+            sketch.extend(durations)
+            self.addSketch(self.hitchSketches, key, sketch)
+        for logName, footprints in statistics.memoryFootprints.items():
+            sketch = QuantileSketch()
+            sketch.extend(footprints)
+            self.addSketch(self.memorySketches, logName, sketch)
+            self.memoryRunTimes[logName] = max(self.memoryRunTimes.get(logName, -math.inf), max(statistics.memoryRunTimes[logName]))
+        for logName, trend in statistics.memoryTrends.items():
+            self.addTrend(logName, MemoryTrend.fromState(trend.getState()))
+        self.machineClasses.update(statistics.machineClasses)
+
+    def addSketch(self, sketches, key, sketch):
+        """Adds sketch as the sketch of key in sketches, or merges it into the sketch of key if there is one."""
+        if key in sketches:
+            sketches[key].merge(sketch)
+        else:
+            sketches[key] = sketch
+
+    def addTrend(self, logName, trend):
+        """Adds trend as the memory trend of logName, or merges it into the trend of logName if there is one."""
+        if logName in self.memoryTrends:
+            self.memoryTrends[logName].merge(trend)
+        else:
+            self.memoryTrends[logName] = trend
+
+    def getState(self) -> dict:
+        """Gets the sketches, run times, memory trends, and machine classes, as a JSON serializable dictionary.
+
+        :rtype: dict"""
+        return {"hitch": [[groupBy, group, sketch.getState()] for (groupBy, group), sketch in self.hitchSketches.items()],
+                "memory": [[logName, sketch.getState(), self.memoryRunTimes[logName]] for logName, sketch in self.memorySketches.items()],
+                "trends": [[logName, trend.getState()] for logName, trend in self.memoryTrends.items()],
+                "machineClasses": self.machineClasses}
+
+    def addState(self, state):
+        """Merges the sketches, run times, memory trends, and machine classes of a run, from getState.
+
+        :param state: statistics of a run
+        :type state: dict"""
+        for groupBy, group, sketchState in state["hitch"]:
+            self.addSketch(self.hitchSketches, (groupBy, group), QuantileSketch.fromState(sketchState))
+        for logName, sketchState, runTime in state["memory"]:
+            self.addSketch(self.memorySketches, logName, QuantileSketch.fromState(sketchState))
+            self.memoryRunTimes[logName] = max(self.memoryRunTimes.get(logName, -math.inf), runTime)
+        for logName, trendState in state.get("trends", []): # absent from partial results written before memory trends
+            self.addTrend(logName, MemoryTrend.fromState(trendState))
+        self.machineClasses.update(state["machineClasses"])
+
+    def mergeSketches(self, sketches) -> QuantileSketch:
+        """Merges sketches into a new sketch, leaving them unchanged.
+
+        :param sketches: sketches to merge
+        :type sketches: iterable
+        :rtype: QuantileSketch"""
+        merged = QuantileSketch()
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def getHitchSummaries(self) -> list:
+        """Summarizes the hitch durations of each log file, each thread, each machine class, and all log files.
+
+        :returns: list of HitchSummaryRecords, log files first, in the order they were merged
+        :rtype: list"""
+        hitchSummaryList = []
+        for groupBy in ("Log", "Thread"):
+            for (sketchGroupBy, group), sketch in self.hitchSketches.items():
+                if sketchGroupBy == groupBy:
+                    hitchSummaryList.append(HitchSummaryRecord(groupBy, group, *sketch.summarize()))
+        logSketches = {group: sketch for (groupBy, group), sketch in self.hitchSketches.items() if groupBy == "Log"}
+        machineSketches = {}
+        for logName, sketch in logSketches.items():
+            if logName in self.machineClasses:
+                machineSketches.setdefault(self.machineClasses[logName], []).append(sketch)
+        for machineClass, sketches in machineSketches.items():
+            hitchSummaryList.append(HitchSummaryRecord("Machine", machineClass, *self.mergeSketches(sketches).summarize()))
+        if logSketches:
+            hitchSummaryList.append(HitchSummaryRecord("All", "All Logs", *self.mergeSketches(logSketches.values()).summarize()))
+        return hitchSummaryList
+
+    def getMemorySummaries(self) -> list:
+        """Summarizes the memory footprints of each log file, each machine class, and all log files.
+        The final run time is the latest run time a footprint was recorded at.
+
+        :returns: list of MemorySummaryRecords, in the order the log files were merged
+        :rtype: list"""
+        memorySummaryList = []
+        machineLogs = {}
+        for logName, sketch in self.memorySketches.items():
+            memorySummaryList.append(MemorySummaryRecord("Log", logName, *sketch.summarize(), self.memoryRunTimes[logName]))
+            if logName in self.machineClasses:
+                machineLogs.setdefault(self.machineClasses[logName], []).append(logName)
+        for machineClass, logNames in machineLogs.items():
+            memorySummaryList.append(MemorySummaryRecord("Machine", machineClass,
+                                                         *self.mergeSketches(self.memorySketches[logName] for logName in logNames).summarize(),
+                                                         max(self.memoryRunTimes[logName] for logName in logNames)))
+        if self.memorySketches:
+            memorySummaryList.append(MemorySummaryRecord("All", "All Logs", *self.mergeSketches(self.memorySketches.values()).summarize(),
+                                                         max(self.memoryRunTimes.values())))
+        return memorySummaryList
+
+    def getMemoryTrends(self) -> list:
+        """Summarizes the memory growth trend (slope, extremes, and change points, see MemoryTrend) of each log file.
+
+        :returns: list of MemoryTrendRecords, in the order the log files were merged
+        :rtype: list"""
+        return [trend.getRecord(logName) for logName, trend in self.memoryTrends.items()]
@@ -0,0 +1,1419 @@
+"""
+William Fissler 2023
+
+LogWriters.py
+
+Report writers of LogParser.py: csv reports, typed columnar reports (Parquet, Arrow IPC/Feather, or NumPy .npz),
+a SQLite database of records (see QueryLogDatabase.py), and a self-contained HTML report.
+Each writer takes records of any type in any order, with writeRecords, flushReports, and closeReports.
+"""
+
+import logging, os, datetime, csv, json, hashlib, math, sqlite3, html
+from array import array
+from collections import Counter, deque
+
+from RunTimer import timed
+from LogRecords import (HitchRecord, MemoryRecord, HitchMemoryRecord, ErrorRecord, SystemInfoRecord, SpamRecord, ErrorGroupRecord,
+                        HitchSummaryRecord, MemorySummaryRecord, MemoryTrendRecord)
+
+try:
+    import numpy # optional, for npz reports
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow, pyarrow.parquet, pyarrow.ipc # optional, for parquet and feather reports
+except ImportError:
+    pyarrow = None
+
+class CSVWriter:
+    """
+    Class for handling all CSV file related operations.
+    
+    Attributes
+    ----------
+    reports{} : tuple
+        Stores the (file name, header) of the report for each record type 
+        (HitchRecord, HitchMemoryRecord, MemoryRecord, ErrorRecord, SpamRecord, HitchSummaryRecord, MemorySummaryRecord, MemoryTrendRecord, ErrorGroupRecord, SystemInfoRecord).
+    appendReports : bool
+        Defaults to False (each run creates new reports, see checkForExistingFile), 
+        otherwise rows are appended to the existing reports (for incremental runs), 
+        and the reports of aggregateTypes are rewritten in place.
+    aggregateTypes{} : type
+        Stores the record types whose reports summarize every record parsed (log spam, summaries, memory trends, and error groups), 
+        which are rewritten rather than appended to when appendReports is True.
+    openWriters{} : function
+        Stores the writerow function of each report held open by writeRecords, by record type.
+    openFiles[] : file
+        Stores the report files held open by writeRecords, until closeReports.
+    writeFailed : bool
+        Defaults to False, set once writing a report fails (so a run does not checkpoint records that were not written).
+    
+    Methods
+    -------
+    def checkForExistingFile(fileName:str) -> str
+        Evaluates path for existing file of name to avoid overwriting.
+        If file of name exists, increments duplicate number and reevaluates until a match does not exist.
+        
+        :param fileName: desired file name to be created
+        :type fileName: str
+        :returns: fileName - either fileName with an (n) duplicate value before its extension, or same value that was initially passed
+        :rtype: str
+        
+    openReport(recordType:type) -> tuple
+        Opens the report for recordType, either as a new file with its header, or for appending when appendReports is True 
+        (rewritten in place for aggregateTypes).
+        
+        :param recordType: HitchRecord, HitchMemoryRecord, MemoryRecord, ErrorRecord, SpamRecord, HitchSummaryRecord, MemorySummaryRecord, MemoryTrendRecord, ErrorGroupRecord, or SystemInfoRecord
+        :type recordType: type
+        :returns: (csvfile, writer) - the open file, and its csv writer
+        :rtype: tuple
+    
+    writeMemoryFootprintToCSV(memoryList:list)
+        Creates .csv file, applies header, and writes a row for each MemoryRecord in memoryList:
+        log file name, the line number the match occured in the respective log file, the footprint size, 
+        and at what run time the record occured.
+        
+        :param memoryList: list of MemoryRecords extracted from log lines matched to memoryCriteria
+        :type memoryList: list 
+        
+    writeHitchToCSV(hitchList:list)
+        Creates .csv file, applies header, and writes a row for each HitchRecord in hitchList:
+        log file name, the line number the match occured in the respective log file, the thread name, 
+        and the hitch duration.
+        
+        :param hitchList: list of HitchRecords extracted from log lines matched to hitchCriteria
+        :type hitchList: list 
+        
+    writeHitchMemoryToCSV(hitchMemoryList:list)
+        Creates .csv file, applies header, and writes a row for each HitchMemoryRecord in hitchMemoryList:
+        the hitch fields, and the line number, footprint, change in footprint, and run time of the nearest preceding memory sample.
+        
+        :param hitchMemoryList: list of HitchMemoryRecords from HitchMemoryJoiner.join
+        :type hitchMemoryList: list 
+        
+    writeErrorsToCSV(errorList:list)
+        Creates .csv file, applies header, and writes a row for each ErrorRecord in errorList:
+        log file name, the line number the match occured in the respective log file, the error type, 
+        the error message (including callstack), and the time stamp of the error line (seconds since 1970-01-01).
+        
+        :param errorList: list of ErrorRecords extracted from log lines matched to errorCriteria
+        :type errorList: list 
+        
+    writeLogSpamToCSV(logSpamList:list)
+        Creates .csv file, applies header, and writes a row for each SpamRecord in logSpamList:
+        log file name, the message template, the number of times it occured in the respective log file, 
+        and the maximum number of occurences it may be undercounted by.
+        
+        :param logSpamList: list of SpamRecords identified by LogParser.findLogSpam
+        :type logSpamList: list 
+        
+    writeHitchSummaryToCSV(hitchSummaryList:list)
+        Creates .csv file, applies header, and writes a row for each HitchSummaryRecord in hitchSummaryList:
+        what the durations are grouped by (log file, thread, or all), the group, and the count, min, max, mean, 
+        and 50th, 90th, and 99th percentiles of the hitch durations.
+        
+        :param hitchSummaryList: list of HitchSummaryRecords from RecordStatistics.getHitchSummaries
+        :type hitchSummaryList: list 
+        
+    writeMemorySummaryToCSV(memorySummaryList:list)
+        Creates .csv file, applies header, and writes a row for each MemorySummaryRecord in memorySummaryList:
+        what the footprints are grouped by (log file, or all), the group, the count, min, max, mean, 
+        and 50th, 90th, and 99th percentiles of the memory footprints, and the final run time a footprint was recorded at.
+        
+        :param memorySummaryList: list of MemorySummaryRecords from RecordStatistics.getMemorySummaries
+        :type memorySummaryList: list 
+        
+    writeMemoryTrendToCSV(memoryTrendList:list)
+        Creates .csv file, applies header, and writes a row for each MemoryTrendRecord in memoryTrendList:
+        log file name, the footprint count, the first and last run times and footprints, the least squares slope (MiB/s) and its R squared, 
+        the peak and trough footprints and their run times, and the number, first and last run times, and last direction of the change points.
+        
+        :param memoryTrendList: list of MemoryTrendRecords from RecordStatistics.getMemoryTrends
+        :type memoryTrendList: list 
+        
+    writeErrorGroupsToCSV(errorGroupList:list)
+        Creates .csv file, applies header, and writes a row for each ErrorGroupRecord in errorGroupList:
+        the stack signature, the error type, the message template, the number of occurrences, 
+        the log file name, line number, and time stamp of the first and last occurrences (by time stamp), and the error message (including callstack) of the first.
+        
+        :param errorGroupList: list of ErrorGroupRecords from ErrorGrouper.getGroups
+        :type errorGroupList: list 
+        
+    writeSystemInfoToCSV(systemInfoList:list)
+        Creates .csv file, applies header, and writes a row for each SystemInfoRecord in systemInfoList:
+        log file name, the line number the block occured in the respective log file, the Python version, host, operating system, CPU, 
+        physical and logical core counts, and total and available memory.
+        
+        :param systemInfoList: list of SystemInfoRecords extracted from the machine information block of each log file
+        :type systemInfoList: list 
+        
+    writeRecordsToCSV(records:generator)
+        Consumes records as they arrive (e.g. from LogParser.streamLogs), writing each to the report for its record type 
+        through writer handles held open for the whole stream.
+        
+        :param records: records of any type in reports, in any order
+        :type records: generator 
+        
+    writeRecords(records:iterable)
+        Writes each record to the report for its record type, opening the report on its first record, and holding it open.
+        
+    flushReports()
+        Flushes the reports held open by writeRecords, so their rows are visible to readers.
+        
+    closeReports()
+        Closes the reports held open by writeRecords.
+    """
+    
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        reports, appendReports, aggregateTypes, openWriters, openFiles, writeFailed."""
+        self.reports = {HitchRecord: ("HitchReport.csv", ["Log Name", "Log Line", "Thread", "Duration (ms)"]), 
+                        HitchMemoryRecord: ("HitchMemoryReport.csv", ["Log Name", "Log Line", "Thread", "Duration (ms)", "Memory Log Line", 
+                                                                      "Footprint (MiB)", "Footprint Delta (MiB)", "Time Recorded"]), 
+                        MemoryRecord: ("MemoryReport.csv", ["Log Name", "Log Line", "Footprint (MiB)", "Time Recorded"]), 
+                        ErrorRecord: ("ErrorReport.csv", ["Log Name", "Log Line", "Error Type", "Error Message", "Time Stamp"]), 
+                        SpamRecord: ("LogSpamReport.csv", ["Log Name", "Message Template", "Occurrences", "Max Undercount"]), 
+                        HitchSummaryRecord: ("HitchSummary.csv", ["Group By", "Group", "Count", "Min (ms)", "Max (ms)", "Mean (ms)", 
+                                                                  "P50 (ms)", "P90 (ms)", "P99 (ms)"]), 
+                        MemorySummaryRecord: ("MemorySummary.csv", ["Group By", "Group", "Count", "Min (MiB)", "Max (MiB)", "Mean (MiB)", 
+                                                                    "P50 (MiB)", "P90 (MiB)", "P99 (MiB)", "Final Run Time"]), 
+                        MemoryTrendRecord: ("MemoryTrend.csv", ["Log Name", "Count", "First Run Time", "Last Run Time", "First Footprint (MiB)", 
+                                                                "Last Footprint (MiB)", "Slope (MiB/s)", "R Squared", "Peak (MiB)", "Peak Run Time", 
+                                                                "Trough (MiB)", "Trough Run Time", "Change Points", "First Change Run Time", 
+                                                                "Last Change Run Time", "Last Change Direction"]), 
+                        ErrorGroupRecord: ("ErrorGroups.csv", ["Signature", "Error Type", "Message Template", "Occurrences", 
+                                                               "First Seen Log", "First Seen Line", "First Seen Time Stamp", 
+                                                               "Last Seen Log", "Last Seen Line", "Last Seen Time Stamp", "Example Error Message"]), 
+                        SystemInfoRecord: ("SystemInfoReport.csv", ["Log Name", "Log Line", "Python Version", "Host", "Operating System", "CPU", 
+                                                                    "CPU Physical Cores", "CPU Logical Cores", "Total Memory (MiB)", 
+                                                                    "Available Memory (MiB)"])}
+        self.appendReports = False
+        self.aggregateTypes = {SpamRecord, HitchSummaryRecord, MemorySummaryRecord, MemoryTrendRecord, ErrorGroupRecord}
+        self.openWriters = {}
+        self.openFiles = []
+        self.writeFailed = False
+    
+    @timed
+    def checkForExistingFile(self, fileName) -> str:
+        """Evaluates path for existing file of name to avoid overwriting.
+        If file of name exists, increments duplicate number and reevaluates until a match does not exist.
+        
+        :param fileName: desired file name to be created
+        :type fileName: str
+        :returns: fileName - either fileName with an (n) duplicate value before its extension, or same value that was initially passed
+        :rtype: str"""
+        try:
+            
+            baseName, extension = os.path.splitext(fileName)
+            fileDupeNum = 0 
+            while os.path.isfile(fileName):
+                logging.info(fileName + " already exists")
+                fileDupeNum += 1
+                fileName = baseName + "(" + str(fileDupeNum) + ")" + extension
+                                    
+            logging.info("Creating CSV file: " + fileName)
+            return fileName
+
+        except Exception as e:
+            logging.exception(e)
+
+    def openReport(self, recordType) -> tuple:
+        """Opens the report for recordType, either as a new file with its header, or for appending when appendReports is True.
+        The header is only written to an appended report if it does not exist yet. 
+        The reports of aggregateTypes are rewritten in place rather than appended to, 
+        as their records summarize every record parsed (including those of earlier runs), not only those parsed since.
+        
+        :param recordType: HitchRecord, HitchMemoryRecord, MemoryRecord, ErrorRecord, SpamRecord, HitchSummaryRecord, MemorySummaryRecord, MemoryTrendRecord, ErrorGroupRecord, or SystemInfoRecord
+        :type recordType: type
+        :returns: (csvfile, writer) - the open file, and its csv writer
+        :rtype: tuple"""
+        fileName, header = self.reports[recordType]
+        if self.appendReports and recordType in self.aggregateTypes:
+            writeHeader = True
+            logging.info("Rewriting CSV file: " + fileName)
+            csvfile = open(fileName, 'w', newline='', encoding='utf-8')
+        elif self.appendReports:
+            writeHeader = not os.path.isfile(fileName) or os.path.getsize(fileName) == 0
+            logging.info("Appending to CSV file: " + fileName)
+            csvfile = open(fileName, 'a', newline='', encoding='utf-8')
+        else:
+            writeHeader = True
+            csvfile = open(self.checkForExistingFile(fileName), 'w', newline='', encoding='utf-8')
+        writer = csv.writer(csvfile, dialect='excel')
+        if writeHeader:
+            writer.writerow(header)
+        return csvfile, writer
+
+    @timed
+    def writeMemoryFootprintToCSV(self, memoryList):
+        """Creates .csv file, applies header, and writes a row for each MemoryRecord in memoryList:
+        log file name, the line number the match occured in the respective log file, the footprint size, 
+        and at what run time the record occured.
+        
+        :param memoryList: list of MemoryRecords extracted from log lines matched to memoryCriteria
+        :type memoryList: list"""
+        try:
+            if len(memoryList) != 0:
+                csvfile, writer = self.openReport(MemoryRecord)
+                with csvfile:
+                    
+                    writer.writerows(memoryList) # MemoryRecord fields are in column order
+            else:
+                logging.warning("Failure to write Memory Report. Memory List is empty") 
+        except Exception as e:
+            logging.exception(e)                   
+            self.writeFailed = True
+            
+    @timed
+    def writeHitchToCSV(self, hitchList):
+        """Creates .csv file, applies header, and writes a row for each HitchRecord in hitchList:
+        log file name, the line number the match occured in the respective log file, the thread name, 
+        and the hitch duration.
+        
+        :param hitchList: list of HitchRecords extracted from log lines matched to hitchCriteria
+        :type hitchList: list"""        
+        try: 
+            if len(hitchList) != 0:                
+                csvfile, writer = self.openReport(HitchRecord)
+                with csvfile:
+                    
+                    writer.writerows(hitchList) # HitchRecord fields are in column order
+            else:
+                logging.warning("Failure to write Hitch Report: Hitch List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+        
+    @timed
+    def writeHitchMemoryToCSV(self, hitchMemoryList):
+        """Creates .csv file, applies header, and writes a row for each HitchMemoryRecord in hitchMemoryList:
+        the hitch fields, and the line number, footprint, change in footprint, and run time of the nearest preceding memory sample.
+        
+        :param hitchMemoryList: list of HitchMemoryRecords from HitchMemoryJoiner.join
+        :type hitchMemoryList: list"""
+        try: 
+            if len(hitchMemoryList) != 0:                
+                csvfile, writer = self.openReport(HitchMemoryRecord)
+                with csvfile:
+                    
+                    writer.writerows(hitchMemoryList) # HitchMemoryRecord fields are in column order
+            else:
+                logging.warning("Failure to write Hitch Memory Report: Hitch Memory List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+            
+    @timed
+    def writeErrorsToCSV(self, errorList):
+        """Creates .csv file, applies header, and writes a row for each ErrorRecord in errorList:
+        log file name, the line number the match occured in the respective log file, the error type, 
+        the error message (including callstack), and the time stamp of the error line (seconds since 1970-01-01).
+        
+        :param errorList: list of ErrorRecords extracted from log lines matched to errorCriteria
+        :type errorList: list"""        
+        try: 
+            if len(errorList) != 0:                
+                csvfile, writer = self.openReport(ErrorRecord)
+                with csvfile:
+                    
+                    writer.writerows(errorList) # ErrorRecord fields are in column order
+            else:
+                logging.warning("Failure to write Error Report: Error List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+
+    @timed
+    def writeHitchSummaryToCSV(self, hitchSummaryList):
+        """Creates .csv file, applies header, and writes a row for each HitchSummaryRecord in hitchSummaryList:
+        what the durations are grouped by (log file, thread, or all), the group, and the count, min, max, mean, 
+        and 50th, 90th, and 99th percentiles of the hitch durations.
+        
+        :param hitchSummaryList: list of HitchSummaryRecords from RecordStatistics.getHitchSummaries
+        :type hitchSummaryList: list"""
+        try: 
+            if len(hitchSummaryList) != 0:                
+                csvfile, writer = self.openReport(HitchSummaryRecord)
+                with csvfile:
+                    
+                    writer.writerows(hitchSummaryList) # HitchSummaryRecord fields are in column order
+            else:
+                logging.warning("Failure to write Hitch Summary: Hitch Summary List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+            
+    @timed
+    def writeMemorySummaryToCSV(self, memorySummaryList):
+        """Creates .csv file, applies header, and writes a row for each MemorySummaryRecord in memorySummaryList:
+        what the footprints are grouped by (log file, or all), the group, the count, min, max, mean, 
+        and 50th, 90th, and 99th percentiles of the memory footprints, and the final run time a footprint was recorded at.
+        
+        :param memorySummaryList: list of MemorySummaryRecords from RecordStatistics.getMemorySummaries
+        :type memorySummaryList: list"""
+        try: 
+            if len(memorySummaryList) != 0:                
+                csvfile, writer = self.openReport(MemorySummaryRecord)
+                with csvfile:
+                    
+                    writer.writerows(memorySummaryList) # MemorySummaryRecord fields are in column order
+            else:
+                logging.warning("Failure to write Memory Summary: Memory Summary List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+            
+    @timed
+    def writeMemoryTrendToCSV(self, memoryTrendList):
+        """Creates .csv file, applies header, and writes a row for each MemoryTrendRecord in memoryTrendList:
+        log file name, the footprint count, the first and last run times and footprints, the least squares slope (MiB/s) and its R squared, 
+        the peak and trough footprints and their run times, and the number, first and last run times, and last direction of the change points.
+        
+        :param memoryTrendList: list of MemoryTrendRecords from RecordStatistics.getMemoryTrends
+        :type memoryTrendList: list"""
+        try: 
+            if len(memoryTrendList) != 0:                
+                csvfile, writer = self.openReport(MemoryTrendRecord)
+                with csvfile:
+                    
+                    writer.writerows(memoryTrendList) # MemoryTrendRecord fields are in column order
+            else:
+                logging.warning("Failure to write Memory Trend: Memory Trend List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+            
+    @timed
+    def writeErrorGroupsToCSV(self, errorGroupList):
+        """Creates .csv file, applies header, and writes a row for each ErrorGroupRecord in errorGroupList:
+        the stack signature, the error type, the message template, the number of occurrences, 
+        the log file name, line number, and time stamp of the first and last occurrences (by time stamp), and the error message (including callstack) of the first.
+        
+        :param errorGroupList: list of ErrorGroupRecords from ErrorGrouper.getGroups
+        :type errorGroupList: list"""
+        try: 
+            if len(errorGroupList) != 0:                
+                csvfile, writer = self.openReport(ErrorGroupRecord)
+                with csvfile:
+                    
+                    writer.writerows(errorGroupList) # ErrorGroupRecord fields are in column order
+            else:
+                logging.warning("Failure to write Error Groups: Error Group List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+    
+    
+    def writeRecords(self, records):
+        """Writes each record to the report for its record type, opening the report on its first record, 
+        and holding it open for later calls until closeReports.
+        
+        :param records: records of any type in reports, in any order
+        :type records: iterable"""
+        writers = self.openWriters
+        for record in records:
+            writerow = writers.get(type(record))
+            if writerow is None:
+                csvfile, writer = self.openReport(type(record))
+                self.openFiles.append(csvfile)
+                writerow = writers[type(record)] = writer.writerow
+            writerow(record) # record fields are in column order
+            
+    def flushReports(self):
+        """Flushes the reports held open by writeRecords, so their rows are visible to readers."""
+        for csvfile in self.openFiles:
+            csvfile.flush()
+            
+    def closeReports(self):
+        """Closes the reports held open by writeRecords."""
+        for csvfile in self.openFiles:
+            csvfile.close()
+        self.openFiles = []
+        self.openWriters = {}
+
+    @timed
+    def writeRecordsToCSV(self, records):
+        """Consumes records as they arrive (e.g. from LogParser.streamLogs), writing each to the report for its record type 
+        through writer handles held open for the whole stream. A report is only created once its first record arrives.
+        
+        :param records: records of any type in reports, in any order
+        :type records: generator"""
+        try:
+            try:
+                self.writeRecords(records)
+                writtenTypes = set(self.openWriters)
+            finally:
+                self.closeReports()
+                    
+            for recordType, (fileName, header) in self.reports.items():
+                if recordType not in writtenTypes:
+                    logging.warning("Failure to write " + fileName + ": no " + recordType.__name__ + "s were streamed")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+    
+    @timed
+    def writeLogSpamToCSV(self, logSpamList):
+        """Creates .csv file, applies header, and writes a row for each SpamRecord in logSpamList:
+        log file name, the message template, the number of times it occured in the respective log file, 
+        and the maximum number of occurences it may be undercounted by.
+        
+        :param logSpamList: list of SpamRecords identified by LogParser.findLogSpam
+        :type logSpamList: list"""
+        try: 
+            if len(logSpamList) != 0:                
+                csvfile, writer = self.openReport(SpamRecord)
+                with csvfile:
+                    
+                    writer.writerows(logSpamList) # SpamRecord fields are in column order
+            else:
+                logging.warning("Failure to write Log Spam Report: Log Spam List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+            
+    @timed
+    def writeSystemInfoToCSV(self, systemInfoList):
+        """Creates .csv file, applies header, and writes a row for each SystemInfoRecord in systemInfoList:
+        log file name, the line number the block occured in the respective log file, the Python version, host, operating system, CPU, 
+        physical and logical core counts, and total and available memory.
+        
+        :param systemInfoList: list of SystemInfoRecords extracted from the machine information block of each log file
+        :type systemInfoList: list"""
+        try: 
+            if len(systemInfoList) != 0:                
+                csvfile, writer = self.openReport(SystemInfoRecord)
+                with csvfile:
+                    
+                    writer.writerows(systemInfoList) # SystemInfoRecord fields are in column order
+            else:
+                logging.warning("Failure to write System Info Report: System Info List is empty")
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+    
+class ColumnarWriter:
+    """
+    Class for writing records to typed columnar files, as an alternative to CSVWriter for large runs.
+
+    Records are buffered by record type, and every batchSize rows are transposed into columns in one step,
+    typed from the record's field annotations (str, int, float), rather than formatting each row as text.
+    Parquet files are written one row group per batch, and Arrow IPC (Feather) files one record batch per batch, with pyarrow.
+    NumPy .npz files cannot be appended to, so their batches are held in compact typed columns until the report is closed.
+    Column names are the record field names. Reports are never appended to: incremental runs write a new (numbered) file each run.
+    Provides writeRecords, flushReports, and closeReports in the same form as CSVWriter, so either can be used by LogFollower.
+
+    Attributes
+    ----------
+    format : str
+        "parquet", "feather", or "npz", the format actually used after falling back for missing optional packages
+        (parquet and feather fall back to npz without pyarrow), or None when neither pyarrow nor NumPy is installed.
+    reports{} : str
+        Stores the file name (without extension) of the report for each record type.
+    batchSize : int
+        Defaults to 65536 (number of rows buffered per record type before they are written as a batch).
+    rowBuffers{} : list
+        Stores the rows of each record type not yet written, by record type.
+    columnBuffers{} : list
+        Stores the typed columns of each record type held until closeReports (npz only), by record type.
+    openWriters{} : object
+        Stores the pyarrow writer of each report held open, by record type.
+    writeFailed : bool
+        Defaults to False, set once writing a report fails (so a run does not checkpoint records that were not written).
+
+    Methods
+    -------
+    __init__(format:str)
+        Constructor.
+        Initializes the following attributes:
+        format, reports, batchSize, rowBuffers, columnBuffers, openWriters, writeFailed.
+
+    checkForExistingFile(fileName:str) -> str
+        Evaluates path for existing file of name to avoid overwriting.
+        :returns: fileName - either fileName with an (n) duplicate value before its extension, or same value that was initially passed
+        :rtype: str
+
+    writeBatch(recordType:type)
+        Transposes the buffered rows of recordType into typed columns, and writes them to its report.
+
+    writeRecords(records:iterable)
+        Buffers each record for the report of its record type, writing a batch whenever batchSize rows are buffered.
+
+    flushReports()
+        Writes the buffered rows of every record type (npz reports are only written by closeReports).
+
+    closeReports()
+        Writes the buffered rows of every record type, and closes (or for npz, writes) every report.
+
+    writeRecordsToFiles(records:generator)
+        Consumes records as they arrive (e.g. from LogParser.streamLogs, or the lists of a batch run), writing them in batches.
+    """
+
+    def __init__(self, format) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        format, reports, batchSize, rowBuffers, columnBuffers, openWriters, writeFailed."""
+        if format in ("parquet", "feather") and pyarrow is None:
+            logging.warning("pyarrow is not installed, writing npz reports rather than " + format)
+            format = "npz"
+        if format == "npz" and numpy is None:
+            logging.warning("numpy is not installed, npz reports cannot be written")
+            format = None
+        self.format = format
+        self.reports = {HitchRecord: "HitchReport",
+                        HitchMemoryRecord: "HitchMemoryReport",
+                        MemoryRecord: "MemoryReport",
+                        ErrorRecord: "ErrorReport",
+                        SpamRecord: "LogSpamReport",
+                        HitchSummaryRecord: "HitchSummary",
+                        MemorySummaryRecord: "MemorySummary",
+                        MemoryTrendRecord: "MemoryTrend",
+                        ErrorGroupRecord: "ErrorGroups",
+                        SystemInfoRecord: "SystemInfoReport"}
+        self.batchSize = 65536
+        self.rowBuffers = {}
+        self.columnBuffers = {}
+        self.openWriters = {}
+        self.writeFailed = False
+
+    def checkForExistingFile(self, fileName) -> str:
+        """Evaluates path for existing file of name to avoid overwriting.
+        If file of name exists, increments duplicate number and reevaluates until a match does not exist.
+
+        :param fileName: desired file name to be created
+        :type fileName: str
+        :returns: fileName - either fileName with an (n) duplicate value before its extension, or same value that was initially passed
+        :rtype: str"""
+        baseName, extension = os.path.splitext(fileName)
+        fileDupeNum = 0
+        while os.path.isfile(fileName):
+            logging.info(fileName + " already exists")
+            fileDupeNum += 1
+            fileName = baseName + "(" + str(fileDupeNum) + ")" + extension
+        logging.info("Creating " + self.format + " file: " + fileName)
+        return fileName
+
+    def writeBatch(self, recordType):
+        """Transposes the buffered rows of recordType into typed columns, and writes them to its report.
+
+        :param recordType: record type of the rows to write
+        :type recordType: type"""
+        rows = self.rowBuffers.pop(recordType, None)
+        if not rows:
+            return
+        fields = recordType._fields
+        types = [recordType.__annotations__[field] for field in fields]
+        columns = list(zip(*rows)) # one transpose per batch, rather than a write per row
+
+        if self.format == "npz":
+            buffers = self.columnBuffers.get(recordType)
+            if buffers is None:
+                buffers = self.columnBuffers[recordType] = [array('d') if columnType is float else array('q') if columnType is int else []
+                                                            for columnType in types]
+            for buffer, column, columnType in zip(buffers, columns, types):
+                if None in column: # npz has no nulls: e.g. the slope of a memory trend without varying run times, or a hitch without a memory sample
+                    missing = "" if columnType is str else math.nan if columnType is float else -1
+                    column = [missing if value is None else value for value in column]
+                buffer.extend(column)
+            return
+
+        arrowTypes = {str: pyarrow.string(), int: pyarrow.int64(), float: pyarrow.float64()}
+        batch = pyarrow.RecordBatch.from_arrays([pyarrow.array(column, type=arrowTypes[columnType]) for column, columnType in zip(columns, types)],
+                                                names=list(fields))
+        writer = self.openWriters.get(recordType)
+        if self.format == "parquet":
+            if writer is None:
+                writer = self.openWriters[recordType] = pyarrow.parquet.ParquetWriter(
+                    self.checkForExistingFile(self.reports[recordType] + ".parquet"), batch.schema)
+            writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            if writer is None:
+                writer = self.openWriters[recordType] = pyarrow.ipc.new_file(
+                    self.checkForExistingFile(self.reports[recordType] + ".feather"), batch.schema)
+            writer.write_batch(batch)
+
+    def writeRecords(self, records):
+        """Buffers each record for the report of its record type, writing a batch whenever batchSize rows are buffered.
+
+        :param records: records of any type in reports, in any order
+        :type records: iterable"""
+        buffers = self.rowBuffers
+        for record in records:
+            rows = buffers.get(type(record))
+            if rows is None:
+                rows = buffers[type(record)] = []
+            rows.append(record)
+            if len(rows) >= self.batchSize:
+                self.writeBatch(type(record))
+
+    def flushReports(self):
+        """Writes the buffered rows of every record type (npz reports are only written by closeReports)."""
+        for recordType in list(self.rowBuffers):
+            self.writeBatch(recordType)
+
+    def closeReports(self):
+        """Writes the buffered rows of every record type, and closes (or for npz, writes) every report."""
+        self.flushReports()
+        for writer in self.openWriters.values():
+            writer.close()
+        for recordType, buffers in self.columnBuffers.items():
+            columns = {field: numpy.frombuffer(buffer, dtype=numpy.float64 if buffer.typecode == 'd' else numpy.int64)
+                       if isinstance(buffer, array) else numpy.array(buffer, dtype=str)
+                       for field, buffer in zip(recordType._fields, buffers)}
+            numpy.savez(self.checkForExistingFile(self.reports[recordType] + ".npz"), **columns)
+        self.openWriters = {}
+        self.columnBuffers = {}
+
+    @timed
+    def writeRecordsToFiles(self, records):
+        """Consumes records as they arrive (e.g. from LogParser.streamLogs, or the lists of a batch run), writing them in batches.
+        A report is only created once its first batch is written.
+
+        :param records: records of any type in reports, in any order
+        :type records: generator"""
+        try:
+            try:
+                self.writeRecords(records)
+            finally:
+                self.closeReports()
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+
+class SQLiteWriter:
+    """
+    Class for indexing parsed hitch, memory, error, and machine information records (and the hitches joined with memory samples) in a SQLite database, 
+    so they can be queried across runs without re-parsing (and joined on logName, e.g. hitches per host and core count).
+
+    Records are buffered by table and inserted with executemany, batchSize rows per transaction, with the absolute path of their log file as logName.
+    Each log file is identified by its absolute path, size, modification time, and a hash of its content (only computed when its modification 
+    time changed but not its size), checked before it is parsed: a log file already ingested with the same content is skipped,
+    and a log file ingested with different content (e.g. it has grown) has its rows replaced,
+    or when appendLogs is set (incremental runs, which only parse data appended since the last run), only its rows after the lines 
+    preceding the data parsed (see startLines), so rows of a log file parsed again (e.g. its checkpoint was not saved) are not duplicated.
+    A log file is only recorded as ingested once its rows are committed by closeReports,
+    so rows left by an interrupted run are replaced by the next run.
+    Provides writeRecords, flushReports, and closeReports in the same form as CSVWriter. SpamRecords and summary records are not indexed.
+
+    Attributes
+    ----------
+    fileName : str
+        SQLite database file name.
+    connection : sqlite3.Connection
+        Connection to the database, opened (and the tables and indexes created if needed) by the constructor.
+    tables{} : str
+        Stores the table name of each record type indexed (HitchRecord, HitchMemoryRecord, MemoryRecord, ErrorRecord, SystemInfoRecord).
+    appendLogs : bool
+        Defaults to False (rows of log files with changed content are replaced), otherwise rows are added to the existing rows 
+        up to startLines of the log file.
+    startLines{} : int
+        Stores the number of lines preceding the data parsed this run of each log file (e.g. up to its checkpoint), by log file name 
+        (see LogParser.startLines), 0 if not given.
+    batchSize : int
+        Defaults to 50000 (number of rows buffered per table before they are inserted in a single transaction).
+    rowBuffers{} : list
+        Stores the rows of each record type not yet inserted, by record type.
+    checkedLogs{} : bool
+        Stores whether the records of each log file checked this run (see checkLog) are to be ingested, by log file name.
+    logStatus{} : bool
+        Stores whether the records of each log file seen this run are being ingested (True) or skipped (False), by log file name.
+    ingestedLogs{} : str
+        Stores the absolute path of each log file ingested this run, by log file name.
+    writeFailed : bool
+        Defaults to False, set once writing to the database fails (so a run does not checkpoint records that were not written).
+
+    Methods
+    -------
+    __init__(fileName:str)
+        Constructor.
+        Opens the database, and creates the logs, hitches, hitchMemory, memory, errors, and systems tables and their indexes if they do not exist 
+        (and the columns of fields added to their record types since).
+
+    hashFile(logName:str, size:int) -> str
+        Hashes the first size bytes of logName.
+
+    checkLog(logName:str) -> bool
+        Decides whether the records of logName are ingested this run, before it is parsed.
+
+    beginLog(logName:str) -> bool
+        Begins ingesting the records of logName if they are to be ingested, removing its previous rows if they are to be replaced.
+
+    ingestRecords(records:iterable) -> generator
+        Buffers each record of a log file being ingested for insertion, and yields every record on (so the same records can be written to reports).
+
+    writeRecords(records:iterable)
+        Buffers each record of a log file being ingested for insertion, inserting a batch whenever batchSize rows are buffered.
+
+    flushReports()
+        Inserts the buffered rows of every table.
+
+    closeReports()
+        Inserts the buffered rows of every table, records each log file ingested this run, and closes the database.
+
+    writeRecordsToDatabase(records:generator)
+        Consumes records as they arrive (e.g. the lists of a batch run), inserting them in batches.
+
+    query(sql:str, parameters:tuple) -> tuple
+        Runs a query against the database.
+        :returns: (column names, rows)
+        :rtype: tuple
+    """
+
+    def __init__(self, fileName) -> None:
+        """Constructor.
+        Opens the database, and creates the logs, hitches, hitchMemory, memory, errors, and systems tables and their indexes if they do not exist 
+        (and the columns of fields added to their record types since)."""
+        self.fileName = fileName
+        self.tables = {HitchRecord: "hitches", HitchMemoryRecord: "hitchMemory", MemoryRecord: "memory", ErrorRecord: "errors", SystemInfoRecord: "systems"}
+        self.appendLogs = False
+        self.startLines = {}
+        self.batchSize = 50000
+        self.rowBuffers = {}
+        self.checkedLogs = {}
+        self.logStatus = {}
+        self.ingestedLogs = {}
+        self.writeFailed = False
+
+        self.connection = sqlite3.connect(fileName)
+        self.connection.execute("PRAGMA journal_mode=WAL") # readers are not blocked while a run inserts
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        columnTypes = {str: "TEXT", int: "INTEGER", float: "REAL"}
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS logs (path TEXT PRIMARY KEY, logName TEXT, contentHash TEXT, "
+                                    "size INTEGER, mtime INTEGER, ingested TEXT)")
+            for recordType, table in self.tables.items():
+                columns = ", ".join(field + " " + columnTypes[recordType.__annotations__[field]] for field in recordType._fields)
+                self.connection.execute("CREATE TABLE IF NOT EXISTS " + table + " (" + columns + ")")
+                existingColumns = {column[1] for column in self.connection.execute("PRAGMA table_info(" + table + ")")}
+                for field in recordType._fields:
+                    if field not in existingColumns: # added to the record type since the table was created (e.g. the time stamp of errors)
+                        self.connection.execute("ALTER TABLE " + table + " ADD COLUMN " + field + " " + columnTypes[recordType.__annotations__[field]])
+            self.connection.execute("CREATE INDEX IF NOT EXISTS hitchesLogName ON hitches (logName)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS hitchesThread ON hitches (thread, duration)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS hitchesDuration ON hitches (duration)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS hitchMemoryLogName ON hitchMemory (logName)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS memoryLogName ON memory (logName)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS errorsLogName ON errors (logName)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS errorsErrorType ON errors (errorType)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS systemsLogName ON systems (logName)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS systemsHost ON systems (host, physicalCores)")
+
+    def hashFile(self, logName, size) -> str:
+        """Hashes the first size bytes of logName.
+
+        :param logName: log file name
+        :type logName: str
+        :param size: number of bytes hashed
+        :type size: int
+        :returns: contentHash - hex digest of the log file's content
+        :rtype: str"""
+        contentHash = hashlib.blake2b(digest_size=16)
+        with open(logName, 'rb') as cachedLog:
+            while size > 0:
+                block = cachedLog.read(min(1024**2, size))
+                if not block:
+                    break
+                contentHash.update(block)
+                size -= len(block)
+        return contentHash.hexdigest()
+
+    def checkLog(self, logName) -> bool:
+        """Decides whether the records of logName are ingested this run, before it is parsed (so the size and modification time checked 
+        are those of the data parsed). It is skipped if it was ingested with the same size and modification time, or the same content, 
+        which is only hashed when its modification time changed but not its size (e.g. the log file was touched or copied).
+
+        :param logName: log file name, as given in its records
+        :type logName: str
+        :returns: True if the records of logName are to be ingested, False if it was already ingested with the same content
+        :rtype: bool"""
+        path = os.path.abspath(logName)
+        stat = os.stat(logName)
+        ingested = self.connection.execute("SELECT size, mtime, contentHash FROM logs WHERE path = ?", (path,)).fetchone()
+        ingest = ingested is None or ingested[:2] != (stat.st_size, stat.st_mtime_ns)
+        if ingest and ingested is not None and ingested[0] == stat.st_size and ingested[2] == self.hashFile(logName, stat.st_size):
+            with self.connection: # touched, but unchanged, so the next run need not hash it again
+                self.connection.execute("UPDATE logs SET mtime = ? WHERE path = ?", (stat.st_mtime_ns, path))
+            ingest = False
+        if ingest:
+            self.ingestedLogs[logName] = path
+        else:
+            logging.info("%s was already ingested into %s, skipping", logName, self.fileName)
+        self.checkedLogs[logName] = ingest
+        return ingest
+
+    def beginLog(self, logName) -> bool:
+        """Begins ingesting the records of logName, if checkLog decided (or, if it was not checked before it was parsed, decides) 
+        they are to be ingested, removing its previous rows (when appendLogs is set, only those after its startLines).
+
+        :param logName: log file name, as given in its records
+        :type logName: str
+        :returns: True if the records of logName are to be ingested, False if it was already ingested with the same content
+        :rtype: bool"""
+        ingest = self.checkedLogs[logName] if logName in self.checkedLogs else self.checkLog(logName)
+        if ingest:
+            startLine = self.startLines.get(logName, 0) if self.appendLogs else 0
+            with self.connection:
+                for table in self.tables.values():
+                    self.connection.execute("DELETE FROM " + table + " WHERE logName = ? AND lineNumber > ?", (self.ingestedLogs[logName], startLine))
+        self.logStatus[logName] = ingest
+        return ingest
+
+    def ingestRecords(self, records):
+        """Buffers each record of a log file being ingested for insertion, and yields every record on
+        (so the same records can be written to reports, e.g. CSVWriter.writeRecordsToCSV(objSQLiteWriter.ingestRecords(records))).
+
+        :param records: records of any type, in any order
+        :type records: iterable
+        :returns: records, unchanged
+        :rtype: generator"""
+        buffers = self.rowBuffers
+        logStatus = self.logStatus
+        for record in records:
+            recordType = type(record)
+            if recordType in self.tables:
+                ingest = logStatus.get(record.logName)
+                if ingest is None:
+                    ingest = self.beginLog(record.logName)
+                if ingest:
+                    rows = buffers.get(recordType)
+                    if rows is None:
+                        rows = buffers[recordType] = []
+                    rows.append(record)
+                    if len(rows) >= self.batchSize:
+                        self.flushReports()
+            yield record
+
+    def writeRecords(self, records):
+        """Buffers each record of a log file being ingested for insertion, inserting a batch whenever batchSize rows are buffered.
+
+        :param records: records of any type, in any order
+        :type records: iterable"""
+        for record in self.ingestRecords(records):
+            pass
+
+    def flushReports(self):
+        """Inserts the buffered rows of every table (with the absolute path of their log file as logName), in a single transaction."""
+        paths = self.ingestedLogs
+        with self.connection:
+            for recordType, rows in self.rowBuffers.items():
+                placeholders = ", ".join("?" * len(recordType._fields))
+                self.connection.executemany("INSERT INTO " + self.tables[recordType] + " (" + ", ".join(recordType._fields) + ") VALUES (" + placeholders + ")", 
+                                            ((paths[row[0]],) + row[1:] for row in rows))
+        self.rowBuffers = {}
+
+    def closeReports(self):
+        """Inserts the buffered rows of every table, records each log file ingested this run, and closes the database.
+        Each log file ingested is hashed, as it is now (it may have changed since it was checked, e.g. while following it), 
+        and the previous rows of those without records this run are removed."""
+        for logName in self.ingestedLogs:
+            if logName not in self.logStatus:
+                self.beginLog(logName)
+        self.flushReports()
+        ingestedTime = str(datetime.datetime.now())
+        logRows = []
+        for logName, path in self.ingestedLogs.items():
+            stat = os.stat(logName)
+            logRows.append((path, logName, self.hashFile(logName, stat.st_size), stat.st_size, stat.st_mtime_ns, ingestedTime))
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?, ?)", logRows)
+        logging.info("Ingested %d log files into %s", len(logRows), self.fileName)
+        self.connection.close()
+
+    @timed
+    def writeRecordsToDatabase(self, records):
+        """Consumes records as they arrive (e.g. the lists of a batch run), inserting them in batches.
+
+        :param records: records of any type, in any order
+        :type records: generator"""
+        try:
+            try:
+                self.writeRecords(records)
+            finally:
+                self.closeReports()
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
+
+    def query(self, sql, parameters=()) -> tuple:
+        """Runs a query against the database.
+
+        :param sql: SQL statement, with ? placeholders for parameters
+        :type sql: str
+        :param parameters: values of the placeholders
+        :type parameters: tuple
+        :returns: (column names, rows)
+        :rtype: tuple"""
+        cursor = self.connection.execute(sql, parameters)
+        return [column[0] for column in cursor.description or ()], cursor.fetchall()
+
+class SeriesDownsampler:
+    """
+    Class for reducing a series of (x, y) points, as they arrive, to at most pointBudget points in constant memory, by min/max buckets.
+
+    Points are grouped into buckets of bucketWidth consecutive points, and each bucket keeps only its lowest and highest point,
+    so every spike and dip of the series survives at any point budget (unlike averaging, or keeping every Nth point).
+    Once pointBudget / 2 buckets are filled, adjacent buckets are merged in pairs and bucketWidth doubles,
+    so the same budget holds however many points are added.
+
+    Attributes
+    ----------
+    pointBudget : int
+        Maximum number of points kept (two per bucket).
+    bucketWidth : int
+        Number of points added per bucket, doubled whenever the buckets are merged.
+    buckets : list
+        Stores the [minimum x, minimum y, maximum x, maximum y] of each full bucket, in the order added.
+    current : list
+        The bucket being filled, or None.
+    currentCount : int
+        Number of points added to the current bucket.
+    count : int
+        Number of points added.
+
+    Methods
+    -------
+    __init__(pointBudget:int)
+        Constructor.
+        Initializes the following attributes:
+        pointBudget, bucketWidth, buckets, current, currentCount, count.
+
+    add(x:float, y:float)
+        Adds a point to the series.
+
+    mergeBuckets(buckets:list, count:int) -> list
+        Merges runs of adjacent buckets into count buckets.
+
+    getPoints(pointBudget:int) -> list
+        Gets the points kept, in the order added, reduced further to pointBudget if given.
+    """
+    def __init__(self, pointBudget=2000) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        pointBudget, bucketWidth, buckets, current, currentCount, count."""
+        self.pointBudget = max(pointBudget, 4)
+        self.bucketWidth = 1
+        self.buckets = []
+        self.current = None
+        self.currentCount = 0
+        self.count = 0
+
+    def add(self, x, y):
+        """Adds a point to the series.
+
+        :param x: x value (e.g. run time)
+        :type x: float
+        :param y: y value (e.g. footprint)
+        :type y: float"""
+        self.count += 1
+        bucket = self.current
+        if bucket is None:
+            bucket = self.current = [x, y, x, y]
+        elif y < bucket[1]:
+            bucket[0], bucket[1] = x, y
+        elif y > bucket[3]:
+            bucket[2], bucket[3] = x, y
+        self.currentCount += 1
+        if self.currentCount >= self.bucketWidth:
+            self.buckets.append(bucket)
+            self.current, self.currentCount = None, 0
+            if len(self.buckets) >= self.pointBudget // 2:
+                self.buckets = self.mergeBuckets(self.buckets, len(self.buckets) // 2)
+                self.bucketWidth *= 2
+
+    def mergeBuckets(self, buckets, count) -> list:
+        """Merges runs of adjacent buckets (of as near equal length as possible) into count buckets, keeping the lowest and highest point of each run.
+
+        :param buckets: [minimum x, minimum y, maximum x, maximum y] buckets, in order
+        :type buckets: list
+        :param count: number of buckets to merge into
+        :type count: int
+        :returns: merged buckets
+        :rtype: list"""
+        merged = []
+        for index in range(count):
+            run = buckets[index * len(buckets) // count:(index + 1) * len(buckets) // count]
+            lowest = min(run, key=lambda bucket: bucket[1])
+            highest = max(run, key=lambda bucket: bucket[3])
+            merged.append([lowest[0], lowest[1], highest[2], highest[3]])
+        return merged
+
+    def getPoints(self, pointBudget=None) -> list:
+        """Gets the points kept (the lowest and highest point of each bucket), in the order added, reduced further to pointBudget if given.
+
+        :param pointBudget: maximum number of points, defaults to the downsampler's pointBudget
+        :type pointBudget: int
+        :returns: list of (x, y) tuples
+        :rtype: list"""
+        buckets = self.buckets + ([list(self.current)] if self.current is not None else [])
+        maxBuckets = max((pointBudget or self.pointBudget) // 2, 1)
+        if len(buckets) > maxBuckets:
+            buckets = self.mergeBuckets(buckets, maxBuckets)
+        points = []
+        for minX, minY, maxX, maxY in buckets:
+            if (minX, minY) == (maxX, maxY):
+                points.append((minX, minY))
+            elif minX <= maxX:
+                points.extend(((minX, minY), (maxX, maxY)))
+            else:
+                points.extend(((maxX, maxY), (minX, minY)))
+        return points
+
+class HTMLWriter:
+    """
+    Class for writing a self-contained static HTML report of the records parsed (no external scripts, styles, or services),
+    charting memory footprint over run time and hitch durations over log lines, per log file,
+    with the machine information, hitches joined with memory samples, hitch and memory summaries (percentile tables), error groups, and log spam in paginated tables.
+
+    The size of the report does not grow with the input: each series is downsampled as its records arrive (see SeriesDownsampler),
+    at most maxSeries log files are charted (those with the most records), the charts share pointBudget points,
+    and each table keeps its first maxRows - tailRows rows (error groups arrive most occurrences first) and its last tailRows rows 
+    (the machine and all log file rows of the summaries arrive last), cutting the rows between them.
+    Nor does the memory used to collect them: only the series of maxCandidates log files are kept while records arrive, 
+    the series of the log file with the fewest records being dropped for the series of each new log file once there are more. 
+    As the records of a log file arrive together (other than when following log files), the maxSeries log files with the most records 
+    are always among them.
+    Charts are rendered to inline SVG when the report is written, and tables are embedded as JSON and rendered a page at a time,
+    so the page renders in the same time however large the logs parsed were.
+    Provides writeRecords, flushReports, and closeReports in the same form as CSVWriter, and collectRecords in the form of SQLiteWriter.ingestRecords.
+
+    Attributes
+    ----------
+    fileName : str
+        HTML report file name.
+    pointBudget : int
+        Defaults to 2000 (maximum number of points drawn per chart).
+    maxSeries : int
+        Defaults to 10 (maximum number of log files drawn per chart).
+    maxCandidates : int
+        Defaults to 2 * maxSeries (maximum number of series kept per chart while records arrive).
+    maxRows : int
+        Defaults to 1000 (maximum number of rows kept per table).
+    tailRows : int
+        Defaults to 100 (number of the rows kept per table that are its last rows).
+    pageSize : int
+        Defaults to 25 (number of table rows shown per page).
+    maxTextLength : int
+        Defaults to 500 (maximum number of characters kept per table cell, e.g. of an example error message).
+    memorySeries{} : SeriesDownsampler
+        Stores the (run time, footprint) series of each log file kept, by log file name.
+    hitchSeries{} : SeriesDownsampler
+        Stores the (log line, duration) series of each log file kept, by log file name.
+    memoryCounts{} : int
+        Stores the number of memory records of each log file, by log file name.
+    hitchCounts{} : int
+        Stores the number of hitch records of each log file, by log file name.
+    tables{} : tuple
+        Stores the (element id, title) of the table of each record type shown in the report.
+    headers{} : list
+        Stores the column names of each record type (the csv report columns).
+    tableRows{} : tuple
+        Stores the (first rows, last rows) kept of each record type, by record type.
+    recordCounts{} : int
+        Stores the number of records written, by record type.
+    writeFailed : bool
+        Defaults to False, set once writing the report fails.
+
+    Methods
+    -------
+    __init__(fileName:str, pointBudget:int)
+        Constructor.
+        Initializes the following attributes:
+        fileName, pointBudget, maxSeries, maxCandidates, maxRows, tailRows, pageSize, maxTextLength, memorySeries, hitchSeries, 
+        memoryCounts, hitchCounts, tables, headers, tableRows, recordCounts, writeFailed.
+
+    getSeries(series:dict, counts:Counter, logName:str) -> SeriesDownsampler
+        Counts a record of logName, and gets its series, starting one (and dropping the smallest) if it has none.
+
+    collectRecords(records:iterable) -> generator
+        Adds each record to its series or table, and yields every record on (so the same records can be written to reports).
+
+    writeRecords(records:iterable)
+        Adds each record to its series or table.
+
+    flushReports()
+        Does nothing, the report is written once, by closeReports.
+
+    closeReports()
+        Renders the charts and tables, and writes the report.
+
+    checkForExistingFile(fileName:str) -> str
+        Evaluates path for existing file of name to avoid overwriting.
+        :returns: fileName - either fileName with an (n) duplicate value before its extension, or same value that was initially passed
+        :rtype: str
+
+    getTicks(low:float, high:float, count:int) -> list
+        Gets evenly spaced axis values at round numbers covering low to high.
+
+    renderChart(title:str, series:dict, counts:Counter, xLabel:str, yLabel:str, lines:bool) -> str
+        Renders the largest series as an SVG chart.
+
+    renderReport() -> str
+        Renders the report.
+
+    writeRecordsToHTML(records:generator)
+        Consumes records as they arrive (e.g. the lists of a batch run), and writes the report.
+    """
+    colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
+    style = ("body{font-family:sans-serif;margin:24px;color:#222}h1{font-size:22px}h2{font-size:18px;margin-top:32px}"
+             "table{border-collapse:collapse;font-size:13px}th,td{border:1px solid #ccc;padding:3px 6px;text-align:left;vertical-align:top}"
+             "th{background:#f2f2f2}td{white-space:pre-wrap;max-width:600px}.pager{margin:6px 0}.pager button{margin-right:6px}"
+             "svg text{font-size:11px;fill:#444}.legend span{display:inline-block;margin-right:14px;font-size:12px}"
+             ".note{color:#666;font-size:12px}")
+    script = ("const data=JSON.parse(document.getElementById('reportData').textContent);"
+              "function renderTable(id,page){const table=data.tables[id],section=document.getElementById(id),"
+              "pages=Math.max(1,Math.ceil(table.rows.length/data.pageSize));page=Math.min(Math.max(page,0),pages-1);"
+              "const element=document.createElement('table'),head=element.createTHead().insertRow();"
+              "for(const column of table.columns){const cell=document.createElement('th');cell.textContent=column;head.appendChild(cell);}"
+              "const body=element.createTBody();"
+              "for(const row of table.rows.slice(page*data.pageSize,(page+1)*data.pageSize)){const line=body.insertRow();"
+              "for(const value of row){line.insertCell().textContent=value===null?'':value;}}"
+              "const pager=document.createElement('div');pager.className='pager';"
+              "for(const [label,target] of [['First',0],['Previous',page-1],['Next',page+1],['Last',pages-1]]){"
+              "const button=document.createElement('button');button.textContent=label;button.disabled=target<0||target>=pages||target===page;"
+              "button.onclick=()=>renderTable(id,target);pager.appendChild(button);}"
+              "pager.appendChild(document.createTextNode('Page '+(page+1)+' of '+pages+', '+table.kept+' of '+table.total+' rows'));"
+              "section.replaceChildren(pager,element);}"
+              "for(const id in data.tables){renderTable(id,0);}")
+
+    def __init__(self, fileName="LogParserReport.html", pointBudget=2000) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        fileName, pointBudget, maxSeries, maxCandidates, maxRows, tailRows, pageSize, maxTextLength, memorySeries, hitchSeries, 
+        memoryCounts, hitchCounts, tables, headers, tableRows, recordCounts, writeFailed."""
+        self.fileName = fileName
+        self.pointBudget = pointBudget
+        self.maxSeries = 10
+        self.maxCandidates = 2 * self.maxSeries
+        self.maxRows = 1000
+        self.tailRows = 100
+        self.pageSize = 25
+        self.maxTextLength = 500
+        self.memorySeries = {}
+        self.hitchSeries = {}
+        self.memoryCounts = Counter()
+        self.hitchCounts = Counter()
+        self.tables = {SystemInfoRecord: ("systemInfo", "Machine Information"),
+                       HitchMemoryRecord: ("hitchMemory", "Hitches with Memory Footprints"),
+                       HitchSummaryRecord: ("hitchSummary", "Hitch Summary"),
+                       MemorySummaryRecord: ("memorySummary", "Memory Summary"),
+                       MemoryTrendRecord: ("memoryTrend", "Memory Trend"),
+                       ErrorGroupRecord: ("errorGroups", "Error Groups"),
+                       SpamRecord: ("logSpam", "Log Spam")}
+        self.headers = {recordType: header for recordType, (reportName, header) in CSVWriter().reports.items()}
+        self.tableRows = {}
+        self.recordCounts = Counter()
+        self.writeFailed = False
+
+    def getSeries(self, series, counts, logName) -> SeriesDownsampler:
+        """Counts a record of logName, and gets its series, starting one if it has none (e.g. its first record), 
+        after dropping the series of the log file with the fewest records if maxCandidates series are kept.
+        A log file whose series was dropped starts a new one if more of its records arrive (e.g. when following log files).
+
+        :param series: SeriesDownsampler of each log file kept, by log file name
+        :type series: dict
+        :param counts: number of records of each log file, by log file name
+        :type counts: Counter
+        :param logName: log file name of the record
+        :type logName: str
+        :returns: series of logName
+        :rtype: SeriesDownsampler"""
+        counts[logName] += 1
+        downsampler = series.get(logName)
+        if downsampler is None:
+            if len(series) >= self.maxCandidates:
+                del series[min(series, key=counts.__getitem__)]
+            downsampler = series[logName] = SeriesDownsampler(self.pointBudget)
+        return downsampler
+
+    def collectRecords(self, records):
+        """Adds each memory and hitch record to the series of its log file (see getSeries), and each record with a table to its table 
+        (its first maxRows - tailRows rows, and its last tailRows rows), and yields every record on 
+        (so the same records can be written to reports, e.g. CSVWriter.writeRecordsToCSV(objHTMLWriter.collectRecords(records))).
+
+        :param records: records of any type, in any order
+        :type records: iterable
+        :returns: records, unchanged
+        :rtype: generator"""
+        getSeries, tableRows, recordCounts = self.getSeries, self.tableRows, self.recordCounts
+        for record in records:
+            recordType = type(record)
+            recordCounts[recordType] += 1
+            if recordType is MemoryRecord:
+                getSeries(self.memorySeries, self.memoryCounts, record.logName).add(record.runTime, record.footprint)
+            elif recordType is HitchRecord:
+                getSeries(self.hitchSeries, self.hitchCounts, record.logName).add(record.lineNumber, record.duration)
+            elif recordType in self.tables:
+                rows = tableRows.get(recordType)
+                if rows is None:
+                    rows = tableRows[recordType] = ([], deque(maxlen=self.tailRows))
+                firstRows, lastRows = rows
+                row = [value[:self.maxTextLength] if isinstance(value, str) else value for value in record]
+                if len(firstRows) < self.maxRows - self.tailRows:
+                    firstRows.append(row)
+                else:
+                    lastRows.append(row)
+            yield record
+
+    def writeRecords(self, records):
+        """Adds each record to its series or table.
+
+        :param records: records of any type, in any order
+        :type records: iterable"""
+        for record in self.collectRecords(records):
+            pass
+
+    def flushReports(self):
+        """Does nothing, the report is a single static file, written once by closeReports."""
+        pass
+
+    def closeReports(self):
+        """Renders the charts and tables, and writes the report (numbered if a report of the same name exists)."""
+        fileName = self.checkForExistingFile(self.fileName)
+        with open(fileName, 'w', encoding='utf-8') as reportFile:
+            reportFile.write(self.renderReport())
+        logging.info("HTML report written to: " + fileName)
+
+    def checkForExistingFile(self, fileName) -> str:
+        """Evaluates path for existing file of name to avoid overwriting.
+        If file of name exists, increments duplicate number and reevaluates until a match does not exist.
+
+        :param fileName: desired file name to be created
+        :type fileName: str
+        :returns: fileName - either fileName with an (n) duplicate value before its extension, or same value that was initially passed
+        :rtype: str"""
+        baseName, extension = os.path.splitext(fileName)
+        fileDupeNum = 0
+        while os.path.isfile(fileName):
+            logging.info(fileName + " already exists")
+            fileDupeNum += 1
+            fileName = baseName + "(" + str(fileDupeNum) + ")" + extension
+        logging.info("Creating HTML file: " + fileName)
+        return fileName
+
+    def getTicks(self, low, high, count=5) -> list:
+        """Gets evenly spaced axis values at round numbers (1, 2, or 5 times a power of ten apart) covering low to high.
+
+        :param low: lowest value
+        :type low: float
+        :param high: highest value
+        :type high: float
+        :param count: approximate number of values
+        :type count: int
+        :returns: list of axis values, the first at or below low and the last at or above high
+        :rtype: list"""
+        if high <= low:
+            high = low + 1
+        step = (high - low) / count
+        magnitude = 10 ** math.floor(math.log10(step))
+        step = next(multiple * magnitude for multiple in (1, 2, 5, 10) if multiple * magnitude >= step)
+        first = math.floor(low / step)
+        return [index * step for index in range(first, math.ceil(high / step) + 1)]
+
+    def renderChart(self, title, series, counts, xLabel, yLabel, lines=True) -> str:
+        """Renders the series of the maxSeries log files with the most records as an SVG chart, sharing pointBudget points between them, 
+        with axes and a legend.
+
+        :param title: chart title
+        :type title: str
+        :param series: SeriesDownsampler of each log file kept, by log file name
+        :type series: dict
+        :param counts: number of records of each log file, by log file name
+        :type counts: Counter
+        :param xLabel: x axis label
+        :type xLabel: str
+        :param yLabel: y axis label
+        :type yLabel: str
+        :param lines: True to join the points with lines (a continuous series), False to draw each point (events)
+        :type lines: bool
+        :returns: HTML of the chart section
+        :rtype: str"""
+        section = ["<h2>" + html.escape(title) + "</h2>"]
+        charted = sorted(series.items(), key=lambda item: -counts[item[0]])[:self.maxSeries]
+        points = {logName: downsampler.getPoints(self.pointBudget // max(len(charted), 1)) for logName, downsampler in charted}
+        allPoints = [point for seriesPoints in points.values() for point in seriesPoints]
+        if not allPoints:
+            section.append('<p class="note">No records.</p>')
+            return "\n".join(section)
+
+        width, height, left, right, top, bottom = 960, 320, 70, 20, 10, 40
+        xTicks = self.getTicks(min(x for x, y in allPoints), max(x for x, y in allPoints))
+        yTicks = self.getTicks(min(0, min(y for x, y in allPoints)), max(y for x, y in allPoints))
+        xScale = (width - left - right) / (xTicks[-1] - xTicks[0])
+        yScale = (height - top - bottom) / (yTicks[-1] - yTicks[0])
+        toX = lambda x: round(left + (x - xTicks[0]) * xScale, 1)
+        toY = lambda y: round(height - bottom - (y - yTicks[0]) * yScale, 1)
+
+        svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" viewBox="0 0 %d %d">' % (width, height, width, height)]
+        for tick in xTicks:
+            svg.append('<line x1="%s" y1="%d" x2="%s" y2="%d" stroke="#eee"/><text x="%s" y="%d" text-anchor="middle">%g</text>'
+                       % (toX(tick), top, toX(tick), height - bottom, toX(tick), height - bottom + 14, tick))
+        for tick in yTicks:
+            svg.append('<line x1="%d" y1="%s" x2="%d" y2="%s" stroke="#eee"/><text x="%d" y="%s" text-anchor="end">%g</text>'
+                       % (left, toY(tick), width - right, toY(tick), left - 6, toY(tick) + 4, tick))
+        svg.append('<text x="%d" y="%d" text-anchor="middle">%s</text>' % ((left + width - right) // 2, height - 6, html.escape(xLabel)))
+        svg.append('<text x="12" y="%d" text-anchor="middle" transform="rotate(-90 12 %d)">%s</text>'
+                   % ((top + height - bottom) // 2, (top + height - bottom) // 2, html.escape(yLabel)))
+        legend = ['<div class="legend">']
+        for index, (logName, seriesPoints) in enumerate(points.items()):
+            color = self.colors[index % len(self.colors)]
+            name = html.escape(logName)
+            if lines:
+                svg.append('<polyline fill="none" stroke="%s" stroke-width="1.2" points="%s"><title>%s</title></polyline>'
+                           % (color, " ".join("%s,%s" % (toX(x), toY(y)) for x, y in seriesPoints), name))
+            else:
+                svg.append('<g fill="%s"><title>%s</title>%s</g>'
+                           % (color, name, "".join('<circle cx="%s" cy="%s" r="2"/>' % (toX(x), toY(y)) for x, y in seriesPoints)))
+            legend.append('<span style="color:%s">&#9632; %s (%d of %d points)</span>' % (color, name, len(seriesPoints), counts[logName]))
+        svg.append("</svg>")
+        legend.append("</div>")
+        section.extend(svg + legend)
+        if len(counts) > len(charted):
+            section.append('<p class="note">%d more log files not charted (the %d with the most records are).</p>' % (len(counts) - len(charted), len(charted)))
+        return "\n".join(section)
+
+    def renderReport(self) -> str:
+        """Renders the report: record counts, the memory and hitch charts, and the tables (as JSON, rendered a page at a time by the page's script).
+
+        :returns: HTML document
+        :rtype: str"""
+        counts = self.recordCounts
+        tables = {}
+        for recordType, (elementId, title) in self.tables.items():
+            firstRows, lastRows = self.tableRows.get(recordType, ([], ()))
+            rows = firstRows + list(lastRows)
+            if counts[recordType] > len(rows): # marks where the rows not kept were cut
+                rows = firstRows + [["(%d rows not kept)" % (counts[recordType] - len(rows))] + [None] * (len(self.headers[recordType]) - 1)] + list(lastRows)
+            tables[elementId] = {"columns": self.headers[recordType], "rows": rows, "kept": len(firstRows) + len(lastRows), "total": counts[recordType]}
+        data = json.dumps({"pageSize": self.pageSize, "tables": tables}, separators=(",", ":")).replace("</", "<\\/")
+
+        document = ["<!DOCTYPE html>",
+                    '<html lang="en"><head><meta charset="utf-8"><title>LogParser Report</title><style>' + self.style + "</style></head><body>",
+                    "<h1>LogParser Report</h1>",
+                    '<p class="note">Generated %s from %d log files: %d hitches, %d memory footprints, %d errors.</p>'
+                    % (html.escape(str(datetime.datetime.now())), len(set(self.memoryCounts) | set(self.hitchCounts)),
+                       counts[HitchRecord], counts[MemoryRecord], counts[ErrorRecord]),
+                    self.renderChart("Memory Footprint", self.memorySeries, self.memoryCounts, "Run Time", "Footprint (MiB)", lines=True),
+                    self.renderChart("Hitch Durations", self.hitchSeries, self.hitchCounts, "Log Line", "Duration (ms)", lines=False)]
+        for recordType, (elementId, title) in self.tables.items():
+            document.append("<h2>" + html.escape(title) + '</h2><div id="' + elementId + '"><noscript>Tables require JavaScript.</noscript></div>')
+        document.append('<script type="application/json" id="reportData">' + data + "</script>")
+        document.append("<script>" + self.script + "</script>")
+        document.append("</body></html>")
+        return "\n".join(document)
+
+    @timed
+    def writeRecordsToHTML(self, records):
+        """Consumes records as they arrive (e.g. the lists of a batch run), and writes the report.
+
+        :param records: records of any type, in any order
+        :type records: generator"""
+        try:
+            try:
+                self.writeRecords(records)
+            finally:
+                self.closeReports()
+        except Exception as e:
+            logging.exception(e)
+            self.writeFailed = True
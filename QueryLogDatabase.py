@@ -0,0 +1,108 @@
+"""
+William Fissler 2023
+
+QueryLogDatabase.py
+
+A program that queries the SQLite database of records indexed by LogParser.py (run with --sqlite),
+and prints the matching rows to the terminal window in csv format, without re-parsing any log files.
+
+Tables (the logName of the record tables is the absolute path of the log file, the path of the logs table):
+- hitches: logName, lineNumber, thread, duration
+- hitchMemory: logName, lineNumber, thread, duration, memoryLineNumber, footprint, footprintDelta, runTime (the nearest preceding memory sample)
+- memory: logName, lineNumber, footprint, runTime
+- errors: logName, lineNumber, errorType, message, timeStamp (seconds since 1970-01-01)
+- systems: logName, lineNumber, pythonVersion, host, operatingSystem, cpu, physicalCores, logicalCores, totalMemory, availableMemory
+- logs: path, logName, contentHash, size, mtime (nanoseconds), ingested
+
+Examples:
+- Hitches over 2000ms on MainThread, in log files modified in the last week:
+  python QueryLogDatabase.py --table hitches --thread MainThread --min-duration 2000 --days 7
+- Any SQL statement:
+  python QueryLogDatabase.py --sql "SELECT errorType, COUNT(*) FROM errors GROUP BY errorType"
+- Hitches per machine class (host and core count), joined on log file name:
+  python QueryLogDatabase.py --sql "SELECT host, physicalCores, COUNT(*), AVG(duration), MAX(duration) FROM hitches JOIN systems USING (logName) GROUP BY host, physicalCores"
+
+"""
+
+import argparse, csv, os, sys, time, sqlite3
+from urllib.request import pathname2url
+
+def buildQuery(args) -> tuple:
+    """Builds the SELECT statement for the filters passed.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    :returns: (sql, parameters)
+    :rtype: tuple"""
+    conditions = []
+    parameters = []
+    if args.log:
+        conditions.append("logName LIKE ?")
+        parameters.append(args.log)
+    if args.thread and args.table in ("hitches", "hitchMemory"):
+        conditions.append("thread = ?")
+        parameters.append(args.thread)
+    if args.min_duration is not None and args.table in ("hitches", "hitchMemory"):
+        conditions.append("duration >= ?")
+        parameters.append(args.min_duration)
+    if args.error_type and args.table == "errors":
+        conditions.append("errorType = ?")
+        parameters.append(args.error_type)
+    if args.days is not None:
+        conditions.append("logName IN (SELECT path FROM logs WHERE mtime >= ?)")
+        parameters.append(int((time.time() - args.days * 86400) * 1e9))
+
+    sql = "SELECT * FROM " + args.table
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY logName, lineNumber LIMIT ?"
+    parameters.append(args.limit)
+    return sql, tuple(parameters)
+
+def queryDatabase(fileName, sql, parameters=()) -> tuple:
+    """Runs a query against the database, opened read-only (so a query never creates tables, changes the journal mode, 
+    or modifies the database, e.g. with --sql "DELETE ...", and can run while LogParser.py writes to it).
+
+    :param fileName: SQLite database file name
+    :type fileName: str
+    :param sql: SQL statement, with ? placeholders for parameters
+    :type sql: str
+    :param parameters: values of the placeholders
+    :type parameters: tuple
+    :returns: (column names, rows)
+    :rtype: tuple"""
+    connection = sqlite3.connect("file:" + pathname2url(os.path.abspath(fileName)) + "?mode=ro", uri=True)
+    try:
+        cursor = connection.execute(sql, parameters)
+        return [column[0] for column in cursor.description or ()], cursor.fetchall()
+    finally:
+        connection.close()
+
+def main():
+    """Defines order of execution for the application"""
+    argParser = argparse.ArgumentParser(description="Queries the SQLite database of records indexed by LogParser.py --sqlite.")
+    argParser.add_argument("--database", default=os.path.join("Logs", "LogParser.db"), help="SQLite database file (default: Logs/LogParser.db)")
+    argParser.add_argument("--table", choices=["hitches", "hitchMemory", "memory", "errors", "systems"], default="hitches", help="table to select rows from (default: hitches)")
+    argParser.add_argument("--log", help="absolute path of the log file, SQL LIKE wildcards (%%, _) allowed, e.g. %%CreateArbitraryLog_1.log")
+    argParser.add_argument("--thread", help="hitches and hitchMemory: thread name")
+    argParser.add_argument("--min-duration", type=float, help="hitches and hitchMemory: minimum duration (ms)")
+    argParser.add_argument("--error-type", help="errors: error type, e.g. NameError")
+    argParser.add_argument("--days", type=float, help="only log files modified within this many days")
+    argParser.add_argument("--limit", type=int, default=1000, help="maximum number of rows printed (default: 1000)")
+    argParser.add_argument("--sql", help="run this SQL statement instead of the filters above")
+    args = argParser.parse_args()
+
+    if not os.path.isfile(args.database):
+        print("No database found at: " + args.database + " (run LogParser.py --sqlite first)")
+        return
+
+    sql, parameters = (args.sql, ()) if args.sql else buildQuery(args)
+    columns, rows = queryDatabase(args.database, sql, parameters)
+
+    writer = csv.writer(sys.stdout, dialect='excel')
+    writer.writerow(columns)
+    writer.writerows(rows)
+
+# Execute!
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+William Fissler 2023
+
+RunTimer.py
+
+Timing of the stages of a LogParser.py run, and the peak memory of the run, for its log file and machine-readable run summary.
+Imported by each module with stages to time, so the run starts when the first of them is loaded.
+"""
+
+import logging, datetime, platform, time, json, inspect
+from collections import Counter
+from functools import wraps
+from contextlib import contextmanager
+
+try:
+    import resource # not available on Windows
+except ImportError:
+    resource = None
+
+class RunTimer:
+    """
+    Class for timing the stages of a run and counting the data parsed, for the log file and a machine-readable run summary.
+
+    Durations are measured with time.perf_counter_ns (monotonic, and in integer nanoseconds, so repeated stages add up exactly),
+    and recorded per stage: each call of a function decorated with timed, or each block run in a stage context.
+    Each duration is also written to the log file, in seconds, as its stage completes.
+    Bytes and lines parsed, and records matched per category, are counted as each parsed range is consumed,
+    so the summary reports throughput as well as durations.
+
+    Attributes
+    ----------
+    startTime : int
+        perf_counter_ns when the timer was created (when the module is loaded, the start of the run).
+    startedAt : str
+        Wall clock time the timer was created at.
+    stages{} : list
+        Stores the [calls, total nanoseconds] of each stage, by stage name, in the order first completed.
+    bytesRead : int
+        Number of bytes of log files parsed.
+    linesParsed : int
+        Number of log lines parsed.
+    matches{} : int
+        Stores the number of records parsed, by category (hitch, memory, error, systemInfo, logSpam).
+    workerCount : int
+        Largest number of worker processes a pool of the run was started with (0 if log files were only parsed by this process).
+
+    Methods
+    -------
+    __init__
+        Constructor.
+        Initializes the following attributes:
+        startTime, startedAt, stages, bytesRead, linesParsed, matches, workerCount.
+
+    stage(name:str)
+        Context manager that records the duration of its block as a call of stage name.
+
+    timed(function:function) -> function
+        Decorator that records the duration of each call of function (or for a generator function, of iterating it) as a stage.
+
+    countParsed(byteCount:int, lineCount:int, **matches)
+        Adds the bytes and lines of a parsed range, and the number of records matched per category.
+
+    getElapsed() -> float
+        Gets the seconds elapsed since the start of the run.
+
+    getSummary() -> dict
+        Summarizes the run: elapsed time, peak memory, data parsed, throughput, matches per category, and stage durations.
+
+    writeSummary(fileName:str, details:dict)
+        Writes getSummary (updated with details) to fileName as JSON.
+    """
+    def __init__(self) -> None:
+        """Constructor.
+        Initializes the following attributes:
+        startTime, startedAt, stages, bytesRead, linesParsed, matches, workerCount."""
+        self.startTime = time.perf_counter_ns()
+        self.startedAt = datetime.datetime.now().isoformat()
+        self.stages = {}
+        self.bytesRead = 0
+        self.linesParsed = 0
+        self.matches = Counter()
+        self.workerCount = 0
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager that records the duration of its block as a call of stage name (even if the block raises).
+
+        :param name: stage name
+        :type name: str"""
+        stageStart = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - stageStart
+            stage = self.stages.get(name)
+            if stage is None:
+                self.stages[name] = [1, duration]
+            else:
+                stage[0] += 1
+                stage[1] += duration
+            logging.info("Time to execute %s: %.5f seconds", name, duration / 1e9)
+
+    def timed(self, function):
+        """Decorator that records the duration of each call of function as a stage named by its qualified name (e.g. CSVWriter.writeHitchToCSV).
+        A generator function is timed from its first to its last item, as its work happens while it is iterated.
+
+        :param function: function to be timed
+        :type function: function
+        :returns: wrapper - function recording the duration of each call
+        :rtype: function"""
+        name = function.__qualname__
+        if inspect.isgeneratorfunction(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return (yield from function(*args, **kwargs))
+        else:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return function(*args, **kwargs)
+        return wrapper
+
+    def countParsed(self, byteCount, lineCount, **matches):
+        """Adds the bytes and lines of a parsed range, and the number of records matched per category.
+
+        :param byteCount: bytes parsed
+        :type byteCount: int
+        :param lineCount: lines parsed
+        :type lineCount: int
+        :param matches: number of records matched, by category (e.g. hitch=3)
+        :type matches: int"""
+        self.bytesRead += byteCount
+        self.linesParsed += lineCount
+        self.matches.update(matches)
+
+    def getElapsed(self) -> float:
+        """Gets the seconds elapsed since the start of the run.
+
+        :rtype: float"""
+        return (time.perf_counter_ns() - self.startTime) / 1e9
+
+    def getSummary(self) -> dict:
+        """Summarizes the run: elapsed time, peak memory, data parsed, throughput (over the whole run), matches per category,
+        and the calls and total duration of each stage.
+
+        :returns: summary - JSON serializable dictionary
+        :rtype: dict"""
+        elapsed = self.getElapsed()
+        peakMemory, workerPeakMemory = getPeakMemory()
+        return {"startedAt": self.startedAt,
+                "elapsedSeconds": round(elapsed, 6),
+                "peakMemoryMiB": None if peakMemory is None else round(peakMemory / 1024**2, 2),
+                "workerPeakMemoryMiB": None if not workerPeakMemory else round(workerPeakMemory / 1024**2, 2),
+                "bytesRead": self.bytesRead,
+                "linesParsed": self.linesParsed,
+                "linesPerSecond": round(self.linesParsed / elapsed, 1) if elapsed > 0 else None,
+                "mibPerSecond": round(self.bytesRead / 1024**2 / elapsed, 3) if elapsed > 0 else None,
+                "matches": dict(self.matches),
+                "stages": {name: {"calls": calls, "seconds": round(duration / 1e9, 6)} for name, (calls, duration) in self.stages.items()}}
+
+    def writeSummary(self, fileName, details=None):
+        """Writes getSummary (updated with details, e.g. the command line arguments) to fileName as JSON.
+
+        :param fileName: JSON file name
+        :type fileName: str
+        :param details: additional entries of the summary
+        :type details: dict"""
+        summary = self.getSummary()
+        summary.update(details or {})
+        with open(fileName, 'w', encoding='utf-8') as summaryFile:
+            json.dump(summary, summaryFile, indent=2)
+        logging.info("Run summary written to: " + fileName)
+
+runTimer = RunTimer() # the run starts when the module is loaded
+timed = runTimer.timed
+
+def getPeakMemory() -> tuple:
+    """Gets the peak resident set size (RSS) of this process, and of its largest (finished) worker process.
+    Uses the resource module where available (Linux/macOS), otherwise psutil's peak working set (Windows).
+    The worker peak is only reported once a worker pool has run (runTimer.workerCount), 
+    as RUSAGE_CHILDREN otherwise measures unrelated child processes, if any.
+    
+    :returns: (peakMemory, workerPeakMemory) - in bytes, either of which is None if it cannot be determined (or no worker ran)
+    :rtype: tuple"""
+    try:
+        if resource is not None:
+            # ru_maxrss is reported in bytes on macOS, and kilobytes elsewhere
+            scale = 1 if platform.system() == "Darwin" else 1024
+            workerPeakMemory = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale if runTimer.workerCount else None
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale, workerPeakMemory
+        import psutil
+        return getattr(psutil.Process().memory_info(), "peak_wset", None), None
+    except Exception as e:
+        logging.exception(e)
+        return None, None
@@ -0,0 +1,38 @@
+"""
+Shared fixtures of the LogParser.py tests: the modules are imported from the repository root, 
+log files are generated reproducibly by CreateArbitraryLog.LogGenerator, and end to end runs start LogParser.py in a temporary directory.
+"""
+
+import os, sys, csv, subprocess
+
+import pytest
+
+repositoryRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repositoryRoot)
+
+from CreateArbitraryLog import LogGenerator
+
+@pytest.fixture
+def logsDirectory(tmp_path):
+    """Logs directory of a temporary working directory, as LogParser.py expects."""
+    directory = tmp_path / "Logs"
+    directory.mkdir()
+    return directory
+
+def writeLog(directory, name="CreateArbitraryLog_test.log", lines=20000, seed=0, mix=LogGenerator.defaultMix):
+    """Writes a generated log file to directory, returning its path."""
+    fileName = os.path.join(str(directory), name)
+    LogGenerator(seed, mix).writeLog(fileName, lines)
+    return fileName
+
+def runLogParser(workingDirectory, *arguments):
+    """Runs LogParser.py in workingDirectory (whose Logs directory holds the log files), failing the test if it exits with an error."""
+    completed = subprocess.run([sys.executable, os.path.join(repositoryRoot, "LogParser.py"), *arguments], cwd=str(workingDirectory), 
+                               capture_output=True, text=True, timeout=300)
+    assert completed.returncode == 0, completed.stderr
+    return completed
+
+def readReport(directory, name):
+    """Reads the rows of a csv report (less its header)."""
+    with open(os.path.join(str(directory), name), newline='', encoding='utf-8') as report:
+        return list(csv.reader(report))[1:]
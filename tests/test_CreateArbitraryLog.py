@@ -0,0 +1,47 @@
+"""
+Tests of CreateArbitraryLog.py: generated logs are reproducible, and exactly as long as asked for, 
+and the batched writer of --threads writes time stamps in order.
+"""
+
+import os, io, sys, time, logging, subprocess
+
+import pytest
+
+from conftest import repositoryRoot, writeLog
+from CreateArbitraryLog import LogGenerator, BatchWriter
+from LogRecords import TimeStampParser
+
+class TestLogGenerator:
+    @pytest.mark.parametrize("lines", [10, 11, 500, 20000])
+    def test_exactly_lines_are_generated(self, lines):
+        assert sum(chunk.count("\n") for chunk in LogGenerator().generateChunks(lines)) == lines
+
+    def test_fewer_lines_than_the_system_information_are_rejected(self, tmp_path):
+        generator = LogGenerator()
+        with pytest.raises(ValueError):
+            list(generator.generateChunks(generator.systemInfoLines - 1))
+        completed = subprocess.run([sys.executable, os.path.join(repositoryRoot, "CreateArbitraryLog.py"), "--lines", "5",
+                                    "--output", str(tmp_path / "short.log")], cwd=str(tmp_path), capture_output=True, text=True)
+        assert completed.returncode == 2
+        assert "--lines" in completed.stderr
+        assert not (tmp_path / "short.log").exists()
+
+    def test_same_seed_generates_the_same_log(self, tmp_path):
+        with open(writeLog(tmp_path, "first.log", 5000, 3), 'rb') as first, open(writeLog(tmp_path, "second.log", 5000, 3), 'rb') as second:
+            assert first.read() == second.read()
+
+class TestBatchWriter:
+    def test_records_are_stamped_in_the_order_written(self):
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(logging.Formatter('[%(asctime)s.%(msecs)03d] - %(levelname)s - %(message)s', datefmt='%d%b%y_%H:%M:%S'))
+        batchWriter = BatchWriter(target, capacity=10)
+        for created in (time.time(), time.time() - 3600, time.time() - 7200): # queued out of creation order, e.g. by several producers
+            record = logging.LogRecord("root", logging.INFO, __file__, 0, "this is an arbitrary log", None, None)
+            record.created, record.msecs = created, 0.0
+            batchWriter.handle(record)
+        batchWriter.close()
+        parser = TimeStampParser()
+        timeStamps = [parser.parse(line.encode()) for line in stream.getvalue().splitlines()]
+        assert len(timeStamps) == 3 and None not in timeStamps
+        assert timeStamps == sorted(timeStamps)
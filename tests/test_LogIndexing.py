@@ -0,0 +1,265 @@
+"""
+Tests of LogIndexing.py: checkpoints, time stamps and time indexes, and the result cache.
+"""
+
+import os, math, json, gzip, zlib, shutil, datetime
+
+import pytest
+
+from conftest import writeLog
+from LogRecords import TimeStampParser
+from LogReaders import CriteriaMatcher, planLogChunks, parseLogChunk
+from LogIndexing import CheckpointStore, TimeIndex, ResultCache
+
+matcher = CriteriaMatcher([("hitch", "Hitch"), ("memory", "memory footprint"), ("error", "ERROR")])
+
+def appendLines(logName, text):
+    with open(logName, 'a', encoding='utf-8') as log:
+        log.write(text)
+
+def writeUnorderedLog(logName, records=20000, lateEvery=97, lateBy=0.5):
+    """Writes a log whose every lateEvery-th record is time stamped lateBy seconds before the records written before it, 
+    as records written by several threads are."""
+    with open(logName, 'w', encoding='utf-8') as log:
+        for index in range(records):
+            written = TimeStampParser.epoch + datetime.timedelta(days=19358, milliseconds=index - (lateBy * 1000 if index % lateEvery == 0 else 0))
+            log.write("[%s.%03d] - INFO - this is an arbitrary log\n" % (written.strftime("%d%b%y_%H:%M:%S"), written.microsecond // 1000))
+    return logName
+
+def timeStampsInRange(data, since, until):
+    parser = TimeStampParser()
+    return [seconds for seconds in map(parser.parse, data.split(b"\n")) if seconds is not None and since <= seconds <= until]
+
+class TestCheckpointStore:
+    def test_unchanged_log_has_an_empty_range(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        assert checkpoints.getRange(logName) == (0, os.path.getsize(logName), 0)
+        checkpoints.update(logName, None, 1000)
+        assert checkpoints.getRange(logName) == (os.path.getsize(logName), os.path.getsize(logName), 1000)
+
+    def test_replaced_log_is_parsed_from_the_start(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        os.remove(logName)
+        writeLog(tmp_path, lines=2000, seed=1)
+        assert checkpoints.getRange(logName)[0] == 0
+
+    def test_partial_last_record_is_left_for_a_later_run(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        size = os.path.getsize(logName)
+        appendLines(logName, "[01Jan23_00:00:09.000] - ERROR - name 'x' is not defined\nTraceback (most recent call last):")
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        assert checkpoints.getRange(logName) == (0, size, 0) # the error record is still being written
+        appendLines(logName, "\nNameError: name 'x' is not defined\n")
+        assert checkpoints.getRange(logName) == (0, os.path.getsize(logName), 0)
+
+    def test_grown_log_resumes_from_its_checkpoint(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        size = os.path.getsize(logName)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        appendLines(logName, "[01Jan23_00:00:09.000] - INFO - this is an arbitrary log\n")
+        assert checkpoints.getRange(logName) == (size, os.path.getsize(logName), 1000)
+
+    def test_rewritten_log_is_parsed_from_the_start(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        with open(logName, 'r+b') as log:
+            log.seek(os.path.getsize(logName) - 10)
+            log.write(b"rewritten\n")
+        appendLines(logName, "[01Jan23_00:00:09.000] - INFO - this is an arbitrary log\n")
+        assert checkpoints.getRange(logName) == (0, os.path.getsize(logName), 0)
+
+    def test_compressed_rotation_resumes_from_the_rotated_checkpoint(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        size = os.path.getsize(logName)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        appendLines(logName, "[01Jan23_00:00:09.000] - INFO - written before the rotation\n")
+        with open(logName, 'rb') as log, gzip.open(logName + ".gz", 'wb') as compressedLog:
+            shutil.copyfileobj(log, compressedLog)
+        os.remove(logName)
+        writeLog(tmp_path, lines=100, seed=1) # the new log file at the rotated path
+        assert checkpoints.getRange(logName + ".gz") == (size, None, 1000)
+        assert checkpoints.getRange(logName) == (0, os.path.getsize(logName), 0)
+        checkpoints.update(logName + ".gz", None, 1001)
+        assert checkpoints.getRange(logName + ".gz")[0] == checkpoints.getRange(logName + ".gz")[1] # unchanged since
+
+    def test_renamed_log_resumes_from_its_checkpoint(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        size = os.path.getsize(logName)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        os.rename(logName, str(tmp_path / "CreateArbitraryLog_renamed.log"))
+        assert checkpoints.getRange(str(tmp_path / "CreateArbitraryLog_renamed.log")) == (size, size, 1000)
+
+    def test_unrelated_compressed_log_is_parsed_whole(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        os.remove(logName)
+        otherName = writeLog(tmp_path, "CreateArbitraryLog_other.log", lines=1000, seed=1)
+        with open(otherName, 'rb') as log, gzip.open(otherName + ".gz", 'wb') as compressedLog:
+            shutil.copyfileobj(log, compressedLog)
+        assert checkpoints.getRange(otherName + ".gz") == (0, None, 0)
+
+    def test_save_and_load(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        checkpoints.save()
+        assert not os.path.exists(str(tmp_path / "checkpoints.json.tmp"))
+        assert CheckpointStore(str(tmp_path / "checkpoints.json")).checkpoints == checkpoints.checkpoints
+
+    def test_checkpoints_saved_without_aggregates_are_loaded(self, tmp_path):
+        logName = writeLog(tmp_path, lines=1000)
+        checkpoints = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        checkpoints.update(logName, None, 1000)
+        (tmp_path / "checkpoints.json").write_text(json.dumps(checkpoints.checkpoints))
+        loaded = CheckpointStore(str(tmp_path / "checkpoints.json"))
+        assert loaded.checkpoints == checkpoints.checkpoints and loaded.aggregates is None
+
+    def test_corrupt_store_starts_empty(self, tmp_path):
+        (tmp_path / "checkpoints.json").write_text("{not json")
+        assert CheckpointStore(str(tmp_path / "checkpoints.json")).checkpoints == {}
+
+class TestTimeStampParser:
+    def test_parse(self):
+        parser = TimeStampParser()
+        assert parser.parse(b"[01Jan23_00:00:01.250] - INFO - x") == TimeStampParser.parseArgument("2023-01-01T00:00:01.250")
+        assert parser.parse(b"[13Nov23_14:10:07.339]") == pytest.approx(TimeStampParser.parseArgument("2023-11-13T14:10:07.339"))
+        assert parser.parse(b" Python Version: 3.12.0") is None
+        assert parser.parse(b"[13Xyz23_14:10:07.339]") is None
+
+    def test_parse_argument(self):
+        assert TimeStampParser.parseArgument("13Nov23_14:10:07") == TimeStampParser.parseArgument("2023-11-13T14:10:07")
+        with pytest.raises(Exception):
+            TimeStampParser.parseArgument("yesterday")
+
+class TestTimeIndex:
+    def test_interval_must_be_positive(self, tmp_path):
+        with pytest.raises(ValueError):
+            TimeIndex(str(tmp_path / "index.json"), 0)
+
+    def test_entries_are_record_starts(self, tmp_path):
+        logName = writeLog(tmp_path, lines=50000)
+        timeIndex = TimeIndex(str(tmp_path / "index.json"), 16 * 1024)
+        entries = timeIndex.build(logName)
+        assert len(entries) > 50
+        with open(logName, 'rb') as log:
+            data = log.read()
+        parser = TimeStampParser()
+        for seconds, offset, lineCount in entries:
+            assert offset == 0 or data[offset - 1:offset + 1] == b"\n["
+            assert data.count(b"\n", 0, offset) == lineCount
+            assert parser.parse(data[offset:offset + 22]) <= seconds
+
+    def test_find_range_covers_the_time_range(self, tmp_path):
+        logName = writeLog(tmp_path, lines=50000)
+        timeIndex = TimeIndex(str(tmp_path / "index.json"), 16 * 1024)
+        timeIndex.build(logName)
+        since, until = TimeStampParser.parseArgument("01Jan23_00:00:05"), TimeStampParser.parseArgument("01Jan23_00:00:10")
+        start, end, lineCount = timeIndex.findRange(logName, since, until)
+        assert 0 < start < end < os.path.getsize(logName)
+        with open(logName, 'rb') as log:
+            data = log.read()
+        parser = TimeStampParser()
+        lines = data.split(b"\n")
+        selected = [seconds for seconds in map(parser.parse, lines) if seconds is not None and since <= seconds <= until]
+        ranged = [seconds for seconds in map(parser.parse, data[start:end].split(b"\n")) if seconds is not None and since <= seconds <= until]
+        assert ranged == selected
+        assert lineCount == data.count(b"\n", 0, start)
+        assert timeIndex.findRange(logName, -math.inf, math.inf) == (0, None, 0)
+
+    def test_out_of_order_time_stamps_are_within_the_range(self, tmp_path):
+        logName = writeUnorderedLog(str(tmp_path / "CreateArbitraryLog_unordered.log"))
+        timeIndex = TimeIndex(str(tmp_path / "index.json"), 4096)
+        entries = timeIndex.build(logName)
+        with open(logName, 'rb') as log:
+            data = log.read()
+        base = entries[0][0]
+        for since, until in [(base + 5.0, base + 10.0), (base + 2.0, base + 2.4), (base + 9.3, base + 15.7)]:
+            start, end, lineCount = timeIndex.findRange(logName, since, until)
+            assert timeStampsInRange(data[start:end], since, until) == timeStampsInRange(data, since, until)
+            assert lineCount == data.count(b"\n", 0, start)
+            
+    def test_parsed_entries_fill_the_index(self, tmp_path):
+        logName = writeLog(tmp_path, lines=50000)
+        timeIndex = TimeIndex(str(tmp_path / "index.json"), 16 * 1024)
+        entries, lineOffset = [], 0
+        for start, end in planLogChunks(logName, 256 * 1024):
+            result = parseLogChunk(logName, start, end, matcher, indexInterval=timeIndex.interval)
+            entries += ([seconds, offset, linesAt + lineOffset] for seconds, offset, linesAt in result[5])
+            lineOffset += result[3]
+        timeIndex.update(logName, 0, entries)
+        filled = timeIndex.indexes[os.path.abspath(logName)]["entries"]
+        assert len(filled) > 50
+        assert all(later[1] - earlier[1] >= timeIndex.interval for earlier, later in zip(filled, filled[1:]))
+        with open(logName, 'rb') as log:
+            data = log.read()
+        for seconds, offset, lineCount in filled:
+            assert offset == 0 or data[offset - 1:offset + 1] == b"\n["
+            assert data.count(b"\n", 0, offset) == lineCount
+        assert timeIndex.build(logName) == filled # unchanged since filled
+        since, until = TimeStampParser.parseArgument("01Jan23_00:00:05"), TimeStampParser.parseArgument("01Jan23_00:00:10")
+        start, end, lineCount = timeIndex.findRange(logName, since, until)
+        assert timeStampsInRange(data[start:end], since, until) == timeStampsInRange(data, since, until)
+        
+    def test_entries_parsed_past_the_data_indexed_are_not_added(self, tmp_path):
+        logName = writeLog(tmp_path, lines=50000)
+        timeIndex = TimeIndex(str(tmp_path / "index.json"), 16 * 1024)
+        start, end = planLogChunks(logName, 256 * 1024)[1]
+        timeIndex.update(logName, start, parseLogChunk(logName, start, end, matcher, indexInterval=timeIndex.interval)[5])
+        assert os.path.abspath(logName) not in timeIndex.indexes
+        timeIndex.build(logName, start) # the data preceding the range parsed
+        timeIndex.update(logName, start, parseLogChunk(logName, start, end, matcher, indexInterval=timeIndex.interval)[5])
+        assert timeIndex.indexes[os.path.abspath(logName)]["indexedTo"] > start
+        
+    def test_grown_log_is_indexed_from_where_it_left_off(self, tmp_path):
+        logName = writeLog(tmp_path, lines=20000)
+        timeIndex = TimeIndex(str(tmp_path / "index.json"), 16 * 1024)
+        timeIndex.build(logName)
+        timeIndex.save()
+        with open(logName, 'rb') as log:
+            data = log.read()
+        appendLines(logName, data.decode().split("\n", 10)[-1]) # the same records again, without the system information
+        grown = TimeIndex(str(tmp_path / "index.json"), 16 * 1024).build(logName)
+        assert grown == TimeIndex(str(tmp_path / "other.json"), 16 * 1024).build(logName)
+
+class TestResultCache:
+    def test_round_trip(self, tmp_path):
+        logName = writeLog(tmp_path, lines=20000)
+        result = parseLogChunk(logName, 0, None, matcher, spamCapacity=100)
+        cache = ResultCache(str(tmp_path / "cache"))
+        identity, size = cache.identify(logName)
+        assert cache.load(logName, identity, 0, None, "config") is None
+        cache.save(identity, 0, None, "config", result)
+        loaded = ResultCache(str(tmp_path / "cache")).load(logName, identity, 0, None, "config")
+        assert loaded[:4] == result[:4]
+        assert loaded[4].counts == result[4].counts
+        assert cache.load(logName, identity, 0, None, "other config") is None
+
+    def test_entries_are_json_not_pickles(self, tmp_path):
+        logName = writeLog(tmp_path, lines=20000)
+        result = parseLogChunk(logName, 0, None, matcher, spamCapacity=100, indexInterval=4096)
+        cache = ResultCache(str(tmp_path / "cache"))
+        identity, size = cache.identify(logName)
+        cache.save(identity, 0, None, "config", result)
+        for name in os.listdir(str(tmp_path / "cache")):
+            with open(str(tmp_path / "cache" / name), 'rb') as entry:
+                json.loads(zlib.decompress(entry.read()))
+        loaded = cache.load(logName, identity, 0, None, "config")
+        assert [type(records[0]) for records in loaded[:3]] == [type(records[0]) for records in result[:3]]
+        assert loaded[5] == [list(entry) for entry in result[5]] and loaded[5]
+
+    def test_least_recently_used_entries_are_removed(self, tmp_path):
+        logName = writeLog(tmp_path, lines=20000)
+        result = parseLogChunk(logName, 0, None, matcher)
+        cache = ResultCache(str(tmp_path / "cache"), maxBytes=1)
+        identity, size = cache.identify(logName)
+        cache.save(identity, 0, None, "first", result)
+        cache.save(identity, 0, None, "second", result)
+        assert len(os.listdir(str(tmp_path / "cache"))) <= 1
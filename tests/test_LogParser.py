@@ -0,0 +1,293 @@
+"""
+End to end tests of LogParser.py: each run parses the generated log files in the Logs directory of a temporary working directory,
+and its csv reports are compared with those of other modes, which must agree.
+"""
+
+import os, sys, time, glob, gzip, json, shutil, sqlite3, subprocess
+
+import pytest
+
+from conftest import repositoryRoot, writeLog, runLogParser, readReport
+from RunTimer import getPeakMemory
+from LogRecords import TimeStampParser
+
+recordReports = ("HitchReport.csv", "MemoryReport.csv", "ErrorReport.csv", "HitchMemoryReport.csv", "SystemInfoReport.csv")
+summaryReports = ("HitchSummary.csv", "MemorySummary.csv", "MemoryTrend.csv", "ErrorGroups.csv", "LogSpamReport.csv")
+
+def writeLogs(directory, count=3, lines=20000):
+    return [writeLog(directory, "CreateArbitraryLog_%d.log" % seed, lines, seed) for seed in range(count)]
+
+def removeReports(directory):
+    for name in os.listdir(str(directory)):
+        if name.endswith(".csv"):
+            os.remove(os.path.join(str(directory), name))
+
+def readReports(directory, names):
+    return {name: sorted(readReport(directory, name)) for name in names}
+
+@pytest.fixture
+def batchReports(tmp_path, logsDirectory):
+    """Reports of a default run over three generated log files."""
+    writeLogs(logsDirectory)
+    runLogParser(tmp_path)
+    return readReports(logsDirectory, recordReports + summaryReports)
+
+class TestModes:
+    @pytest.mark.parametrize("arguments", [("--stream",), ("--workers", "2", "--chunk-size", "1"), ("--reader", "blocks")])
+    def test_records_match_the_batch_run(self, tmp_path, logsDirectory, batchReports, arguments):
+        removeReports(logsDirectory)
+        runLogParser(tmp_path, *arguments)
+        reports = readReports(logsDirectory, recordReports)
+        for name in recordReports:
+            assert reports[name] == batchReports[name], name
+        for name in ("HitchSummary.csv", "MemorySummary.csv"): # counts, minimums and maximums are exact however they are summarized
+            assert [row[:5] for row in sorted(readReport(logsDirectory, name))] == [row[:5] for row in batchReports[name]], name
+
+    def test_compressed_logs_stream_in_batches(self, tmp_path, logsDirectory, batchReports):
+        for logName in glob.glob(str(logsDirectory / "CreateArbitraryLog_*.log")):
+            with open(logName, 'rb') as log, gzip.open(logName + ".gz", 'wb') as compressedLog:
+                shutil.copyfileobj(log, compressedLog)
+            os.remove(logName)
+        removeReports(logsDirectory)
+        runLogParser(tmp_path, "--stream", "--chunk-size", "1")
+        reports = readReports(logsDirectory, recordReports)
+        for name in recordReports:
+            assert sorted([row[0] + ".gz"] + row[1:] for row in batchReports[name]) == reports[name], name
+
+    def test_reports_are_consistent(self, batchReports):
+        hitches = batchReports["HitchReport.csv"]
+        joined = batchReports["HitchMemoryReport.csv"]
+        assert len(joined) == len(hitches)
+        assert sorted(row[:4] for row in joined) == sorted(hitches)
+        memories = {(row[0], row[1]): row[2] for row in batchReports["MemoryReport.csv"]}
+        assert all(memories[(row[0], row[4])] == row[5] for row in joined if row[4])
+        allLogs = [row for row in batchReports["HitchSummary.csv"] if row[0] == "All"]
+        assert int(allLogs[0][2]) == len(hitches)
+        errorGroups = batchReports["ErrorGroups.csv"]
+        assert sum(int(row[3]) for row in errorGroups) == len(batchReports["ErrorReport.csv"])
+
+    def test_time_range_matches_the_batch_run(self, tmp_path, logsDirectory, batchReports):
+        removeReports(logsDirectory)
+        runLogParser(tmp_path, "--time-index", "--index-interval", "16", "--workers", "2", "--chunk-size", "1") # indexed by the parse
+        assert readReports(logsDirectory, recordReports) == {name: batchReports[name] for name in recordReports}
+        with open(str(logsDirectory / "LogParserTimeIndex.json"), encoding='utf-8') as indexFile:
+            indexes = json.load(indexFile)
+        assert len(indexes) == 3 and all(len(index["entries"]) > 10 for index in indexes.values())
+        removeReports(logsDirectory)
+        runLogParser(tmp_path, "--since", "01Jan23_00:00:05", "--until", "01Jan23_00:00:10", "--index-interval", "16")
+        since, until = TimeStampParser.parseArgument("01Jan23_00:00:05"), TimeStampParser.parseArgument("01Jan23_00:00:10")
+        parser, lines = TimeStampParser(), {}
+        def timeStamp(row):
+            if row[0] not in lines:
+                with open(str(logsDirectory / os.path.basename(row[0])), 'rb') as log:
+                    lines[row[0]] = log.read().split(b"\n")
+            return parser.parse(lines[row[0]][int(row[1]) - 1])
+        ranged = [row for row in batchReports["HitchReport.csv"] if since <= timeStamp(row) <= until]
+        assert ranged and len(ranged) < len(batchReports["HitchReport.csv"])
+        assert sorted(readReport(logsDirectory, "HitchReport.csv")) == ranged
+
+    def test_error_rows_are_required_by_sqlite(self, tmp_path, logsDirectory):
+        completed = subprocess.run([sys.executable, os.path.join(repositoryRoot, "LogParser.py"), "--no-error-rows", "--sqlite"], 
+                                   cwd=str(tmp_path), capture_output=True, text=True)
+        assert completed.returncode == 2
+        assert "--no-error-rows" in completed.stderr
+
+    @pytest.mark.parametrize("option", ["--workers", "--chunk-size", "--spam-capacity", "--html-points", "--cache-size", "--index-interval"])
+    @pytest.mark.parametrize("value", ["0", "-1", "x"])
+    def test_sizes_must_be_positive(self, tmp_path, logsDirectory, option, value):
+        completed = subprocess.run([sys.executable, os.path.join(repositoryRoot, "LogParser.py"), option, value], 
+                                   cwd=str(tmp_path), capture_output=True, text=True, timeout=60)
+        assert completed.returncode == 2
+        assert option in completed.stderr
+
+    def test_run_summary_counts_the_records_reported(self, tmp_path, logsDirectory, batchReports):
+        summaryNames = glob.glob(str(logsDirectory / "LogParser_*.json"))
+        assert len(summaryNames) == 1
+        with open(summaryNames[0], encoding='utf-8') as summaryFile:
+            summary = json.load(summaryFile)
+        assert summary["linesParsed"] == 60000
+        assert summary["bytesRead"] == sum(os.path.getsize(logName) for logName in glob.glob(str(logsDirectory / "CreateArbitraryLog_*.log")))
+        assert [summary["matches"][category] for category in ("hitch", "memory", "error")] == \
+            [len(batchReports[name]) for name in ("HitchReport.csv", "MemoryReport.csv", "ErrorReport.csv")]
+        assert summary["stages"]["LogParser.iterateLogs"]["calls"] == 1
+        assert "profile" not in summary
+        removeReports(logsDirectory)
+        runLogParser(tmp_path, "--profile")
+        with open(max(glob.glob(str(logsDirectory / "LogParser_*.json")), key=os.path.getmtime), encoding='utf-8') as summaryFile:
+            profile = json.load(summaryFile)["profile"]
+        assert os.path.getsize(profile["profileFile"]) > 0
+
+    def test_worker_peak_memory_only_reported_when_workers_ran(self, tmp_path, logsDirectory):
+        writeLogs(logsDirectory, 1)
+        summaries = {}
+        for workers in ("1", "2"):
+            runLogParser(tmp_path, "--workers", workers)
+            summaryName = max(glob.glob(str(logsDirectory / "LogParser_*.json")), key=os.path.getmtime)
+            with open(summaryName, encoding='utf-8') as summaryFile:
+                summaries[workers] = json.load(summaryFile)
+        assert summaries["1"]["workerPeakMemoryMiB"] is None
+        assert summaries["2"]["workerPeakMemoryMiB"] > 0
+        assert getPeakMemory()[1] is None # this process's children are the runs above, not workers
+
+class TestShards:
+    def test_merged_shards_match_the_batch_run(self, tmp_path, logsDirectory, batchReports):
+        for seed, shard in ((0, "first"), (1, "first"), (2, "second")):
+            shardDirectory = tmp_path / shard / "Logs"
+            shardDirectory.mkdir(parents=True, exist_ok=True)
+            shutil.copy(str(logsDirectory / ("CreateArbitraryLog_%d.log" % seed)), str(shardDirectory))
+        for shard in ("first", "second"):
+            runLogParser(tmp_path / shard, "--shard", shard + ".json.z")
+        removeReports(logsDirectory)
+        runLogParser(tmp_path, "--merge", *(str(tmp_path / shard / "Logs" / (shard + ".json.z")) for shard in ("first", "second")))
+        reports = readReports(logsDirectory, recordReports + ("ErrorGroups.csv",))
+        for name in recordReports + ("ErrorGroups.csv",):
+            assert reports[name] == batchReports[name], name
+        merged = {(row[0], row[1]): row for row in readReport(logsDirectory, "HitchSummary.csv")}
+        batch = {(row[0], row[1]): row for row in batchReports["HitchSummary.csv"]}
+        assert merged.keys() == batch.keys()
+        assert all(merged[key][2:5] == batch[key][2:5] for key in batch) # counts, minimums and maximums are exact
+
+class TestFollow:
+    def test_logs_written_while_following_match_the_batch_run(self, tmp_path, logsDirectory, batchReports):
+        written = {}
+        for logName in glob.glob(str(logsDirectory / "CreateArbitraryLog_*.log")):
+            with open(logName, 'rb') as log:
+                written[logName] = log.read().split(b"\n[")
+            os.remove(logName)
+        removeReports(logsDirectory)
+        def append(logName, first, last):
+            with open(logName, 'ab') as log:
+                log.write(b"\n[".join(written[logName][first:last]) + (b"\n[" if last < len(written[logName]) else b""))
+        firstLog, *otherLogs = sorted(written)
+        append(firstLog, 0, 1000)
+        follower = subprocess.Popen([sys.executable, os.path.join(repositoryRoot, "LogParser.py"), "--follow", "--follow-idle", "3"],
+                                    cwd=str(tmp_path), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        try:
+            for first, last in ((1000, 2000), (2000, len(written[firstLog]))): # the first log file grows, then the others are created
+                time.sleep(1)
+                append(firstLog, first, last)
+            for logName in otherLogs:
+                time.sleep(1)
+                append(logName, 0, len(written[logName]))
+            stderr = follower.communicate(timeout=120)[1]
+        finally:
+            follower.kill()
+        assert follower.returncode == 0, stderr
+        reports = readReports(logsDirectory, recordReports)
+        for name in recordReports:
+            assert reports[name] == batchReports[name], name
+
+class TestIncremental:
+    def test_unchanged_logs_add_no_rows(self, tmp_path, logsDirectory):
+        writeLogs(logsDirectory, 2)
+        runLogParser(tmp_path, "--incremental")
+        first = readReports(logsDirectory, recordReports)
+        runLogParser(tmp_path, "--incremental")
+        assert readReports(logsDirectory, recordReports) == first
+
+    def test_grown_and_rotated_logs_add_each_row_once(self, tmp_path, logsDirectory):
+        logName = writeLog(logsDirectory, "CreateArbitraryLog_0.log", 20000, 0)
+        with open(writeLog(tmp_path, "appended.log", 30000, 1), 'rb') as appended:
+            records = appended.read().split(b"\n[", 1)[1].split(b"\n[") # every record but the system information
+        def append(first, last):
+            with open(logName, 'ab') as log:
+                log.write(b"".join(b"[" + record.rstrip(b"\n") + b"\n" for record in records[first:last]))
+        runLogParser(tmp_path, "--incremental")
+        append(0, 3000)
+        runLogParser(tmp_path, "--incremental") # grown
+        append(3000, 6000)
+        with open(logName, 'rb') as log, gzip.open(logName + ".gz", 'wb') as compressedLog:
+            shutil.copyfileobj(log, compressedLog)
+        shutil.copy(logName, str(tmp_path))
+        os.remove(logName)
+        runLogParser(tmp_path, "--incremental") # grown, then rotated to .gz
+        runLogParser(tmp_path, "--incremental") # unchanged
+        names = ("HitchReport.csv", "MemoryReport.csv", "ErrorReport.csv", "HitchMemoryReport.csv") # hitches joined across runs
+        incremental = readReports(logsDirectory, names)
+        
+        batchDirectory = tmp_path / "batch"
+        (batchDirectory / "Logs").mkdir(parents=True)
+        shutil.copy(str(tmp_path / "CreateArbitraryLog_0.log"), str(batchDirectory / "Logs"))
+        runLogParser(batchDirectory)
+        batch = readReports(batchDirectory / "Logs", names)
+        for name in names: # rows parsed after the rotation are written under the compressed log file's name
+            assert sorted([row[0].replace(".gz", "")] + row[1:] for row in incremental[name]) == batch[name], name
+        assert any(row[0].endswith(".gz") for row in incremental["HitchReport.csv"])
+
+    @pytest.mark.parametrize("arguments", [(), ("--stream",)])
+    def test_summaries_cover_the_records_of_earlier_runs(self, tmp_path, logsDirectory, arguments):
+        logNames = writeLogs(logsDirectory, 2)
+        with open(writeLog(tmp_path, "appended.log", 10000, 2), 'rb') as appended:
+            records = appended.read().split(b"\n[", 1)[1] # every record but the system information
+        runLogParser(tmp_path, "--incremental", *arguments)
+        with open(logNames[0], 'ab') as log:
+            log.write(b"[" + records.rstrip(b"\n") + b"\n")
+        runLogParser(tmp_path, "--incremental", *arguments) # one log file grown, the other unchanged
+        incremental = readReports(logsDirectory, summaryReports)
+        
+        batchDirectory = tmp_path / "batch"
+        (batchDirectory / "Logs").mkdir(parents=True)
+        for logName in logNames:
+            shutil.copy(logName, str(batchDirectory / "Logs"))
+        runLogParser(batchDirectory, "--stream")
+        batch = readReports(batchDirectory / "Logs", summaryReports)
+        for name in ("HitchSummary.csv", "MemorySummary.csv"): # counts, minimums and maximums are exact however they are summarized
+            assert [row[:5] for row in incremental[name]] == [row[:5] for row in batch[name]], name
+        assert [row[:2] for row in incremental["MemoryTrend.csv"]] == [row[:2] for row in batch["MemoryTrend.csv"]]
+        assert incremental["ErrorGroups.csv"] == batch["ErrorGroups.csv"]
+        assert incremental["LogSpamReport.csv"] == batch["LogSpamReport.csv"]
+
+    def test_failed_report_is_not_checkpointed(self, tmp_path, logsDirectory):
+        writeLogs(logsDirectory, 1)
+        runLogParser(tmp_path)
+        batch = readReports(logsDirectory, ("HitchReport.csv",))
+        removeReports(logsDirectory)
+        (logsDirectory / "HitchReport.csv").mkdir() # the report cannot be opened for appending
+        runLogParser(tmp_path, "--incremental")
+        assert not (logsDirectory / "LogParserCheckpoints.json").exists()
+        (logsDirectory / "HitchReport.csv").rmdir()
+        runLogParser(tmp_path, "--incremental")
+        assert readReports(logsDirectory, ("HitchReport.csv",)) == batch
+
+class TestSQLite:
+    def readTable(self, databaseName, table):
+        connection = sqlite3.connect(databaseName)
+        try:
+            return sorted(["" if value is None else str(value) for value in row] for row in connection.execute("SELECT * FROM " + table))
+        finally:
+            connection.close()
+
+    def test_grown_log_adds_each_row_once(self, tmp_path, logsDirectory):
+        logName = writeLog(logsDirectory, "CreateArbitraryLog_0.log", 20000, 0)
+        with open(writeLog(tmp_path, "appended.log", 10000, 1), 'rb') as appended:
+            records = appended.read().split(b"\n[", 1)[1].split(b"\n[") # every record but the system information
+        def append(first, last):
+            with open(logName, 'ab') as log:
+                log.write(b"".join(b"[" + record.rstrip(b"\n") + b"\n" for record in records[first:last]))
+        runLogParser(tmp_path, "--incremental", "--sqlite", "LogParser.db")
+        append(0, 2000)
+        runLogParser(tmp_path, "--incremental", "--sqlite", "LogParser.db") # grown
+        append(2000, 4000)
+        os.remove(str(logsDirectory / "LogParserCheckpoints.json")) # e.g. the run failed before its checkpoints were saved
+        runLogParser(tmp_path, "--incremental", "--sqlite", "LogParser.db") # grown, parsed from the start
+        append(4000, 6000)
+        runLogParser(tmp_path, "--incremental", "--sqlite", "LogParser.db") # grown
+        
+        removeReports(logsDirectory)
+        runLogParser(tmp_path)
+        for table, name in (("hitches", "HitchReport.csv"), ("hitchMemory", "HitchMemoryReport.csv"), ("memory", "MemoryReport.csv"), 
+                            ("errors", "ErrorReport.csv")):
+            assert self.readTable(str(logsDirectory / "LogParser.db"), table) == sorted([str(logsDirectory / row[0])] + row[1:] 
+                                                                                        for row in readReport(logsDirectory, name)), table
+        assert len(self.readTable(str(logsDirectory / "LogParser.db"), "systems")) == 1
+
+    def test_queries_do_not_modify_the_database(self, tmp_path, logsDirectory):
+        writeLogs(logsDirectory, 1)
+        runLogParser(tmp_path, "--sqlite", "LogParser.db")
+        hitches = self.readTable(str(logsDirectory / "LogParser.db"), "hitches")
+        query = [sys.executable, os.path.join(repositoryRoot, "QueryLogDatabase.py")]
+        completed = subprocess.run(query + ["--table", "hitches", "--limit", "5"], cwd=str(tmp_path), capture_output=True, text=True)
+        assert completed.returncode == 0 and len(completed.stdout.splitlines()) == 6
+        completed = subprocess.run(query + ["--sql", "DELETE FROM hitches"], cwd=str(tmp_path), capture_output=True, text=True)
+        assert completed.returncode != 0 and "readonly" in completed.stderr
+        assert self.readTable(str(logsDirectory / "LogParser.db"), "hitches") == hitches
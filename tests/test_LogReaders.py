@@ -0,0 +1,137 @@
+"""
+Tests of LogReaders.py: criteria matching, record framing, chunk planning, and the line and block readers.
+"""
+
+import gzip, io, os, shutil, logging
+
+import pytest
+
+from conftest import writeLog
+from LogReaders import (CriteriaMatcher, frameLogRecords, planLogChunks, findLastRecordStart, readSystemInfo, offsetLineNumbers,
+                        parseLogChunk, parseLogChunkBlocks, parseLogBatches, parseLogBlockBatches)
+from LogIndexing import TimeIndex
+
+matcher = CriteriaMatcher([("hitch", "Hitch"), ("memory", "memory footprint"), ("error", "ERROR")])
+
+def parseWhole(parseChunk, logName, **options):
+    hitchList, memoryList, errorList, lineCount, spamCounter, timeEntries = parseChunk(logName, 0, None, matcher, **options)
+    return hitchList, memoryList, errorList, lineCount
+
+def parseChunks(parseChunk, logName, chunkSize):
+    hitchList, memoryList, errorList, lineOffset = [], [], [], 0
+    for start, end in planLogChunks(logName, chunkSize):
+        chunkHitches, chunkMemories, chunkErrors, lineCount, spamCounter, timeEntries = parseChunk(logName, start, end, matcher)
+        hitchList += offsetLineNumbers(chunkHitches, lineOffset)
+        memoryList += offsetLineNumbers(chunkMemories, lineOffset)
+        errorList += offsetLineNumbers(chunkErrors, lineOffset)
+        lineOffset += lineCount
+    return hitchList, memoryList, errorList, lineOffset
+
+class TestCriteriaMatcher:
+    def test_priority_order(self):
+        assert matcher.match("[t] - ERROR - Hitch reported") == "hitch"
+        assert matcher.match("[t] - INFO - Current virtual memory footprint: 1 MiB") == "memory"
+        assert matcher.match("[t] - INFO - this is an arbitrary log") is None
+
+    def test_regex_criteria_resolve_priority(self):
+        regexMatcher = CriteriaMatcher([("first", "b+c"), ("second", "a")])
+        assert regexMatcher.match("a bbc") == "first"
+        assert regexMatcher.findCandidateLines(b"x\na bbc\nnothing\na\n") == [2, 16]
+
+class TestFrameLogRecords:
+    def test_continuation_lines_belong_to_the_record(self):
+        lines = [b"[1] error\n", b"Traceback\n", b"  File\n", b"[2] next\n", b"[3] last"]
+        assert list(frameLogRecords(lines)) == [(1, b"[1] error\n", [b"Traceback\n", b"  File\n"]), (4, b"[2] next\n", None), (5, b"[3] last", None)]
+
+    def test_leading_continuation_lines_are_a_record(self):
+        assert list(frameLogRecords([b"  tail of a callstack\n", b"[1] next\n"])) == [(1, b"  tail of a callstack\n", None), (2, b"[1] next\n", None)]
+
+    def test_size_stops_at_whole_lines(self):
+        lines = [b"[1] a\n", b"[2] b\n", b"[3] c\n"]
+        assert [record[0] for record in frameLogRecords(lines, 7)] == [1, 2]
+
+class TestChunks:
+    def test_chunks_start_at_records_and_cover_the_file(self, tmp_path):
+        logName = writeLog(tmp_path, lines=30000, mix=(50, 10, 5, 35))
+        chunks = planLogChunks(logName, 65536)
+        assert len(chunks) > 10
+        assert chunks[0][0] == 0 and chunks[-1][1] is None
+        with open(logName, 'rb') as log:
+            data = log.read()
+        for (start, end), (nextStart, nextEnd) in zip(chunks, chunks[1:]):
+            assert end == nextStart
+            assert data[nextStart - 1:nextStart + 1] == b"\n[" # never inside an error callstack
+        assert findLastRecordStart(logName, 0, len(data)) == data.rfind(b"\n[") + 1
+
+    @pytest.mark.parametrize("parseChunk", [parseLogChunk, parseLogChunkBlocks])
+    def test_chunked_parse_matches_whole_parse(self, tmp_path, parseChunk):
+        logName = writeLog(tmp_path, lines=30000, mix=(50, 10, 5, 35))
+        assert parseChunks(parseChunk, logName, 65536) == parseWhole(parseChunk, logName)
+
+    @pytest.mark.parametrize("parseBatches, parseChunk", [(parseLogBatches, parseLogChunk), (parseLogBlockBatches, parseLogChunkBlocks)])
+    def test_compressed_batches_match_whole_parse(self, tmp_path, parseBatches, parseChunk):
+        logName = writeLog(tmp_path, lines=30000, mix=(50, 10, 5, 35))
+        with open(logName, 'rb') as log, gzip.open(logName + ".gz", 'wb') as compressedLog:
+            shutil.copyfileobj(log, compressedLog)
+        options = {"blockSize": 16384} if parseBatches is parseLogBlockBatches else {}
+        hitchList, memoryList, errorList, lineOffset, lastFlags = [], [], [], 0, []
+        for lastBatch, (batchHitches, batchMemories, batchErrors, lineCount, spamCounter, timeEntries) in \
+                parseBatches(logName + ".gz", 0, None, matcher, spamCapacity=100, batchSize=65536, **options):
+            hitchList += offsetLineNumbers(batchHitches, lineOffset)
+            memoryList += offsetLineNumbers(batchMemories, lineOffset)
+            errorList += offsetLineNumbers(batchErrors, lineOffset)
+            lineOffset += lineCount
+            lastFlags.append(lastBatch)
+            assert (spamCounter is not None) == lastBatch
+        assert len(lastFlags) > 3 and lastFlags[-1] and not any(lastFlags[:-1])
+        assert (hitchList, memoryList, errorList, lineOffset) == parseWhole(parseChunk, logName + ".gz")
+
+class TestReaders:
+    def test_line_and_block_readers_are_identical(self, tmp_path):
+        logName = writeLog(tmp_path, lines=20000, mix=(70, 15, 10, 5))
+        lineResult = parseLogChunk(logName, 0, None, matcher, spamCapacity=100)
+        blockResult = parseLogChunkBlocks(logName, 0, None, matcher, spamCapacity=100, blockSize=4096)
+        assert lineResult[:4] == blockResult[:4]
+        assert lineResult[4].counts == blockResult[4].counts
+        hitchList, memoryList, errorList, lineCount = lineResult[:4]
+        assert hitchList and memoryList and errorList
+        assert lineCount == 20000
+        assert all(error.errorType in ("NameError", "TypeError") for error in errorList)
+        with open(logName, encoding='utf-8') as log:
+            lines = log.read().split("\n")
+        assert all("Hitch" in lines[record.lineNumber - 1] for record in hitchList)
+
+    @pytest.mark.parametrize("parseChunk", [parseLogChunk, parseLogChunkBlocks])
+    def test_every_nth_line_is_traced(self, tmp_path, caplog, parseChunk):
+        logName = writeLog(tmp_path, lines=20000)
+        caplog.set_level(logging.DEBUG)
+        untraced = parseChunk(logName, 0, None, matcher)
+        assert not caplog.records
+        traced = parseChunk(logName, 0, None, matcher, traceEvery=1000)
+        assert traced[:4] == untraced[:4]
+        assert 0 < len(caplog.records) <= 20
+        assert all(record.levelno == logging.DEBUG for record in caplog.records)
+
+    def test_time_entries_match_the_time_index(self, tmp_path):
+        logName = writeLog(tmp_path, lines=20000, mix=(50, 10, 5, 35))
+        entries = TimeIndex(str(tmp_path / "index.json"), 16384).build(logName)
+        assert len(entries) > 10
+        assert parseLogChunk(logName, 0, None, matcher, indexInterval=16384)[5] == entries
+        assert parseLogChunkBlocks(logName, 0, None, matcher, indexInterval=16384, blockSize=4096)[5] == entries
+        assert parseLogChunk(logName, 0, None, matcher)[5] == []
+
+    def test_compressed_log_matches_plain_log(self, tmp_path):
+        logName = writeLog(tmp_path, lines=20000)
+        with open(logName, 'rb') as log, gzip.open(logName + ".gz", 'wb') as compressedLog:
+            shutil.copyfileobj(log, compressedLog)
+        compressedName = logName + ".gz"
+        for parseChunk in (parseLogChunk, parseLogChunkBlocks):
+            plain = parseWhole(parseChunk, logName)
+            compressed = parseWhole(parseChunk, compressedName)
+            assert [record._replace(logName=logName) for record in compressed[0]] == plain[0]
+            assert compressed[3] == plain[3]
+
+    def test_system_info(self, tmp_path):
+        systemInfo = readSystemInfo(writeLog(tmp_path, lines=100), "***System Informtation***")
+        assert systemInfo.lineNumber == 1
+        assert systemInfo.physicalCores > 0
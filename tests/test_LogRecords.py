@@ -0,0 +1,42 @@
+"""
+Tests of LogRecords.py: the typed records are extracted from the log lines CreateArbitraryLog.py writes, once, at parse time.
+"""
+
+import pytest
+
+from LogRecords import HitchRecord, MemoryRecord, ErrorRecord, TimeStampParser
+
+errorLines = ["[13Nov23_14:10:07.407] - ERROR - name 'x' is not defined",
+              "Traceback (most recent call last):",
+              '  File "CreateArbitraryLog.py", line 184, in printErrorLog',
+              "    value = x * 1",
+              "            ^",
+              "NameError: name 'x' is not defined"]
+
+class TestHitchRecord:
+    def test_from_line(self):
+        line = "[13Nov23_14:10:07.344] - WARNING - Hitch reported on thread: [MainThread] with a duration of: 2246.65ms"
+        assert HitchRecord.fromLine("a.log", 37, line) == HitchRecord("a.log", 37, "MainThread", 2246.65)
+
+    def test_line_without_fields(self):
+        assert HitchRecord.fromLine("a.log", 1, "[13Nov23_14:10:07.344] - WARNING - Hitch reported") is None
+
+class TestMemoryRecord:
+    @pytest.mark.parametrize("footprint, runTime", [("34.39", "0.00503"), ("1.5e+03", "12")])
+    def test_from_line(self, footprint, runTime):
+        line = "[13Nov23_14:10:07.343] - INFO - Current virtual memory footprint: " + footprint + " MiB at run time: " + runTime
+        assert MemoryRecord.fromLine("a.log", 12, line) == MemoryRecord("a.log", 12, float(footprint), float(runTime))
+
+    def test_line_without_fields(self):
+        assert MemoryRecord.fromLine("a.log", 1, "[13Nov23_14:10:07.343] - INFO - Current virtual memory footprint: unknown") is None
+
+class TestErrorRecord:
+    def test_from_lines(self):
+        record = ErrorRecord.fromLines("a.log", 926, errorLines)
+        assert record.errorType == "NameError"
+        assert record.message == "\n".join(["ERROR - name 'x' is not defined"] + errorLines[1:])
+        assert record.timeStamp == pytest.approx(TimeStampParser.parseArgument("13Nov23_14:10:07") + 0.407)
+
+    def test_error_without_callstack(self):
+        record = ErrorRecord.fromLines("a.log", 926, errorLines[:1])
+        assert record.errorType is None and record.message == "ERROR - name 'x' is not defined"
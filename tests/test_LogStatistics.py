@@ -0,0 +1,272 @@
+"""
+Tests of LogStatistics.py: quantile sketches, memory trends, log spam counting, error grouping, the hitch and memory join,
+and the exact and sketched summaries.
+"""
+
+import math, random
+from array import array
+
+import pytest
+
+from LogRecords import HitchRecord, MemoryRecord, ErrorRecord
+from LogStatistics import (SpamCounter, ErrorGrouper, HitchMemoryJoiner, MemoryTrend, RecordStatistics, QuantileSketch,
+                           SketchStatistics)
+
+def exactQuantile(values, q):
+    """Linearly interpolated percentile between the closest ranks, as RecordStatistics.summarize computes it."""
+    column = sorted(values)
+    rank = (len(column) - 1) * q / 100
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(column) - 1)
+    return column[lower] + (column[upper] - column[lower]) * (rank - lower)
+
+def rankOf(values, value):
+    """Fraction of values below value."""
+    return sum(1 for other in values if other < value) / len(values)
+
+class TestQuantileSketch:
+    def test_exact_while_no_values_compacted(self):
+        values = [random.Random(1).uniform(0, 100) for index in range(500)]
+        sketch = QuantileSketch(k=1024)
+        sketch.extend(array('d', values))
+        for q in (0, 50, 90, 99, 100):
+            assert sketch.quantile(q) == pytest.approx(exactQuantile(values, q))
+
+    def test_rank_error_bounded(self):
+        rng = random.Random(2)
+        values = [rng.lognormvariate(3, 1) for index in range(50000)]
+        sketch = QuantileSketch(k=200)
+        for start in range(0, len(values), 4096):
+            sketch.extend(values[start:start + 4096])
+        for q in (10, 50, 90, 99):
+            assert abs(rankOf(values, sketch.quantile(q)) - q / 100) < 0.0165 * 2
+
+    def test_merge_matches_sketch_of_all_values(self):
+        rng = random.Random(3)
+        values = [rng.gauss(100, 15) for index in range(40000)]
+        first, second = QuantileSketch(), QuantileSketch()
+        first.extend(values[:25000])
+        second.extend(values[25000:])
+        first.merge(second)
+        assert first.count == len(values)
+        assert first.minimum == min(values)
+        assert first.maximum == max(values)
+        assert first.total == pytest.approx(math.fsum(values))
+        assert sum(len(level) << height for height, level in enumerate(first.levels)) == len(values)
+        for q in (50, 90, 99):
+            assert abs(rankOf(values, first.quantile(q)) - q / 100) < 0.0033 * 2
+
+    def test_state_round_trip(self):
+        sketch = QuantileSketch()
+        sketch.extend([float(value) for value in range(5000)])
+        restored = QuantileSketch.fromState(sketch.getState())
+        assert restored.summarize() == sketch.summarize()
+
+class TestMemoryTrend:
+    def test_linear_growth(self):
+        runTimes = tuple(float(second) for second in range(200))
+        footprints = tuple(100.0 + 0.5 * runTime for runTime in runTimes)
+        trend = MemoryTrend()
+        trend.add(runTimes, footprints)
+        record = trend.getRecord("log")
+        assert record.slope == pytest.approx(0.5)
+        assert record.rSquared == pytest.approx(1.0)
+        assert (record.peak, record.peakRunTime) == (footprints[-1], runTimes[-1])
+        assert (record.trough, record.troughRunTime) == (footprints[0], runTimes[0])
+
+    def test_chunks_and_merges_match_a_single_pass(self):
+        rng = random.Random(4)
+        runTimes = tuple(float(second) for second in range(1000))
+        footprints = tuple(50 + 0.01 * runTime + rng.gauss(0, 1) for runTime in runTimes)
+        whole = MemoryTrend()
+        whole.add(runTimes, footprints)
+        chunked = MemoryTrend()
+        for start in range(0, 1000, 137):
+            chunked.add(runTimes[start:start + 137], footprints[start:start + 137])
+        first, second = MemoryTrend(), MemoryTrend()
+        first.add(runTimes[:400], footprints[:400])
+        second.add(runTimes[400:], footprints[400:])
+        first.merge(second)
+        expected = whole.getRecord("log")
+        for trend in (chunked, first):
+            record = trend.getRecord("log")
+            assert record.count == expected.count
+            assert record.slope == pytest.approx(expected.slope)
+            assert record.rSquared == pytest.approx(expected.rSquared)
+            assert (record.peak, record.trough) == (expected.peak, expected.trough)
+        # the CUSUM of the chunks visits the same footprints in the same order
+        assert (chunked.changePoints, chunked.firstChangeRunTime, chunked.lastChangeRunTime) == \
+            (whole.changePoints, whole.firstChangeRunTime, whole.lastChangeRunTime)
+
+    def test_step_is_one_change_point(self):
+        rng = random.Random(5)
+        runTimes = tuple(float(second) for second in range(400))
+        footprints = tuple((100.0 if runTime < 200 else 140.0) + rng.gauss(0, 0.2) for runTime in runTimes)
+        trend = MemoryTrend()
+        trend.add(runTimes, footprints)
+        record = trend.getRecord("log")
+        assert record.changePoints == 1
+        assert record.lastChangeDirection == "up"
+        assert 195 <= record.firstChangeRunTime <= 205
+
+    def test_flat_noise_has_no_change_points(self):
+        rng = random.Random(6)
+        trend = MemoryTrend()
+        trend.add(tuple(float(second) for second in range(2000)), tuple(100 + rng.gauss(0, 0.2) for second in range(2000)))
+        assert trend.getRecord("log").changePoints == 0
+
+    def test_state_round_trip(self):
+        trend = MemoryTrend()
+        trend.add((0.0, 1.0, 2.0), (1.0, 2.0, 4.0))
+        assert MemoryTrend.fromState(trend.getState()).getRecord("log") == trend.getRecord("log")
+
+def spamBlock(messages):
+    return b"".join(b"[01Jan23_00:00:00.000] - INFO - " + message + b"\n" for message in messages)
+
+class TestSpamCounter:
+    def test_numbers_are_masked(self):
+        counter = SpamCounter()
+        counter.countBlock(spamBlock([b"footprint: 12.5 MiB", b"footprint: 13 MiB", b"other"]))
+        assert counter.getTemplates(2) == [(b"footprint: <n> MiB", 2)]
+        assert counter.recordCount == 3
+        assert counter.maxUndercount == 0
+
+    def test_counts_are_lower_bounds_within_max_undercount(self):
+        rng = random.Random(7)
+        messages = [b"frequent" if rng.random() < 0.3 else b"message " + bytes(rng.choice("abcdefghij"), "ascii") * rng.randint(1, 30)
+                    for index in range(20000)]
+        counter = SpamCounter(capacity=8)
+        for start in range(0, len(messages), 1000):
+            counter.countBlock(spamBlock(messages[start:start + 1000]))
+        assert len(counter.counts) <= 8
+        assert counter.maxUndercount <= counter.recordCount / 9
+        trueCount = messages.count(b"frequent")
+        assert trueCount - counter.maxUndercount <= counter.counts[b"frequent"] <= trueCount
+
+    def test_merge_matches_counting_at_once(self):
+        messages = [b"message %d" % (index % 5) + b"x" * (index % 3) for index in range(3000)]
+        whole, first, second = SpamCounter(), SpamCounter(), SpamCounter()
+        whole.countBlock(spamBlock(messages))
+        first.countBlock(spamBlock(messages[:1000]))
+        second.countBlock(spamBlock(messages[1000:]))
+        first.merge(second)
+        assert first.counts == whole.counts
+        assert first.recordCount == whole.recordCount
+
+def errorRecord(logName, lineNumber, variable="x", time="00:00:00.000"):
+    lines = ["[01Jan23_%s] - ERROR - name '%s' is not defined" % (time, variable), "Traceback (most recent call last):",
+             '  File "/home/%s/CreateArbitraryLog.py", line %d, in printErrorLog' % (logName, lineNumber), "    value = x * 1",
+             "NameError: name '%s' is not defined" % variable]
+    return ErrorRecord.fromLines(logName, lineNumber, lines)
+
+class TestErrorGrouper:
+    def test_literals_and_line_numbers_are_normalized(self):
+        grouper = ErrorGrouper()
+        grouper.addRecords([errorRecord("a.log", 10), errorRecord("a.log", 20, "y"), errorRecord("b.log", 5)])
+        groups = grouper.getGroups()
+        assert len(groups) == 1
+        assert groups[0].errorType == "NameError"
+        assert groups[0].template == "name <v> is not defined"
+        assert groups[0].occurrences == 3
+        assert (groups[0].firstLogName, groups[0].firstLineNumber) == ("a.log", 10)
+        assert (groups[0].lastLogName, groups[0].lastLineNumber) == ("b.log", 5)
+
+    def test_error_types_are_grouped_separately(self):
+        typeError = ErrorRecord.fromLines("a.log", 30, ["[01Jan23_00:00:00.000] - ERROR - can only concatenate str",
+                                                        "TypeError: can only concatenate str (not \"int\") to str"])
+        grouper = ErrorGrouper()
+        grouper.addRecords([errorRecord("a.log", 10), typeError, errorRecord("a.log", 40)])
+        assert [(group.errorType, group.occurrences) for group in grouper.getGroups()] == [("NameError", 2), ("TypeError", 1)]
+
+    def test_first_and_last_seen_by_time_stamp_in_any_order(self):
+        records = [errorRecord("b.log", 5, "b", "00:00:02.000"), errorRecord("a.log", 10, "a", "00:00:01.000"), 
+                   errorRecord("c.log", 7, "c", "00:00:03.000"), errorRecord("a.log", 20, "d", "00:00:01.000")]
+        grouper = ErrorGrouper()
+        grouper.addRecords(records)
+        group = grouper.getGroups()[0]
+        assert (group.firstLogName, group.firstLineNumber, group.lastLogName, group.lastLineNumber) == ("a.log", 10, "c.log", 7)
+        assert group.firstTimeStamp < group.lastTimeStamp
+        assert group.exampleMessage == records[1].message
+        first, second = ErrorGrouper(), ErrorGrouper()
+        first.addRecords(records[2:])
+        second.addRecords(records[:2])
+        first.addGroups(second.groups) # e.g. the shard of the later log files merged first
+        assert first.getGroups() == grouper.getGroups()
+
+def hitch(lineNumber, duration=100.0, logName="a.log", thread="MainThread"):
+    return HitchRecord(logName, lineNumber, thread, duration)
+
+def memory(lineNumber, footprint, runTime=None, logName="a.log"):
+    return MemoryRecord(logName, lineNumber, footprint, float(lineNumber) if runTime is None else runTime)
+
+class TestHitchMemoryJoiner:
+    def test_nearest_preceding_sample(self):
+        joined = HitchMemoryJoiner().join([hitch(1), hitch(5), hitch(9)], [memory(3, 10.0), memory(4, 12.5), memory(8, 12.0)])
+        assert [record[4:] for record in joined] == [(None, None, None, None), (4, 12.5, 2.5, 4.0), (8, 12.0, -0.5, 8.0)]
+
+    def test_ranges_join_as_the_whole_log(self):
+        hitches = [hitch(lineNumber) for lineNumber in range(2, 200, 7)]
+        memories = [memory(lineNumber, float(lineNumber % 13)) for lineNumber in range(1, 200, 5)]
+        whole = HitchMemoryJoiner().join(hitches, memories)
+        joiner, ranged = HitchMemoryJoiner(), []
+        for start in range(0, 200, 30):
+            ranged += joiner.join([record for record in hitches if start <= record.lineNumber < start + 30],
+                                  [record for record in memories if start <= record.lineNumber < start + 30])
+        assert ranged == whole
+
+    def test_finish_log_forgets_the_sample(self):
+        joiner = HitchMemoryJoiner()
+        joiner.join([], [memory(1, 10.0)])
+        joiner.finishLog("a.log")
+        assert joiner.join([hitch(2)], [])[0].memoryLineNumber is None
+
+class TestSummaries:
+    def test_record_statistics_percentiles_and_groups(self):
+        rng = random.Random(8)
+        durations = [rng.uniform(30, 3000) for index in range(1001)]
+        statistics = RecordStatistics()
+        statistics.addRecords([hitch(index, duration, thread="T%d" % (index % 2)) for index, duration in enumerate(durations)],
+                              [memory(index, float(index), logName="b.log") for index in range(1, 11)])
+        statistics.machineClasses.update({"a.log": "host", "b.log": "host"})
+        summaries = {(record.groupBy, record.group): record for record in statistics.getHitchSummaries()}
+        assert set(summaries) == {("Log", "a.log"), ("Thread", "T0"), ("Thread", "T1"), ("Machine", "host"), ("All", "All Logs")}
+        allLogs = summaries[("All", "All Logs")]
+        assert allLogs.count == 1001
+        assert allLogs.p50 == pytest.approx(exactQuantile(durations, 50))
+        assert allLogs.p99 == pytest.approx(exactQuantile(durations, 99))
+        memorySummary = statistics.getMemorySummaries()[0]
+        assert (memorySummary.count, memorySummary.minimum, memorySummary.maximum, memorySummary.finalRunTime) == (10, 1.0, 10.0, 10.0)
+
+    def test_sketch_statistics_match_record_statistics(self):
+        statistics = RecordStatistics()
+        statistics.addRecords([hitch(index, float(index % 97)) for index in range(500)], [memory(index, float(index % 31)) for index in range(1, 300)])
+        sketched = SketchStatistics()
+        sketched.addState(SketchStatistics().getState())
+        sketched.addRecordStatistics(statistics)
+        assert sketched.getHitchSummaries() == statistics.getHitchSummaries() # exact while no more than k values are sketched
+        assert sketched.getMemorySummaries() == statistics.getMemorySummaries()
+        assert sketched.getMemoryTrends() == statistics.getMemoryTrends()
+
+    def test_sketch_statistics_of_records_match_record_statistics(self):
+        rng = random.Random(9)
+        hitches = [hitch(index, rng.uniform(30, 3000), "ab"[index % 2] + ".log", "T%d" % (index % 3)) for index in range(3000)]
+        memories = [memory(index, rng.uniform(10, 50), logName="ab"[index % 2] + ".log") for index in range(1, 3000)]
+        statistics, sketched = RecordStatistics(), SketchStatistics()
+        for start in range(0, 3000, 250):
+            statistics.addRecords(hitches[start:start + 250], memories[start:start + 250])
+            sketched.addRecords(hitches[start:start + 250], memories[start:start + 250])
+        exact = {(record.groupBy, record.group): record for record in statistics.getHitchSummaries()}
+        for record in sketched.getHitchSummaries():
+            assert record[2:5] == exact[(record.groupBy, record.group)][2:5] # count, minimum, and maximum are exact
+            assert record.mean == pytest.approx(exact[(record.groupBy, record.group)].mean)
+        assert [record[:5] for record in sketched.getMemorySummaries()] == [record[:5] for record in statistics.getMemorySummaries()]
+        assert sketched.getMemoryTrends() == statistics.getMemoryTrends()
+
+    def test_sketch_statistics_hold_bounded_values(self):
+        sketched = SketchStatistics()
+        for start in range(0, 100000, 5000):
+            sketched.addRecords([hitch(index, float(index)) for index in range(start, start + 5000)],
+                                [memory(index, float(index)) for index in range(start + 1, start + 5001)])
+        assert sketched.getHitchSummaries()[0].count == 100000
+        assert all(sum(map(len, sketch.levels)) < 10000 for sketch in sketched.hitchSketches.values())
+        assert sum(map(len, sketched.memorySketches["a.log"].levels)) < 10000
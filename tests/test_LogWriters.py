@@ -0,0 +1,141 @@
+"""
+Tests of LogWriters.py: csv reports never overwrite existing files, columnar reports keep the record field types, 
+the SQLite database skips or replaces the rows of each log file, and the HTML report keeps bounded series and table rows, 
+whatever the number of log files and records written.
+"""
+
+import os, re, json, random
+
+import pytest
+
+import LogWriters
+from LogRecords import HitchRecord, MemoryRecord, HitchMemoryRecord, HitchSummaryRecord
+from LogWriters import CSVWriter, ColumnarWriter, SQLiteWriter, HTMLWriter
+
+def readReportData(document):
+    """Reads the tables embedded in an HTML report."""
+    return json.loads(re.search(r'<script type="application/json" id="reportData">(.*?)</script>', document, re.S).group(1).replace("<\\/", "</"))
+
+class TestCSVWriter:
+    def test_existing_reports_are_numbered(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        for name in ("HitchSummary.csv", "HitchSummary(1).csv", "ErrorGroups.csv"):
+            (tmp_path / name).write_text("")
+        writer = CSVWriter()
+        assert writer.checkForExistingFile("HitchSummary.csv") == "HitchSummary(2).csv"
+        assert writer.checkForExistingFile("ErrorGroups.csv") == "ErrorGroups(1).csv"
+        assert writer.checkForExistingFile("MemoryTrend.csv") == "MemoryTrend.csv"
+
+hitchMemoryRecords = [HitchMemoryRecord("a.log", line, "MainThread", 100.0 + line, line - 1 if line > 1 else None, 
+                                        1.5 if line > 1 else None, None, 0.25 * line if line > 1 else None) for line in range(1, 11)]
+
+class TestColumnarWriter:
+    def test_missing_packages_fall_back(self, monkeypatch):
+        monkeypatch.setattr(LogWriters, "pyarrow", None)
+        monkeypatch.setattr(LogWriters, "numpy", object())
+        assert ColumnarWriter("parquet").format == "npz"
+        monkeypatch.setattr(LogWriters, "numpy", None)
+        assert ColumnarWriter("feather").format is None
+
+    def test_npz_columns_are_typed(self, tmp_path, monkeypatch):
+        numpy = pytest.importorskip("numpy")
+        monkeypatch.chdir(tmp_path)
+        writer = ColumnarWriter("npz")
+        writer.batchSize = 3
+        writer.writeRecordsToFiles(iter(hitchMemoryRecords))
+        assert not writer.writeFailed
+        columns = numpy.load("HitchMemoryReport.npz")
+        assert list(columns["lineNumber"]) == list(range(1, 11)) and columns["lineNumber"].dtype == numpy.int64
+        assert columns["duration"].dtype == numpy.float64 and list(columns["thread"]) == ["MainThread"] * 10
+        assert columns["memoryLineNumber"][0] == -1 and numpy.isnan(columns["footprint"][0]) # no memory sample precedes the first hitch
+
+    @pytest.mark.parametrize("format", ["parquet", "feather"])
+    def test_arrow_reports_round_trip(self, tmp_path, monkeypatch, format):
+        pyarrow = pytest.importorskip("pyarrow")
+        monkeypatch.chdir(tmp_path)
+        writer = ColumnarWriter(format)
+        writer.batchSize = 3
+        writer.writeRecordsToFiles(iter(hitchMemoryRecords))
+        assert not writer.writeFailed
+        if format == "parquet":
+            table = pytest.importorskip("pyarrow.parquet").read_table("HitchMemoryReport.parquet")
+        else:
+            table = pyarrow.ipc.open_file("HitchMemoryReport.feather").read_all()
+        assert table.column_names == list(HitchMemoryRecord._fields)
+        assert [HitchMemoryRecord(*row.values()) for row in table.to_pylist()] == hitchMemoryRecords
+
+def ingest(databaseName, logName, hitchCount):
+    """Runs a SQLiteWriter over the hitches of logName, as a run of LogParser.py does, returning whether they were ingested."""
+    writer = SQLiteWriter(databaseName)
+    ingested = writer.checkLog(logName)
+    writer.writeRecords(HitchRecord(logName, line, "MainThread", 100.0) for line in range(1, hitchCount + 1))
+    writer.closeReports()
+    return ingested
+
+def readHitches(databaseName):
+    writer = SQLiteWriter(databaseName)
+    try:
+        return writer.query("SELECT logName, lineNumber FROM hitches ORDER BY lineNumber")[1]
+    finally:
+        writer.connection.close()
+
+class TestSQLiteWriter:
+    def test_unchanged_log_is_skipped_without_hashing_it(self, tmp_path, monkeypatch):
+        logName = str(tmp_path / "a.log")
+        with open(logName, 'w') as log:
+            log.write("first\n")
+        databaseName = str(tmp_path / "LogParser.db")
+        assert ingest(databaseName, logName, 2)
+        def hashFile(self, logName, size):
+            raise AssertionError("hashed " + logName)
+        with monkeypatch.context() as patch:
+            patch.setattr(SQLiteWriter, "hashFile", hashFile)
+            assert not ingest(databaseName, logName, 2)
+        os.utime(logName, ns=(0, 0)) # touched, the content unchanged
+        assert not ingest(databaseName, logName, 2)
+        with monkeypatch.context() as patch:
+            patch.setattr(SQLiteWriter, "hashFile", hashFile)
+            assert not ingest(databaseName, logName, 2)
+        with open(logName, 'a') as log:
+            log.write("second\n")
+        assert ingest(databaseName, logName, 3)
+        assert readHitches(databaseName) == [(logName, line) for line in range(1, 4)]
+
+    def test_rows_are_keyed_by_absolute_path(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with open("a.log", 'w') as log:
+            log.write("first\n")
+        assert ingest("LogParser.db", "a.log", 2)
+        with open("a.log", 'a') as log:
+            log.write("second\n")
+        assert ingest("LogParser.db", str(tmp_path / "a.log"), 3) # the same log file, named by its absolute path
+        assert readHitches("LogParser.db") == [(str(tmp_path / "a.log"), line) for line in range(1, 4)]
+
+class TestHTMLWriter:
+    def test_log_files_with_the_most_records_are_charted(self):
+        writer = HTMLWriter()
+        logNames = ["CreateArbitraryLog_%d.log" % index for index in range(60)]
+        random.Random(0).shuffle(logNames)
+        keptCounts = []
+        for logName in logNames:
+            count = 10 * (int(logName.split("_")[1].split(".")[0]) + 1) # the later the log file number, the more records
+            writer.writeRecords(MemoryRecord(logName, line, float(line), float(line)) for line in range(1, count + 1))
+            keptCounts.append(len(writer.memorySeries))
+        assert max(keptCounts) == writer.maxCandidates
+        chart = writer.renderChart("Memory Footprint", writer.memorySeries, writer.memoryCounts, "Run Time", "Footprint (MiB)")
+        charted = re.findall(r"&#9632; (CreateArbitraryLog_\d+\.log) \(\d+ of (\d+) points\)", chart)
+        assert sorted(charted) == sorted(("CreateArbitraryLog_%d.log" % index, str(10 * (index + 1))) for index in range(50, 60))
+        assert "50 more log files not charted" in chart
+
+    def test_tables_keep_their_first_and_last_rows(self):
+        writer = HTMLWriter()
+        logRows = [HitchSummaryRecord("Log", "CreateArbitraryLog_%d.log" % index, 1, 0.0, 1.0, 0.5, 0.5, 0.9, 1.0) for index in range(5000)]
+        aggregateRows = [HitchSummaryRecord("Machine", "8 Cores", 1, 0.0, 1.0, 0.5, 0.5, 0.9, 1.0),
+                         HitchSummaryRecord("All", "All Logs", 1, 0.0, 1.0, 0.5, 0.5, 0.9, 1.0)]
+        writer.writeRecords(logRows + aggregateRows)
+        table = readReportData(writer.renderReport())["tables"]["hitchSummary"]
+        assert table["total"] == 5002 and table["kept"] == writer.maxRows
+        assert len(table["rows"]) == writer.maxRows + 1 # and the row marking the cut
+        assert [row[:2] for row in table["rows"][-2:]] == [["Machine", "8 Cores"], ["All", "All Logs"]]
+        assert table["rows"][0][1] == "CreateArbitraryLog_0.log"
+        assert table["rows"][writer.maxRows - writer.tailRows] == ["(4002 rows not kept)"] + [None] * 8